@@ -0,0 +1,86 @@
+"""
+Startup Benchmark
+Measures cold start of each process (module import and app factory) in
+fresh interpreters, the way a worker boot or restart pays for it
+
+Usage:
+    python benchmark_startup.py [--runs 5] [--only api,web,bot]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Process -> (module to import, app factory in it or None)
+TARGETS = {
+    'api': ('src.api.app', 'create_app'),
+    'web': ('src.web.app', 'create_app'),
+    'bot': ('src.bot.main', None),
+}
+
+MARKER = 'STARTUP_BENCH '
+
+CHILD = """
+import sys, json, time, importlib
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+imported = time.perf_counter()
+if sys.argv[2]:
+    getattr(module, sys.argv[2])()
+built = time.perf_counter()
+sys.stderr.write(%r + json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'factory_ms': (built - imported) * 1000,
+    'modules': len(sys.modules)
+}) + '\\n')
+""" % MARKER
+
+
+def measure(module: str, factory: str) -> dict:
+    """One cold start in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, module, factory or ''],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    for line in result.stderr.splitlines():
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER):])
+    raise RuntimeError(f"{module} failed to start:\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-process startup cost')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per process (default: 5)')
+    parser.add_argument('--only', default=','.join(TARGETS), help='Comma-separated processes (api,web,bot)')
+    args = parser.parse_args()
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  Startup benchmark ({args.runs} cold starts each, median)")
+    print(f"{'='*60}")
+    print(f"{'process':<8}{'import ms':>12}{'factory ms':>12}{'total ms':>12}{'modules':>10}")
+
+    for name in args.only.split(','):
+        module, factory = TARGETS[name.strip()]
+        try:
+            runs = [measure(module, factory) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"❌ {name}: {e}")
+            continue
+
+        import_ms = statistics.median(r['import_ms'] for r in runs)
+        factory_ms = statistics.median(r['factory_ms'] for r in runs)
+        total_ms = statistics.median(r['import_ms'] + r['factory_ms'] for r in runs)
+        print(f"{name:<8}{import_ms:>12.1f}{factory_ms:>12.1f}{total_ms:>12.1f}{runs[-1]['modules']:>10}")
+
+    print(f"{'='*60}")
+    print("💡 python -X importtime -c 'import src.web.app' shows where import time goes\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Gunicorn configuration for the REST API (production)
+Pre-forked workers with threads: the app is built once in the master
+(preload_app) and each worker gets its own database pool after fork
+
+Usage:
+    API_SERVER=gunicorn python run_api.py
+    gunicorn -c gunicorn.conf.py
+"""
+
+import os
+import multiprocessing
+
+wsgi_app = 'src.api.wsgi:app'
+
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', 5001)}"
+
+# Processes for CPU parallelism, threads to overlap database/network waits
+workers = int(os.getenv('API_WORKERS') or multiprocessing.cpu_count() * 2 + 1)
+threads = int(os.getenv('API_THREADS') or 4)
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Build the app once; workers share its imported code copy-on-write
+preload_app = True
+
+timeout = int(os.getenv('API_TIMEOUT') or 30)
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth
+max_requests = int(os.getenv('API_MAX_REQUESTS') or 1000)
+max_requests_jitter = max_requests // 10
+
+# The app writes its own access log (api.access)
+accesslog = None
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Give each worker fresh database connections"""
+    from src.database.connection import dispose_engines
+    dispose_engines()
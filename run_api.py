@@ -1,14 +1,31 @@
 """
 API Application Entry Point
 Run this file to start the REST API server
+
+API_SERVER=development (default): Flask development server
+API_SERVER=gunicorn: pre-forked gunicorn workers (see gunicorn.conf.py)
 """
 
-from src.api.app import create_app
 import os
 import sys
 
+
+def run_production():
+    """Replace this process with gunicorn (workers/threads from API_WORKERS/API_THREADS)"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(base_dir)
+    print("🚀 Starting IBS Info Chatbot REST API with gunicorn (gunicorn.conf.py)")
+    os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'])
+
+
 def main():
     """Main entry point for API server"""
+    if os.getenv('API_SERVER', 'development').lower() == 'gunicorn':
+        run_production()
+        return
+    
+    from src.api.app import create_app
+    
     try:
         # Create the Flask app
         app = create_app()
@@ -26,6 +43,7 @@ def main():
         print(f"🔧 Debug Mode: {'Enabled' if debug else 'Disabled'}")
         print(f"📚 API Version: v1")
         print(f"🏥 Health Check: http://{host}:{port}/health")
+        print(f"🚦 Readiness:    http://{host}:{port}/ready")
         print(f"📖 API Root: http://{host}:{port}/api")
         print(f"{'='*60}")
         print(f"\n📋 Available Endpoints:")
@@ -1,20 +1,32 @@
 """
 Web Application Entry Point
 Run this file to start the web application with admin dashboard
+
+WEB_SERVER=development (default): Socket.IO development server
+WEB_SERVER=eventlet: eventlet green-thread server for production
 """
 
+import os
+
+PRODUCTION = os.getenv('WEB_SERVER', 'development').lower() == 'eventlet'
+
+if PRODUCTION:
+    # Must run before anything imports socket, threading, ssl or the DB driver
+    import eventlet
+    eventlet.monkey_patch()
+    os.environ['SOCKETIO_ASYNC_MODE'] = 'eventlet'
+
 from src.web.app import create_app
 from src.web.websocket_manager import socketio
-import os
 
 if __name__ == "__main__":
     # Create the Flask app
     app = create_app()
-    
+
     # Get configuration from environment variables
     host = os.getenv('WEB_HOST', '127.0.0.1')
     port = int(os.getenv('WEB_PORT', 5000))
-    debug = os.getenv('WEB_DEBUG', 'True').lower() == 'true'
+    debug = not PRODUCTION and os.getenv('WEB_DEBUG', 'True').lower() == 'true'
 
 
     # Print startup information
@@ -23,14 +35,16 @@ if __name__ == "__main__":
     print(f"{'='*60}")
     print(f"📍 Server: http://{host}:{port}")
     print(f"🔧 Debug Mode: {'Enabled' if debug else 'Disabled'}")
+    print(f"⚙️  Server: {'eventlet (production)' if PRODUCTION else 'development'}")
     print(f"🔐 Admin Panel: http://{host}:{port}/portal/admin")
+    print(f"🚦 Readiness: http://{host}:{port}/ready")
     print(f"💬 WebSocket: Enabled")
     print(f"{'='*60}\n")
-    
+
     # Use socketio.run instead of app.run for WebSocket support
     socketio.run(
-        app, 
-        host=host, 
-        port=port, 
+        app,
+        host=host,
+        port=port,
         debug=debug,
-    )
\ No newline at end of file
+    )
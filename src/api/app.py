@@ -3,10 +3,13 @@ API Application Factory
 Initializes Flask app for REST API with CORS, error handling, and middleware
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, g
 from werkzeug.middleware.proxy_fix import ProxyFix
 import os
+import time
+import logging
 from ..utils.config import Config
+from ..utils.logging_config import configure_logging, get_sampled_logger
 
 # API Version prefix
 API_PREFIX = '/api/v1'
@@ -18,11 +21,18 @@ def create_app():
     Returns:
         Flask: Configured Flask application instance
     """
+    # Queue-backed root logging before Flask creates app.logger
+    configure_logging('api')
+    
     app = Flask(__name__)
     
     # Load configuration
     app.config.from_object(Config)
     
+    # Fast JSON encoding (orjson) for all responses
+    from .json_provider import configure_json
+    configure_json(app)
+    
     # Trust proxy headers for HTTPS (X-Forwarded-Proto, X-Forwarded-Host)
     app.wsgi_app = ProxyFix(
         app.wsgi_app,
@@ -32,6 +42,12 @@ def create_app():
         x_prefix=1  # Trust X-Forwarded-Prefix
     )
     
+    # gzip/brotli for large JSON bodies. after_request handlers run in reverse
+    # registration order, so registering first makes compression run last,
+    # after every other handler has set headers and body
+    from .v1.middleware.compression import register_compression
+    register_compression(app)
+    
     # Configure CORS
     from .v1.middleware.cors import configure_cors
     configure_cors(app)
@@ -40,12 +56,20 @@ def create_app():
     from .v1.middleware.error_handler import register_error_handlers
     register_error_handlers(app)
     
+    # Per-client token buckets, checked before any other request work
+    from .v1.middleware.rate_limit import register_rate_limiter
+    register_rate_limiter(app)
+    
     # Register blueprints (API routes)
     register_blueprints(app)
     
     # Register request/response handlers
     register_request_handlers(app)
     
+    # Per-request SQL query count/time and N+1 warnings
+    from .v1.middleware.query_monitor import register_query_monitor
+    register_query_monitor(app)
+    
     # Health check endpoint
     @app.route('/health')
     def health_check():
@@ -56,6 +80,23 @@ def create_app():
             'version': 'v1'
         }), 200
     
+    # Readiness check for load balancers (503 until the database answers)
+    @app.route('/ready')
+    def readiness_check():
+        """API readiness endpoint"""
+        from ..database.connection import database_is_ready
+        if not database_is_ready():
+            return jsonify({
+                'success': False,
+                'message': 'Database unavailable',
+                'version': 'v1'
+            }), 503
+        return jsonify({
+            'success': True,
+            'message': 'API is ready',
+            'version': 'v1'
+        }), 200
+    
     # Root API endpoint
     @app.route('/api')
     def api_root():
@@ -66,12 +107,14 @@ def create_app():
             'version': 'v1',
             'endpoints': {
                 'health': '/health',
+                'ready': '/ready',
                 'auth': f'{API_PREFIX}/auth',
                 'users': f'{API_PREFIX}/users',
                 'admins': f'{API_PREFIX}/admins',
                 'chats': f'{API_PREFIX}/chats',
                 'dashboard': f'{API_PREFIX}/dashboard',
-                'settings': f'{API_PREFIX}/settings'
+                'settings': f'{API_PREFIX}/settings',
+                'batch': f'{API_PREFIX}/batch'
             }
         }), 200
     
@@ -88,6 +131,7 @@ def register_blueprints(app):
     from .v1.routes.dashboard import dashboard_api_bp
     from .v1.routes.system_settings import settings_api_bp
     from .v1.routes.bot import bot_api_bp
+    from .v1.routes.batch import batch_api_bp
     
     # Register blueprints with correct prefix
     app.register_blueprint(auth_api_bp, url_prefix=API_PREFIX)
@@ -97,12 +141,12 @@ def register_blueprints(app):
     app.register_blueprint(dashboard_api_bp, url_prefix=API_PREFIX)
     app.register_blueprint(settings_api_bp, url_prefix=API_PREFIX)
     app.register_blueprint(bot_api_bp, url_prefix=API_PREFIX)
+    app.register_blueprint(batch_api_bp, url_prefix=API_PREFIX)
     
-    # 🔍 DEBUG: Print ALL registered routes
-    print("\n🔍 DEBUG: All registered routes:")
-    for rule in app.url_map.iter_rules():
-        print(f"   {rule.methods} {rule.rule} -> {rule.endpoint}")
-    print()
+    # 🔍 DEBUG: List all registered routes (LOG_LEVEL=DEBUG)
+    if app.logger.isEnabledFor(logging.DEBUG):
+        for rule in app.url_map.iter_rules():
+            app.logger.debug("   %s %s -> %s", sorted(rule.methods), rule.rule, rule.endpoint)
     
     print(" API blueprints registered")
 
@@ -114,25 +158,20 @@ def register_request_handlers(app):
     Args:
         app: Flask application instance
     """
+    # One access line per request, sampled by LOG_SAMPLE_EVERY
+    access_log = get_sampled_logger('api.access')
     
     @app.before_request
     def before_request():
-        """Log incoming requests"""
-        # Skip logging for health check
-        if request.path == '/health':
-            return
+        """Start request timing; log request bodies at DEBUG only"""
+        g.request_start = time.perf_counter()
         
-        app.logger.info(f"📥 {request.method} {request.path}")
-        
-        # Log request body for POST/PUT/DELETE (only if there's actual content)
-        if request.method in ['POST', 'PUT', 'DELETE']:
-            try:
-                # Use silent=True to avoid raising errors on empty bodies
-                body = request.get_json(silent=True)
-                if body:
-                    app.logger.debug(f"Request body: {body}")
-            except Exception as e:
-                app.logger.debug(f"Could not parse request body: {str(e)}")
+        # Body is only parsed when DEBUG logging is actually on
+        if request.method in ['POST', 'PUT', 'DELETE'] and app.logger.isEnabledFor(logging.DEBUG):
+            # Use silent=True to avoid raising errors on empty bodies
+            body = request.get_json(silent=True)
+            if body:
+                app.logger.debug("Request body: %s", body)
     
     @app.after_request
     def after_request(response):
@@ -147,7 +186,13 @@ def register_request_handlers(app):
         response.headers['X-Frame-Options'] = 'DENY'
         response.headers['X-XSS-Protection'] = '1; mode=block'
         
-        app.logger.info(f"📤 {request.method} {request.path} - Status: {response.status_code}")
+        if access_log.isEnabledFor(logging.INFO):
+            elapsed_ms = (time.perf_counter() - g.get('request_start', time.perf_counter())) * 1000
+            access_log.info(
+                "%s %s - %s in %.1f ms", request.method, request.path, response.status_code, elapsed_ms,
+                extra={'method': request.method, 'path': request.path,
+                       'status': response.status_code, 'duration_ms': round(elapsed_ms, 1)}
+            )
         
         return response
     
@@ -155,15 +200,14 @@ def register_request_handlers(app):
     def teardown_db(exception=None):
         """Close database connections"""
         if exception:
-            app.logger.error(f"Teardown exception: {str(exception)}")
+            app.logger.error("Teardown exception: %s", exception)
     
     print(" Request handlers registered")
 
 
-# Create app instance for imports
-app = create_app()
-
 if __name__ == '__main__':
+    app = create_app()
+    
     # Get configuration from environment
     host = os.getenv('API_HOST', '0.0.0.0')
     port = int(os.getenv('API_PORT', 5001))
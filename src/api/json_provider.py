@@ -0,0 +1,42 @@
+"""
+orjson-backed JSON provider
+Encodes response bodies straight to bytes; falls back to Flask's default
+provider when orjson is not installed
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Same output as the default provider (sorted keys, HTTP dates), encoded by orjson"""
+
+    def _options(self) -> int:
+        # Datetimes go through self.default so they keep Flask's HTTP-date format
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def configure_json(app):
+    """Use orjson for request/response JSON when available"""
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
@@ -21,6 +21,25 @@ from .error_handler import (
     abort_with_error,
     validate_request_json
 )
+from .conditional import (
+    conditional_get,
+    make_etag,
+    ConditionalConfig
+)
+from .compression import (
+    register_compression,
+    CompressionConfig
+)
+from .rate_limit import (
+    register_rate_limiter,
+    rate_limit,
+    RateLimitConfig
+)
+from .query_monitor import (
+    register_query_monitor,
+    get_query_stats,
+    QueryStats
+)
 
 __all__ = [
     # Authentication
@@ -39,5 +58,24 @@ __all__ = [
     'register_error_handlers',
     'APIError',
     'abort_with_error',
-    'validate_request_json'
+    'validate_request_json',
+    
+    # Conditional GET
+    'conditional_get',
+    'make_etag',
+    'ConditionalConfig',
+    
+    # Compression
+    'register_compression',
+    'CompressionConfig',
+    
+    # Rate Limiting
+    'register_rate_limiter',
+    'rate_limit',
+    'RateLimitConfig',
+    
+    # SQL Monitoring
+    'register_query_monitor',
+    'get_query_stats',
+    'QueryStats'
 ]
\ No newline at end of file
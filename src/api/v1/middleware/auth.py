@@ -4,11 +4,44 @@ Provides token-based authentication for API endpoints
 """
 
 from functools import wraps
+from contextlib import contextmanager
+from contextvars import ContextVar
 from flask import request, jsonify, g
 from ....utils.jwt_helper import jwt_helper
 # from ....utils import jwt_helper
 from ....database.connection import get_db_session
-from ....database.models import Admin
+from ....services.principal_service import PrincipalService
+
+# (principal, token payload) verified once by /batch for all of its sub-requests
+_forwarded_auth = ContextVar('forwarded_auth', default=None)
+
+
+@contextmanager
+def authenticated_as(admin, payload):
+    """Let token_required/optional_auth accept an already verified principal in this context"""
+    token = _forwarded_auth.set((admin, payload))
+    try:
+        yield
+    finally:
+        _forwarded_auth.reset(token)
+
+
+def is_forwarded_request() -> bool:
+    """True inside authenticated_as, i.e. for a request dispatched on behalf of another one"""
+    return _forwarded_auth.get() is not None
+
+
+def _load_principal(admin_id):
+    """Active admin's id/role/is_active/full_name, from the principal cache when possible"""
+    principal = PrincipalService.get_cached(admin_id)
+    if principal is not None:
+        return principal
+    
+    db = get_db_session()
+    try:
+        return PrincipalService.load(db, admin_id)
+    finally:
+        db.close()
 
 def token_required(f):
     """
@@ -16,6 +49,13 @@ def token_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
+        # Sub-request of /batch: the token was verified by the batch call
+        forwarded = _forwarded_auth.get()
+        if forwarded is not None:
+            g.current_admin, g.token_payload = forwarded
+            kwargs['current_user'] = forwarded[0]
+            return f(*args, **kwargs)
+        
         token = None
         
         # Get token from Authorization header
@@ -48,35 +88,25 @@ def token_required(f):
                 'message': result['message']
             }), 401
         
-        # Get admin from database
-        db = get_db_session()
-        try:
-            payload = result['payload']
-            admin_id = payload.get('admin_id')
-            
-            admin = db.query(Admin).filter(
-                Admin.id == admin_id,
-                Admin.is_active == True
-            ).first()
-            
-            if not admin:
-                return jsonify({
-                    'success': False,
-                    'error': 'admin_not_found',
-                    'message': 'Admin account not found or inactive'
-                }), 401
-            
-            # Store in Flask g object for access in other decorators
-            g.current_admin = admin
-            g.token_payload = payload
-            
-            # Pass admin as kwarg to route function
-            kwargs['current_user'] = admin
-            
-            return f(*args, **kwargs)
-            
-        finally:
-            db.close()
+        # Get admin (cached principal, database on a miss)
+        payload = result['payload']
+        admin = _load_principal(payload.get('admin_id'))
+        
+        if not admin:
+            return jsonify({
+                'success': False,
+                'error': 'admin_not_found',
+                'message': 'Admin account not found or inactive'
+            }), 401
+        
+        # Store in Flask g object for access in other decorators
+        g.current_admin = admin
+        g.token_payload = payload
+        
+        # Pass admin as kwarg to route function
+        kwargs['current_user'] = admin
+        
+        return f(*args, **kwargs)
     
     return decorated
 
@@ -153,6 +183,12 @@ def optional_auth(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
+        forwarded = _forwarded_auth.get()
+        if forwarded is not None:
+            g.current_admin, g.token_payload = forwarded
+            kwargs['current_user'] = forwarded[0]
+            return f(*args, **kwargs)
+        
         token = None
         
         # Try to get token from Authorization header
@@ -180,29 +216,19 @@ def optional_auth(f):
             kwargs['current_user'] = None
             return f(*args, **kwargs)
         
-        # Valid token, get admin from database
-        db = get_db_session()
-        try:
-            payload = result['payload']
-            admin_id = payload.get('admin_id')
-            
-            admin = db.query(Admin).filter(
-                Admin.id == admin_id,
-                Admin.is_active == True
-            ).first()
-            
-            if admin:
-                g.current_admin = admin
-                g.token_payload = payload
-                kwargs['current_user'] = admin
-            else:
-                g.current_admin = None
-                g.token_payload = None
-                kwargs['current_user'] = None
-            
-            return f(*args, **kwargs)
-            
-        finally:
-            db.close()
+        # Valid token, get admin (cached principal, database on a miss)
+        payload = result['payload']
+        admin = _load_principal(payload.get('admin_id'))
+        
+        if admin:
+            g.current_admin = admin
+            g.token_payload = payload
+            kwargs['current_user'] = admin
+        else:
+            g.current_admin = None
+            g.token_payload = None
+            kwargs['current_user'] = None
+        
+        return f(*args, **kwargs)
     
     return decorated
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Response Compression Middleware
+Negotiated brotli/gzip compression of JSON and text responses above a size
+threshold (brotli only when the optional brotli package is installed)
+"""
+
+import os
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+
+class CompressionConfig:
+    """Compression settings (environment driven)"""
+
+    ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    # Smaller bodies are sent as-is; compressing them costs more than it saves
+    MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+
+    MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/csv')
+
+
+def choose_encoding(accept_encodings) -> str:
+    """Best supported encoding the client accepts ('br', 'gzip'), or None"""
+    candidates = []
+    if brotli is not None:
+        candidates.append('br')
+    candidates.append('gzip')
+
+    best, best_quality = None, 0
+    for encoding in candidates:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=CompressionConfig.BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=CompressionConfig.GZIP_LEVEL)
+
+
+def register_compression(app):
+    """
+    Compress eligible responses
+
+    Register before any other after_request handler: Flask runs them in reverse
+    registration order, so this one then sees the final body and headers
+    """
+    if not CompressionConfig.ENABLED:
+        print(" Response compression disabled")
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code >= 300
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in CompressionConfig.MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        data = response.get_data()
+        if len(data) < CompressionConfig.MIN_SIZE:
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    print(" Response compression registered" + (" (brotli, gzip)" if brotli else " (gzip)"))
@@ -0,0 +1,72 @@
+"""
+Conditional GET Middleware
+Version-based ETags for read-mostly resources: the version query runs first
+and a matching If-None-Match is answered with 304 before any real work
+"""
+
+import os
+import hashlib
+from functools import wraps
+from flask import request, make_response
+from ....database.connection import get_read_session
+
+
+class ConditionalConfig:
+    """Conditional GET settings (environment driven)"""
+
+    ENABLED = os.getenv('CONDITIONAL_GET_ENABLED', 'True').lower() == 'true'
+    # max-age for public resources; 0 means clients revalidate every time
+    PUBLIC_MAX_AGE = int(os.getenv('CONDITIONAL_PUBLIC_MAX_AGE', 0))
+
+
+def make_etag(*parts) -> str:
+    """Opaque tag for a resource version"""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20]
+
+
+def cache_control(public: bool) -> str:
+    """Cache-Control value: shared caches may keep public resources, everything revalidates"""
+    if public:
+        return f"public, max-age={ConditionalConfig.PUBLIC_MAX_AGE}, must-revalidate"
+    return "private, no-cache"
+
+
+def conditional_get(version_func, public: bool = False):
+    """
+    Decorator adding ETag / If-None-Match handling to a GET endpoint
+
+    Args:
+        version_func: callable(db, **view_args) returning a cheap, hashable version
+                      of the resource, or None to skip (e.g. not found)
+        public: resource is the same for everyone (no auth)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not ConditionalConfig.ENABLED or request.method != 'GET':
+                return f(*args, **kwargs)
+
+            db = get_read_session()
+            try:
+                version = version_func(db, **(request.view_args or {}))
+            finally:
+                db.close()
+
+            if version is None:
+                return f(*args, **kwargs)
+
+            # Weak: the same version is still equivalent after compression
+            etag = make_etag(request.endpoint, version)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = cache_control(public)
+            return response
+
+        return decorated
+    return decorator
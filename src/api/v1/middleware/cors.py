@@ -28,7 +28,8 @@ class CORSConfig:
             'Accept',
             'Origin',
             'Access-Control-Request-Method',
-            'Access-Control-Request-Headers'
+            'Access-Control-Request-Headers',
+            'If-None-Match'
         ]
         
         # Headers to expose to the client
@@ -36,7 +37,10 @@ class CORSConfig:
             'Content-Range',
             'X-Content-Range',
             'X-Total-Count',
-            'X-API-Version'
+            'X-API-Version',
+            'X-DB-Query-Count',
+            'X-DB-Time-Ms',
+            'ETag'
         ]
         
         # Enable credentials (cookies, authorization headers)
@@ -0,0 +1,133 @@
+"""
+SQL Query Monitor Middleware
+Counts queries and DB time per request, and flags N+1 patterns
+"""
+
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Statistics of the request currently being handled (None outside requests)
+_current_stats = ContextVar('sql_query_stats', default=None)
+
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?|:\w+)(?:\s*,\s*(?:%s|\?|:\w+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """Query count, DB time and statement fingerprints of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> list:
+        """Statements executed at least threshold times, most frequent first"""
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+
+class QueryMonitorConfig:
+    """Query monitor settings"""
+
+    def __init__(self):
+        self.enabled = os.getenv('SQL_MONITOR_ENABLED', 'True').lower() == 'true'
+        # Warn when a request runs more queries than this
+        self.query_threshold = int(os.getenv('SQL_QUERY_WARN_THRESHOLD', 20))
+        # Warn when the same statement runs this many times (likely N+1)
+        self.repeat_threshold = int(os.getenv('SQL_REPEAT_WARN_THRESHOLD', 5))
+        # Warn when total DB time exceeds this many milliseconds
+        self.time_threshold_ms = float(os.getenv('SQL_TIME_WARN_MS', 500))
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions differing only in IN-list size compare equal"""
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    return _IN_LIST.sub('(?)', statement)
+
+
+def get_query_stats():
+    """QueryStats of the current request, or None"""
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start_times = conn.info.get('query_start_time')
+    if stats is None or not start_times:
+        return
+    stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+def register_query_monitor(app):
+    """
+    Register per-request SQL instrumentation
+
+    Adds X-DB-Query-Count and X-DB-Time-Ms response headers and logs a
+    warning when a request exceeds the configured thresholds.
+
+    Args:
+        app: Flask application instance
+    """
+    config = QueryMonitorConfig()
+    if not config.enabled:
+        print(" SQL query monitor disabled")
+        return
+
+    @app.before_request
+    def start_query_stats():
+        _current_stats.set(QueryStats())
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = _current_stats.get()
+        if stats is None:
+            return response
+
+        time_ms = stats.total_time * 1000
+        response.headers['X-DB-Query-Count'] = str(stats.count)
+        response.headers['X-DB-Time-Ms'] = f"{time_ms:.1f}"
+
+        if stats.count:
+            app.logger.debug("🗄️  %s %s - %d queries, %.1f ms", request.method, request.path, stats.count, time_ms)
+
+        if stats.count > config.query_threshold:
+            app.logger.warning(
+                f"⚠️  {request.method} {request.path} ran {stats.count} queries "
+                f"(threshold {config.query_threshold})"
+            )
+        if time_ms > config.time_threshold_ms:
+            app.logger.warning(
+                f"⚠️  {request.method} {request.path} spent {time_ms:.1f} ms in the database "
+                f"(threshold {config.time_threshold_ms:.0f} ms)"
+            )
+        for sql, n in stats.repeated(config.repeat_threshold):
+            app.logger.warning(
+                f"⚠️  Possible N+1 in {request.method} {request.path}: "
+                f"statement ran {n} times: {sql[:200]}"
+            )
+
+        return response
+
+    @app.teardown_request
+    def clear_query_stats(exception=None):
+        _current_stats.set(None)
+
+    print(" SQL query monitor registered")
@@ -0,0 +1,240 @@
+"""
+Rate Limiting Middleware
+Token buckets per client (every request) and per route (decorator), kept
+in-process by default or in Redis when several workers must share them.
+The bot and the portal call the API on behalf of many end users; with the
+shared INTERNAL_API_TOKEN they name that user in X-Client-Id so each one
+gets its own bucket instead of all sharing the proxy's address
+"""
+
+import os
+import re
+import hmac
+import math
+import time
+import logging
+import threading
+from functools import wraps
+from flask import request, jsonify, current_app
+
+_LIMIT = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)\s*$")
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+INTERNAL_TOKEN_HEADER = 'X-Internal-Token'
+CLIENT_ID_HEADER = 'X-Client-Id'
+
+logger = logging.getLogger(__name__)
+
+
+def parse_limit(value: str) -> tuple:
+    """'120/minute' -> (capacity, refill rate in tokens per second)"""
+    match = _LIMIT.match(value or '')
+    if not match:
+        raise ValueError(f"Invalid rate limit '{value}', expected e.g. '120/minute'")
+    capacity = int(match.group(1))
+    return capacity, capacity / _PERIODS[match.group(2)]
+
+
+class RateLimitConfig:
+    """Rate limit settings (environment driven)"""
+
+    def __init__(self):
+        self.enabled = os.getenv('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+        # Per client (IP) for /api/v1/bot/* and for everything else
+        self.bot_limit = parse_limit(os.getenv('RATE_LIMIT_BOT', '300/minute'))
+        self.api_limit = parse_limit(os.getenv('RATE_LIMIT_API', '600/minute'))
+        # redis://... to share buckets between workers; empty = in-process
+        self.storage_url = os.getenv('RATE_LIMIT_STORAGE_URL', '').strip()
+        # Shared secret of the bot and portal; empty = every caller keyed by address
+        self.internal_token = os.getenv('INTERNAL_API_TOKEN', '').strip()
+
+
+class MemoryBucketStore:
+    """Token buckets in a dict; one lock, O(1) per request"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity: int, rate: float) -> tuple:
+        """Take one token; returns (allowed, seconds until a token is available)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+
+            if tokens >= 1:
+                allowed, retry_after = True, 0.0
+                tokens -= 1
+            else:
+                allowed, retry_after = False, (1 - tokens) / rate
+
+            if key not in self._buckets and len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            # Bucket is full again (same as absent) from full_at on
+            full_at = now + (capacity - tokens) / rate
+            self._buckets[key] = (tokens, now, full_at)
+            return allowed, retry_after
+
+    def _prune(self, now: float):
+        """Drop buckets that have refilled completely, else the oldest one (lock held)"""
+        full = [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]
+        for key in full:
+            del self._buckets[key]
+        if not full and self._buckets:
+            del self._buckets[next(iter(self._buckets))]
+
+
+class RedisBucketStore:
+    """Token buckets in Redis, updated atomically by a Lua script"""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= 1 then
+        allowed = 1
+        tokens = tokens - 1
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed for shared buckets
+        self._client = redis.Redis.from_url(url)
+        # from_url doesn't connect; fail here rather than on every request
+        self._client.ping()
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def take(self, key, capacity: int, rate: float) -> tuple:
+        allowed, retry_after = self._script(
+            keys=['ratelimit:' + ':'.join(str(part) for part in key)],
+            args=[capacity, rate, time.time()]
+        )
+        return bool(allowed), float(retry_after)
+
+
+def _create_store(config: RateLimitConfig):
+    if config.storage_url:
+        try:
+            store = RedisBucketStore(config.storage_url)
+            logger.info(" Rate limiter using shared Redis store")
+            return store
+        except Exception as e:
+            logger.warning("⚠️  Rate limiter: Redis store unavailable (%s), using in-process buckets", e)
+    return MemoryBucketStore()
+
+
+def client_key():
+    """
+    Client identity for per-client buckets
+
+    Trusted internal callers (valid X-Internal-Token) are keyed on the end user they
+    forward in X-Client-Id, and exempt when they forward none (their own background
+    calls); everyone else on the remote address (proxy-aware via ProxyFix)
+
+    Returns:
+        str or None: bucket key, None when the caller is exempt
+    """
+    config = current_app.extensions.get('rate_limit_config')
+    token = request.headers.get(INTERNAL_TOKEN_HEADER)
+    if token and config and config.internal_token and hmac.compare_digest(token, config.internal_token):
+        client_id = request.headers.get(CLIENT_ID_HEADER, '').strip()
+        return 'client:' + client_id[:100] if client_id else None
+    return request.remote_addr or 'unknown'
+
+
+def too_many_requests(retry_after: float):
+    """429 response in the error handler's format, with Retry-After"""
+    response = jsonify({
+        'success': False,
+        'error': 'rate_limit_exceeded',
+        'message': 'Too many requests. Please try again later.',
+        'status_code': 429,
+        'path': request.path
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def _check(key, limit: tuple):
+    """429 response if the bucket is empty, else None; never blocks a request on store errors"""
+    store = current_app.extensions.get('rate_limit_store')
+    if store is None:
+        return None
+    try:
+        allowed, retry_after = store.take(key, *limit)
+    except Exception as e:
+        current_app.logger.warning(f"⚠️  Rate limit store error: {e}")
+        return None
+    if allowed:
+        return None
+    current_app.logger.warning(f"🚦 Rate limited {key} on {request.method} {request.path}")
+    return too_many_requests(retry_after)
+
+
+def rate_limit(limit: str, per_client: bool = True):
+    """
+    Decorator adding a route-specific bucket on top of the per-client limit
+
+    Args:
+        limit: e.g. '10/minute'
+        per_client: one bucket per client; False shares one bucket among all
+                    clients of this route (caps total DB work behind it)
+    """
+    parsed = parse_limit(limit)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            client = client_key() if per_client else '*'
+            if client is None:
+                return f(*args, **kwargs)
+            limited = _check(('route', request.endpoint, client), parsed)
+            if limited is not None:
+                return limited
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+def register_rate_limiter(app):
+    """
+    Register the per-client limiter (before any other request work)
+
+    Args:
+        app: Flask application instance
+    """
+    config = RateLimitConfig()
+    if not config.enabled:
+        logger.info(" Rate limiter disabled")
+        return
+
+    app.extensions['rate_limit_store'] = _create_store(config)
+    app.extensions['rate_limit_config'] = config
+    bot_prefix = '/api/v1/bot/'
+
+    @app.before_request
+    def limit_client():
+        if request.method == 'OPTIONS' or request.path in ('/health', '/ready'):
+            return None
+        client = client_key()
+        if client is None:
+            return None
+        if request.path.startswith(bot_prefix):
+            return _check(('bot', client), config.bot_limit)
+        return _check(('api', client), config.api_limit)
+
+    logger.info(" Rate limiter registered")
@@ -5,16 +5,18 @@ Handles all admin-related API endpoints
 
 from flask import Blueprint, request, jsonify, g
 from ..middleware.auth import token_required, super_admin_required
+from ..middleware.conditional import conditional_get
 from ..schemas import (
     AdminResponseSchema,
-    AdminListResponseSchema,
     AdminCreateSchema,
     AdminUpdateSchema,
     # AdminPasswordUpdateSchema,  # ❌ Remove if not using
     AdminStatsSchema,
+    serialize_admin_list_item,
     success_response,
     error_response,
     paginated_response,
+    cursor_paginated_response,
     created_response,
     updated_response,
     deleted_response,
@@ -22,7 +24,8 @@ from ..schemas import (
     validation_error_response
 )
 from ....services.admin_service import AdminService
-from ....database.connection import get_db_session
+from ....database.connection import get_db_session, get_read_session
+from ....utils.pagination import InvalidCursorError
 from marshmallow import ValidationError
 import traceback
 
@@ -31,7 +34,6 @@ admins_api_bp = Blueprint('admins_api', __name__)
 
 # Initialize schemas
 admin_response_schema = AdminResponseSchema()
-admin_list_schema = AdminListResponseSchema(many=True)
 admin_create_schema = AdminCreateSchema()
 admin_update_schema = AdminUpdateSchema()
 # admin_password_schema = AdminPasswordUpdateSchema()  # ❌ Remove if not using
@@ -40,6 +42,7 @@ admin_stats_schema = AdminStatsSchema()
 
 @admins_api_bp.route('/admins', methods=['GET'])
 @token_required
+@conditional_get(lambda db, **_: AdminService.get_admins_version(db))
 def list_admins(current_user):
     """Get paginated list of admins
     
@@ -50,14 +53,18 @@ def list_admins(current_user):
         - role (str): Filter by role (admin/super_admin)
         - is_active (bool): Filter by active status
         - is_available (bool): Filter by availability
+        - cursor (str): Keyset pagination cursor; pass empty for the first page
+        - include_total (bool): Include the (cached) total in cursor mode
     """
-    db = get_db_session()
+    db = get_read_session()
     try:
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
         search = request.args.get('search', '').strip() or None
         role = request.args.get('role')
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() in ['true', '1', 'yes']
         
         #  Fix boolean parsing
         is_active = None
@@ -78,11 +85,22 @@ def list_admins(current_user):
             search=search,
             role=role,
             is_active=is_active,
-            is_available=is_available
+            is_available=is_available,
+            cursor=cursor,
+            include_total=include_total
         )
         
         # Serialize data
-        admins_data = admin_list_schema.dump(result['admins'])
+        admins_data = [serialize_admin_list_item(admin) for admin in result['admins']]
+        
+        if cursor is not None:
+            return cursor_paginated_response(
+                data=admins_data,
+                per_page=result['per_page'],
+                next_cursor=result['next_cursor'],
+                total=result['total'],
+                message=f"Retrieved {len(admins_data)} admins"
+            )
         
         return paginated_response(
             data=admins_data,
@@ -92,6 +110,8 @@ def list_admins(current_user):
             message=f"Retrieved {len(admins_data)} admins"
         )
         
+    except InvalidCursorError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         print(f"Error in list_admins: {str(e)}")
         print(traceback.format_exc())
@@ -102,6 +122,7 @@ def list_admins(current_user):
 
 @admins_api_bp.route('/admins/<string:admin_id>', methods=['GET'])  #  Changed to string
 @token_required
+@conditional_get(lambda db, **_: AdminService.get_admins_version(db))
 def get_admin(current_user, admin_id):
     """Get single admin by ID (UUID)"""
     db = get_db_session()
@@ -272,7 +293,7 @@ def toggle_admin_availability(current_user, admin_id):
 @token_required
 def get_admin_stats(current_user):
     """Get admin statistics"""
-    db = get_db_session()
+    db = get_read_session()
     try:
         stats = AdminService.get_admin_statistics(db)
         stats_data = admin_stats_schema.dump(stats)
@@ -306,10 +327,10 @@ def toggle_admin_status(current_user, admin_id):
         if not admin:
             return not_found_response('Admin')
         
-        # Toggle status
-        admin.is_active = not admin.is_active
-        db.commit()
-        db.refresh(admin)
+        # Toggle status (service also drops the cached principal)
+        result = AdminService.toggle_admin_status(db, admin_id, current_user.id)
+        if not result['success']:
+            return error_response(result['message'], 400)
         
         status = "activated" if admin.is_active else "deactivated"
         admin_response = admin_response_schema.dump(admin)
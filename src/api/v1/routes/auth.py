@@ -3,18 +3,23 @@ API Authentication Routes
 JWT-based authentication for REST API
 """
 
+import logging
 from flask import Blueprint, request, jsonify, g
 from ....database.connection import get_db_session
 from ....services.auth_service import AuthService
 from ..middleware.auth import token_required, optional_auth
+from ..middleware.rate_limit import rate_limit
 from ..middleware.error_handler import validate_request_json, APIError
 from ..schemas.response_schema import ResponseBuilder
 
 auth_api_bp = Blueprint('auth_api', __name__)
+
+logger = logging.getLogger(__name__)
 auth_service = AuthService()
 
 
 @auth_api_bp.route('/auth/login', methods=['POST'])
+@rate_limit('10/minute')
 @validate_request_json(['telegram_id'])
 def login():
     """
@@ -129,23 +134,30 @@ def refresh_token():
 @token_required
 def get_current_admin(current_user):  #  Add parameter
     """Get current authenticated admin information"""
-    admin = g.current_admin
-    
-    return ResponseBuilder.success(
-        data={
-            'id': admin.id,
-            'telegram_id': str(admin.telegram_id),
-            'telegram_username': admin.telegram_username,
-            'full_name': admin.full_name,
-            'role': admin.role.value if hasattr(admin.role, 'value') else admin.role,
-            'is_active': admin.is_active,
-            'is_available': admin.is_available,
-            'division': admin.division,
-            'created_at': admin.created_at.isoformat() if admin.created_at else None,
-            'last_login': admin.last_login.isoformat() if admin.last_login else None
-        },
-        message='Admin info retrieved successfully'
-    )
+    # g.current_admin only carries the cached principal fields; load the full row
+    db = get_db_session()
+    try:
+        admin = auth_service.get_admin_by_id(db, g.current_admin.id)
+        if not admin:
+            return ResponseBuilder.not_found(resource_type='Admin')
+        
+        return ResponseBuilder.success(
+            data={
+                'id': admin.id,
+                'telegram_id': str(admin.telegram_id),
+                'telegram_username': admin.telegram_username,
+                'full_name': admin.full_name,
+                'role': admin.role.value if hasattr(admin.role, 'value') else admin.role,
+                'is_active': admin.is_active,
+                'is_available': admin.is_available,
+                'division': admin.division,
+                'created_at': admin.created_at.isoformat() if admin.created_at else None,
+                'last_login': admin.last_login.isoformat() if admin.last_login else None
+            },
+            message='Admin info retrieved successfully'
+        )
+    finally:
+        db.close()
 
 
 @auth_api_bp.route('/auth/logout', methods=['POST'])
@@ -297,6 +309,7 @@ def verify_token(current_user):  #  Add parameter
 
 
 @auth_api_bp.route('/auth/telegram-callback', methods=['POST'])
+@rate_limit('10/minute')
 def telegram_callback():
     """
     Handle Telegram Login Widget callback (for web-based login)
@@ -305,7 +318,7 @@ def telegram_callback():
     try:
         telegram_data = request.get_json()
         
-        print(f"🔍 Telegram callback received: {telegram_data}")  # Debug
+        logger.debug("🔍 Telegram callback received for id %s", telegram_data.get('id'))
         
         if not telegram_data.get('id'):
             raise APIError("Telegram ID is required", status_code=400)
@@ -313,7 +326,9 @@ def telegram_callback():
         # Use existing Telegram authentication method
         result = auth_service.authenticate_admin_telegram(db, telegram_data)
         
-        print(f"🔍 Auth result: {result}")  # Debug
+        # Result carries tokens: log the outcome only
+        logger.debug("🔍 Telegram auth for id %s: %s", telegram_data.get('id'),
+                     'ok' if result['success'] else result.get('message'))
         
         if result['success']:
             #  FIXED: Return proper API tokens
@@ -331,9 +346,7 @@ def telegram_callback():
             return ResponseBuilder.unauthorized(result['message'])
     
     except Exception as e:
-        print(f"❌ Telegram login error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Telegram login error: %s", e)
         return ResponseBuilder.error(
             message=f"Telegram login failed: {str(e)}",
             status_code=500
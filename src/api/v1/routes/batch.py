@@ -0,0 +1,159 @@
+"""
+Batch API Routes
+Runs several API calls in one round-trip: the token is checked once and the
+sub-requests share one database session (or run side by side when they are
+all reads and the caller asks for it)
+"""
+
+import os
+from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from flask import Blueprint, request, current_app, g
+from werkzeug.exceptions import HTTPException
+from ..middleware.auth import token_required, authenticated_as, is_forwarded_request
+from ..middleware.error_handler import validate_request_json, APIError
+from ..middleware.rate_limit import INTERNAL_TOKEN_HEADER, CLIENT_ID_HEADER
+from ..schemas import success_response
+from ....database.connection import shared_session
+
+batch_api_bp = Blueprint('batch_api', __name__)
+
+API_PREFIX = '/api/v1'
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', 10))
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 4))
+METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+# Worker threads for parallel batches, created on first use
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix='batch')
+    return _executor
+
+
+def _is_batch_path(path: str, method: str) -> bool:
+    """Whether path resolves to this endpoint (after percent-decoding, like the real dispatch)"""
+    try:
+        endpoint, _ = current_app.url_map.bind('').match(unquote(path.split('?')[0]), method)
+    except HTTPException:
+        return False
+    return endpoint == 'batch_api.run_batch'
+
+
+def _parse_requests(data: dict) -> list:
+    """Validated sub-request specs from the request body"""
+    items = data.get('requests')
+    if not isinstance(items, list) or not items:
+        raise APIError("'requests' must be a non-empty list", status_code=422)
+    if len(items) > BATCH_MAX_REQUESTS:
+        raise APIError(f"A batch may contain at most {BATCH_MAX_REQUESTS} requests", status_code=422)
+
+    specs = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise APIError(f"Request {index} must be an object", status_code=422)
+
+        method = str(item.get('method', 'GET')).upper()
+        path = item.get('path')
+        if method not in METHODS:
+            raise APIError(f"Request {index}: unsupported method {method}", status_code=422)
+        if not isinstance(path, str) or not path.startswith(API_PREFIX + '/'):
+            raise APIError(f"Request {index}: path must start with {API_PREFIX}/", status_code=422)
+        if _is_batch_path(path, method):
+            raise APIError(f"Request {index}: batches cannot be nested", status_code=422)
+
+        specs.append({
+            'id': item.get('id', index),
+            'method': method,
+            'path': path,
+            'params': item.get('params') or {},
+            'body': item.get('body')
+        })
+    return specs
+
+
+def _dispatch(app, spec: dict, environ_base: dict, headers: dict, auth: tuple) -> dict:
+    """Run one sub-request through the normal pipeline (hooks, rate limits, error handlers)"""
+    with app.app_context(), authenticated_as(*auth):
+        with app.test_request_context(
+            spec['path'],
+            method=spec['method'],
+            # None lets a query string written into the path through
+            query_string=spec['params'] or None,
+            json=spec['body'],
+            environ_base=environ_base,
+            headers={'Accept': 'application/json', **headers}
+        ):
+            try:
+                response = app.full_dispatch_request()
+            except Exception as e:
+                current_app.logger.exception("Batch sub-request %s %s failed", spec['method'], spec['path'])
+                return {'id': spec['id'], 'status': 500, 'body': {'success': False, 'message': str(e)}}
+
+            # Streamed bodies (exports) would be buffered whole into the batch response
+            if response.is_streamed or (response.mimetype != 'application/json'
+                                        and response.content_length):
+                response.close()
+                return {'id': spec['id'], 'status': 422, 'body': {
+                    'success': False,
+                    'message': f"{spec['method']} {spec['path']} returns a streamed or non-JSON body "
+                               "and cannot be batched"
+                }}
+
+            return {'id': spec['id'], 'status': response.status_code, 'body': response.get_json(silent=True)}
+
+
+@batch_api_bp.route('/batch', methods=['POST'])
+@token_required
+@validate_request_json(['requests'])
+def run_batch(current_user):
+    """
+    Run several API requests in one call
+
+    Request Body:
+        - requests (list): up to BATCH_MAX_REQUESTS items of
+            {id, method (default GET), path ('/api/v1/...'), params, body}
+        - parallel (bool): run concurrently (only honoured when every request is a GET;
+                           each then uses its own database session)
+
+    Returns:
+        - responses: [{id, status, body}] in request order
+    """
+    if is_forwarded_request():
+        raise APIError("Batches cannot be nested", status_code=422)
+
+    specs = _parse_requests(request.get_json())
+    read_only = all(spec['method'] == 'GET' for spec in specs)
+    parallel = bool(request.get_json().get('parallel')) and read_only and len(specs) > 1
+
+    app = current_app._get_current_object()
+    auth = (g.current_admin, g.token_payload)
+    environ_base = {'REMOTE_ADDR': request.remote_addr}
+    # Sub-requests count against the same rate-limit bucket as the batch
+    headers = {name: request.headers[name] for name in (INTERNAL_TOKEN_HEADER, CLIENT_ID_HEADER)
+               if name in request.headers}
+
+    if parallel:
+        futures = [
+            _get_executor().submit(_dispatch, app, spec, environ_base, headers, auth)
+            for spec in specs
+        ]
+        responses = [future.result() for future in futures]
+    else:
+        responses = []
+        with shared_session(read_only=read_only) as db:
+            for spec in specs:
+                # Own context copy: per-request state (query stats) stays out of the batch's
+                result = copy_context().run(_dispatch, app, spec, environ_base, headers, auth)
+                if result['status'] >= 400:
+                    db.rollback()
+                responses.append(result)
+
+    return success_response(
+        data={'responses': responses, 'parallel': parallel},
+        message=f"Batch of {len(responses)} requests completed"
+    )
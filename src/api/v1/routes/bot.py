@@ -3,18 +3,26 @@ Bot API Routes
 Special endpoints for Telegram Bot operations
 """
 from flask import Blueprint, request, jsonify
+from ..middleware.conditional import conditional_get
+from ..middleware.rate_limit import rate_limit
 from ..schemas import success_response, error_response, created_response, AdminResponseSchema
 from ....services import UserService, FAQService, ChatService, SystemSettingService
-from ....database.connection import get_db_session
+from ....database.connection import get_db_session, get_read_session
 from marshmallow import ValidationError
-import traceback
+import logging
+from ....utils.logging_config import get_sampled_logger
 
 bot_api_bp = Blueprint('bot_api', __name__)
 
+logger = logging.getLogger(__name__)
+# One line per bot message/session; sampled by LOG_SAMPLE_EVERY
+broadcast_log = get_sampled_logger(__name__ + '.broadcast')
+
 # Initialize schema
 admin_response_schema = AdminResponseSchema()
 
 @bot_api_bp.route('/bot/user/create-or-get', methods=['POST'])
+@rate_limit('120/minute')
 def create_or_get_user():
     """Create user or get existing (bot-specific)"""
     try:
@@ -67,11 +75,11 @@ def create_or_get_user():
                 return error_response(create_result['message'], 400)
                 
     except Exception as e:
-        print(f"❌ Error in create_or_get_user: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in create_or_get_user: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/chat/create-session', methods=['POST'])
+@rate_limit('60/minute')
 def create_chat_session():
     """Create new chat session with available admin"""
     try:
@@ -103,11 +111,11 @@ def create_chat_session():
                 return error_response('Failed to create session', 500)
                 
     except Exception as e:
-        print(f"❌ Error in create_chat_session: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in create_chat_session: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/chat/send-message', methods=['POST'])
+@rate_limit('240/minute')
 def send_message():
     """Send message in chat session"""
     try:
@@ -140,15 +148,15 @@ def send_message():
                 return error_response('Failed to send message', 500)
                 
     except Exception as e:
-        print(f"❌ Error in send_message: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in send_message: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/faq/categories', methods=['GET'])
+@conditional_get(lambda db, **_: SystemSettingService.get_faq_content_version(db), public=True)
 def get_faq_categories():
     """Get all active FAQ categories"""
     try:
-        with get_db_session() as db:
+        with get_read_session() as db:
             # ✅ Use SystemSettingService instead of FAQService
             setting_service = SystemSettingService()
             categories = setting_service.get_active_categories(db)
@@ -166,15 +174,15 @@ def get_faq_categories():
             )
                 
     except Exception as e:
-        print(f"❌ Error in get_faq_categories: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in get_faq_categories: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/faq/category/<int:category_id>', methods=['GET'])
+@conditional_get(lambda db, **_: SystemSettingService.get_faq_content_version(db), public=True)
 def get_category_faqs(category_id):
     """Get FAQs for a specific category"""
     try:
-        with get_db_session() as db:
+        with get_read_session() as db:
             # ✅ Use SystemSettingService instead of FAQService
             setting_service = SystemSettingService()
             
@@ -206,15 +214,15 @@ def get_category_faqs(category_id):
             )
                 
     except Exception as e:
-        print(f"❌ Error in get_category_faqs: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in get_category_faqs: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/faq/<int:faq_id>', methods=['GET'])
+@conditional_get(lambda db, **_: SystemSettingService.get_faq_content_version(db), public=True)
 def get_faq_by_id(faq_id):
     """Get a specific FAQ by ID"""
     try:
-        with get_db_session() as db:
+        with get_read_session() as db:
             setting_service = SystemSettingService()
             
             # Get FAQ
@@ -234,11 +242,13 @@ def get_faq_by_id(faq_id):
             )
                 
     except Exception as e:
-        print(f"❌ Error in get_faq_by_id: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in get_faq_by_id: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/faq/search', methods=['GET'])
+# Search runs LIKE scans; one bucket shared by all clients caps the DB load
+@rate_limit('20/second', per_client=False)
+@conditional_get(lambda db, **_: SystemSettingService.get_faq_content_version(db), public=True)
 def search_faqs():
     """Search FAQs by keyword"""
     try:
@@ -247,7 +257,7 @@ def search_faqs():
         if not query:
             return error_response('Search query required', 400)
         
-        with get_db_session() as db:
+        with get_read_session() as db:
             # ✅ Use SystemSettingService instead of FAQService
             setting_service = SystemSettingService()
             faqs = setting_service.search_faqs(db, query, active_only=True)
@@ -264,8 +274,7 @@ def search_faqs():
             )
                 
     except Exception as e:
-        print(f"❌ Error in search_faqs: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in search_faqs: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/chat/broadcast-message', methods=['POST'])
@@ -293,21 +302,20 @@ def broadcast_message():
             )
             
             if response.status_code == 200:
-                print(f"✅ Message broadcasted successfully via web app")
+                broadcast_log.debug("✅ Message for session %s broadcasted via web app", data['session_id'])
                 return success_response(message='Message broadcasted successfully')
             else:
-                print(f"⚠️ Broadcast failed: {response.status_code}")
+                logger.warning("⚠️ Broadcast failed: web app returned %s", response.status_code)
                 # Don't fail the request, just log it
                 return success_response(message='Message received but broadcast failed')
                 
         except requests.exceptions.RequestException as e:
-            print(f"⚠️ Could not reach web app for broadcasting: {e}")
+            logger.warning("⚠️ Could not reach web app for broadcasting: %s", e)
             # Don't fail - the message is still saved, just no real-time update
             return success_response(message='Message received')
                 
     except Exception as e:
-        print(f"❌ Error in broadcast_message: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in broadcast_message: %s", e)
         return error_response(str(e), 500)
 
 @bot_api_bp.route('/bot/chat/broadcast-new-session', methods=['POST'])
@@ -335,17 +343,16 @@ def broadcast_new_session():
             )
             
             if response.status_code == 200:
-                print(f"✅ New session broadcasted successfully via web app")
+                broadcast_log.debug("✅ New session %s broadcasted via web app", data['session_id'])
                 return success_response(message='New session broadcasted successfully')
             else:
-                print(f"⚠️ Broadcast failed: {response.status_code}")
+                logger.warning("⚠️ Broadcast failed: web app returned %s", response.status_code)
                 return success_response(message='Session created but broadcast failed')
                 
         except requests.exceptions.RequestException as e:
-            print(f"⚠️ Could not reach web app for broadcasting: {e}")
+            logger.warning("⚠️ Could not reach web app for broadcasting: %s", e)
             return success_response(message='Session created')
                 
     except Exception as e:
-        print(f"❌ Error in broadcast_new_session: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error in broadcast_new_session: %s", e)
         return error_response(str(e), 500)
\ No newline at end of file
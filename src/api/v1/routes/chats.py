@@ -3,8 +3,11 @@ Chats API Routes
 Handles all chat-related API endpoints
 """
 
-from flask import Blueprint, request, jsonify
+from datetime import datetime
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from ..middleware.auth import token_required, admin_required
+from ..middleware.rate_limit import rate_limit
+from ..middleware.conditional import conditional_get
 from ..schemas import (
     ChatSessionResponseSchema,
     ChatSessionListResponseSchema,
@@ -13,23 +16,34 @@ from ..schemas import (
     MessageCreateSchema,
     ChatMessageResponseSchema,
     ChatAssignSchema,
+    ChatBulkSchema,
+    TranscriptExportQuerySchema,
     ChatStatsSchema,
+    serialize_chat_session_list_item,
+    serialize_chat_session_detail,
+    serialize_chat_message,
     success_response,
     error_response,
     paginated_response,
+    cursor_paginated_response,
     created_response,
     updated_response,
     not_found_response,
     validation_error_response
 )
-from ....services.chat_service import ChatService
-from ....database.connection import get_db_session
+from ....services.chat_service import ChatService, BULK_SESSION_LIMIT
+from ....services.admin_service import AdminService
+from ....services.export_service import ExportService
+from ....database.connection import get_db_session, get_read_session
+from ....utils.pagination import InvalidCursorError
 from marshmallow import ValidationError
-import traceback
+import logging
 
 # Create blueprint
 chats_api_bp = Blueprint('chats_api', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Initialize schemas
 session_response_schema = ChatSessionResponseSchema()
 session_list_schema = ChatSessionListResponseSchema(many=True)
@@ -39,6 +53,8 @@ message_create_schema = MessageCreateSchema()
 message_response_schema = ChatMessageResponseSchema()
 message_list_schema = ChatMessageResponseSchema(many=True)
 chat_assign_schema = ChatAssignSchema()
+chat_bulk_schema = ChatBulkSchema()
+export_query_schema = TranscriptExportQuerySchema()
 chat_stats_schema = ChatStatsSchema()
 
 
@@ -55,6 +71,8 @@ def list_chat_sessions(current_user):
         - status (str): Filter by status (waiting/active/closed)
         - admin_id (str): Filter by assigned admin (UUID)
         - user_id (str): Filter by user (UUID)
+        - cursor (str): Keyset pagination cursor; pass empty for the first page
+        - include_total (bool): Include the (cached) total in cursor mode
     """
     db = get_db_session()
     try:
@@ -63,6 +81,8 @@ def list_chat_sessions(current_user):
         status = request.args.get('status')
         admin_id = request.args.get('admin_id')  #  String (UUID)
         user_id = request.args.get('user_id')  #  String (UUID)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() in ['true', '1', 'yes']
         
         result = ChatService.get_all_sessions(
             db=db,
@@ -70,24 +90,26 @@ def list_chat_sessions(current_user):
             per_page=per_page,
             status=status,
             admin_id=admin_id,
-            user_id=user_id
+            user_id=user_id,
+            cursor=cursor,
+            include_total=include_total
         )
         
         #  Serialize sessions with proper data
-        sessions_data = []
-        for session in result['sessions']:
-            session_dict = {
-                'id': session.id,
-                'user_id': session.user_id,
-                'admin_id': session.admin_id,
-                'status': session.status.value if hasattr(session.status, 'value') else session.status,
-                'start_time': session.start_time.isoformat() if session.start_time else None,
-                'end_time': session.end_time.isoformat() if session.end_time else None,
-                'message_count': 0,  # TODO: Calculate actual count
-                'user_name': session.user.full_name if session.user else None,
-                'admin_name': session.admin.full_name if session.admin else None
-            }
-            sessions_data.append(session_dict)
+        summaries = result['summaries']
+        sessions_data = [
+            serialize_chat_session_list_item(session, summaries.get(session.id, {}))
+            for session in result['sessions']
+        ]
+        
+        if cursor is not None:
+            return cursor_paginated_response(
+                data=sessions_data,
+                per_page=result['per_page'],
+                next_cursor=result['next_cursor'],
+                total=result['total'],
+                message=f"Retrieved {len(sessions_data)} chat sessions"
+            )
         
         return paginated_response(
             data=sessions_data,
@@ -97,57 +119,88 @@ def list_chat_sessions(current_user):
             message=f"Retrieved {len(sessions_data)} chat sessions"
         )
         
+    except InvalidCursorError as e:
+        return error_response(str(e), 400)
     except Exception as e:
-        print(f"❌ Error listing sessions: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error listing sessions: %s", e)
         return error_response(str(e), 500)
     finally:
         db.close()
 
 
+@chats_api_bp.route('/chats/export', methods=['GET'])
+@token_required
+@admin_required
+@rate_limit('5/minute')
+def export_transcripts(current_user):
+    """
+    Stream chat sessions with their messages as a download
+    
+    Query Parameters:
+        - format (str): ndjson (default) or csv
+        - date_from (str): Sessions started at/after this date or datetime (ISO)
+        - date_to (str): Sessions started before this datetime (a bare date includes that day)
+        - status (str): waiting/active/closed
+        - admin_id (str): Assigned admin (UUID)
+        - user_id (str): User (UUID)
+    
+    NDJSON: a {"type": "session"} line per session followed by its {"type": "message"} lines.
+    CSV: one row per message with the session's columns repeated.
+    Archived sessions in the range come first.
+    """
+    try:
+        params = export_query_schema.load(request.args.to_dict())
+    except ValidationError as err:
+        return validation_error_response(err.messages)
+    
+    export_format = params.pop('format')
+    db = get_read_session()
+    
+    def generate():
+        # The session lives as long as the stream, not the view function
+        try:
+            rows = ExportService.transcript_rows(db, **params)
+            if export_format == 'csv':
+                yield from ExportService.iter_csv(rows)
+            else:
+                yield from ExportService.iter_ndjson(rows)
+        except Exception:
+            # Headers are already sent; all we can do is log and end the stream
+            logger.exception("❌ Transcript export failed")
+        finally:
+            db.close()
+    
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    filename = f"transcripts-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Accel-Buffering': 'no'  # don't let a proxy buffer the whole export
+        }
+    )
+
+
 @chats_api_bp.route('/chats/<int:session_id>', methods=['GET'])
 @token_required
 @admin_required
+@conditional_get(ChatService.get_session_version)
 def get_chat_session(current_user, session_id):
     """Get chat session with all messages"""
     db = get_db_session()
     try:
-        print(f"🔍 Looking for session_id: {session_id}")
-        
         session = ChatService.get_session_by_id(db, session_id)
         
         if not session:
-            print(f"❌ Session {session_id} not found in database")
+            logger.debug("Chat session %s not found", session_id)
             return not_found_response('Chat session')
         
         #  Get messages for this session
-        messages = ChatService.get_session_messages(db, session_id)
+        messages = ChatService.get_session_messages(db, session_id, session=session)
         
         #  Serialize with messages included
-        session_data = {
-            'id': session.id,
-            'user_id': session.user_id,
-            'admin_id': session.admin_id,
-            'status': session.status.value if hasattr(session.status, 'value') else session.status,
-            'start_time': session.start_time.isoformat() if session.start_time else None,
-            'end_time': session.end_time.isoformat() if session.end_time else None,
-            'user': {
-                'id': session.user.id,
-                'full_name': session.user.full_name,
-                'telegram_id': session.user.telegram_id
-            } if session.user else None,
-            'admin': {
-                'id': session.admin.id,
-                'full_name': session.admin.full_name,
-                'telegram_id': session.admin.telegram_id
-            } if session.admin else None,
-            'messages': [{
-                'id': msg.id,
-                'message': msg.message,
-                'is_from_admin': msg.is_from_admin,
-                'timestamp': msg.timestamp.isoformat() if msg.timestamp else None
-            } for msg in messages]
-        }
+        session_data = serialize_chat_session_detail(session, messages)
         
         return success_response(
             data=session_data,
@@ -155,8 +208,7 @@ def get_chat_session(current_user, session_id):
         )
         
     except Exception as e:
-        print(f"❌ Error getting chat session: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error getting chat session %s: %s", session_id, e)
         return error_response(str(e), 500)
     finally:
         db.close()
@@ -182,7 +234,7 @@ def create_chat_session(current_user):
         except ValidationError as err:
             return validation_error_response(err.messages)
         
-        print(f"📝 Creating session with data: {session_data}")
+        logger.debug("📝 Creating session with data: %s", session_data)
         
         new_session = ChatService.create_session(db, session_data)
         
@@ -202,8 +254,7 @@ def create_chat_session(current_user):
         
     except Exception as e:
         db.rollback()
-        print(f"❌ Error creating session: {str(e)}")
-        traceback.print_exc()
+        logger.exception("❌ Error creating session: %s", e)
         return error_response(str(e), 500)
     finally:
         db.close()
@@ -223,7 +274,7 @@ def assign_chat_to_admin(current_user, session_id):
     """
     db = get_db_session()
     try:
-        session = ChatService.get_session_by_id(db, session_id)
+        session = ChatService.get_session_by_id(db, session_id, include_archived=False)
         if not session:
             return not_found_response('Chat session')
         
@@ -264,7 +315,7 @@ def close_chat_session(current_user, session_id):
     """Close chat session"""
     db = get_db_session()
     try:
-        session = ChatService.get_session_by_id(db, session_id)
+        session = ChatService.get_session_by_id(db, session_id, include_archived=False)
         if not session:
             return not_found_response('Chat session')
         
@@ -286,9 +337,75 @@ def close_chat_session(current_user, session_id):
         db.close()
 
 
+@chats_api_bp.route('/chats/bulk/<any(close, assign, reassign):action>', methods=['POST'])
+@token_required
+@admin_required
+def bulk_update_sessions(current_user, action):
+    """
+    Close, assign or reassign every open session matching a filter in one UPDATE
+    
+    - close: closes the matching sessions
+    - assign: gives the matching unassigned sessions to admin_id
+    - reassign: moves the matching sessions from filter.admin_id to admin_id
+    
+    At most CHAT_BULK_LIMIT sessions per call; has_more tells the caller to repeat.
+    
+    Request Body:
+        {
+            "filter": {"session_ids": [1, 2], "status": "waiting", "admin_id": "...",
+                       "unassigned": true, "user_id": "...", "started_before": "2024-01-01T00:00:00"},
+            "admin_id": "fa6649fd-7acd-43f5-a469-d774b01d2cc0"  // target (assign/reassign)
+        }
+    """
+    try:
+        bulk_data = chat_bulk_schema.load(request.json or {})
+    except ValidationError as err:
+        return validation_error_response(err.messages)
+    
+    filters = bulk_data['filter']
+    target_admin_id = bulk_data.get('admin_id')
+    
+    if action != 'close' and not target_admin_id:
+        return validation_error_response({'admin_id': ['Target admin is required']})
+    if action == 'assign':
+        filters['unassigned'] = True
+    if action == 'reassign' and not filters.get('admin_id'):
+        return validation_error_response({'filter': {'admin_id': ['Current admin is required to reassign']}})
+    
+    db = get_db_session()
+    try:
+        if action == 'close':
+            result = ChatService.bulk_close_sessions(db, filters)
+        else:
+            target = AdminService.get_admin_by_id(db, target_admin_id)
+            if not target or not target.is_active:
+                return not_found_response('Admin')
+            if action == 'reassign' and filters['admin_id'] == target_admin_id:
+                return validation_error_response({'admin_id': ['Sessions already belong to this admin']})
+            result = ChatService.bulk_assign_sessions(db, filters, target_admin_id)
+        
+        return updated_response(
+            data={
+                'action': action,
+                'admin_id': target_admin_id,
+                'session_ids': result['session_ids'],
+                'count': result['count'],
+                'has_more': result['count'] >= BULK_SESSION_LIMIT
+            },
+            message=f"{result['count']} chat session(s) updated ({action})"
+        )
+        
+    except Exception as e:
+        db.rollback()
+        return error_response(str(e), 500)
+    finally:
+        db.close()
+
+
 @chats_api_bp.route('/chats/<int:session_id>/messages', methods=['GET'])
 @token_required
 @admin_required
+@conditional_get(ChatService.get_session_version)
 def get_chat_messages(current_user, session_id):
     """Get all messages from a chat session"""
     db = get_db_session()
@@ -297,18 +414,9 @@ def get_chat_messages(current_user, session_id):
         if not session:
             return not_found_response('Chat session')
         
-        messages = ChatService.get_session_messages(db, session_id)
+        messages = ChatService.get_session_messages(db, session_id, session=session)
         
-        messages_data = [{
-            'id': msg.id,
-            'session_id': session_id,
-            'user_id': msg.user_id,
-            'admin_id': msg.admin_id,
-            'admin_name': msg.admin.full_name if msg.admin else None,
-            'message': msg.message,
-            'timestamp': msg.timestamp.isoformat() if msg.timestamp else None,
-            'is_from_admin': msg.is_from_admin
-        } for msg in messages]
+        messages_data = [serialize_chat_message(msg, session_id) for msg in messages]
         
         return success_response(
             data=messages_data,
@@ -338,7 +446,7 @@ def send_message(current_user, session_id):
     """
     db = get_db_session()
     try:
-        session = ChatService.get_session_by_id(db, session_id)
+        session = ChatService.get_session_by_id(db, session_id, include_archived=False)
         if not session:
             return not_found_response('Chat session')
         
@@ -375,10 +483,17 @@ def send_message(current_user, session_id):
 @token_required
 @admin_required
 def get_chat_stats(current_user):
-    """Get chat statistics"""
-    db = get_db_session()
+    """
+    Get chat statistics
+    
+    Query Parameters:
+        - include (str): 'analytics' adds response-time/duration percentiles
+                         (scans the analytics window; leave off for polling)
+    """
+    db = get_read_session()
     try:
-        stats = ChatService.get_chat_statistics(db)
+        include_analytics = 'analytics' in request.args.get('include', '').split(',')
+        stats = ChatService.get_chat_statistics(db, include_analytics=include_analytics)
         stats_data = chat_stats_schema.dump(stats)
         
         return success_response(
@@ -7,7 +7,7 @@ from flask import Blueprint, request, jsonify
 from ..middleware.auth import token_required, admin_required
 from ..schemas import success_response, error_response
 from ....services.dashboard_service import DashboardService
-from ....database.connection import get_db_session
+from ....database.connection import get_read_session
 
 # Create blueprint
 dashboard_api_bp = Blueprint('dashboard_api', __name__)
@@ -26,7 +26,7 @@ def get_dashboard_stats(current_user):
         - Admin stats (total, available)
         - Recent activity
     """
-    db = get_db_session()
+    db = get_read_session()
     try:
         stats = DashboardService.get_overview_stats(db)
         
@@ -52,7 +52,7 @@ def get_user_growth(current_user):
         - period (str): day/week/month (default: month)
         - limit (int): Number of data points (default: 30)
     """
-    db = get_db_session()
+    db = get_read_session()
     try:
         period = request.args.get('period', 'month')
         limit = request.args.get('limit', 30, type=int)
@@ -81,7 +81,7 @@ def get_chat_trends(current_user):
         - period (str): day/week/month
         - limit (int): Number of data points
     """
-    db = get_db_session()
+    db = get_read_session()
     try:
         period = request.args.get('period', 'week')
         limit = request.args.get('limit', 7, type=int)
@@ -111,7 +111,7 @@ def get_admin_performance(current_user):
         - Average response time
         - Customer satisfaction (if available)
     """
-    db = get_db_session()
+    db = get_read_session()
     try:
         performance = DashboardService.get_admin_performance(db)
         
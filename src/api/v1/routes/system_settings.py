@@ -5,6 +5,7 @@ Handles FAQ categories and FAQ management endpoints
 
 from flask import Blueprint, request, jsonify
 from ..middleware.auth import token_required, admin_required
+from ..middleware.conditional import conditional_get
 from ..schemas import (
     CategoryResponseSchema,
     CategoryListResponseSchema,
@@ -24,7 +25,7 @@ from ..schemas import (
     validation_error_response
 )
 from ....services.system_setting_service import SystemSettingService
-from ....database.connection import get_db_session
+from ....database.connection import get_db_session, get_read_session
 from ....database.models import FAQCategory, FAQ
 from marshmallow import ValidationError
 import re  #  ADD THIS LINE
@@ -49,9 +50,10 @@ faq_update_schema = FAQUpdateSchema()
 # ============================================
 
 @settings_api_bp.route('/settings/categories', methods=['GET'])
+@conditional_get(lambda db, **_: SystemSettingService.get_faq_content_version(db), public=True)
 def list_categories():
     """Get all FAQ categories (public endpoint)"""
-    db = get_db_session()
+    db = get_read_session()
     try:
         categories = SystemSettingService.get_all_categories(db)
         
@@ -82,9 +84,10 @@ def list_categories():
 
 
 @settings_api_bp.route('/settings/categories/<int:category_id>', methods=['GET'])
+@conditional_get(lambda db, **_: SystemSettingService.get_faq_content_version(db), public=True)
 def get_category(category_id):
     """Get single category (public endpoint)"""
-    db = get_db_session()
+    db = get_read_session()
     try:
         category = SystemSettingService.get_category_by_id(db, category_id)
         
@@ -284,6 +287,7 @@ def delete_category(current_user, category_id):
 # ============================================
 
 @settings_api_bp.route('/settings/faqs', methods=['GET'])
+@conditional_get(lambda db, **_: SystemSettingService.get_faq_content_version(db), public=True)
 def list_faqs():
     """
     Get all FAQs (public endpoint)
@@ -293,7 +297,7 @@ def list_faqs():
         - search (str): Search in questions/answers
         - is_active (bool): Filter by active status
     """
-    db = get_db_session()
+    db = get_read_session()
     try:
         category_id = request.args.get('category_id', type=int)
         search = request.args.get('search', '').strip()
@@ -323,7 +327,7 @@ def list_faqs():
 @settings_api_bp.route('/settings/faqs/<int:faq_id>', methods=['GET'])
 def get_faq(faq_id):
     """Get single FAQ (public endpoint)"""
-    db = get_db_session()
+    db = get_read_session()
     try:
         faq = SystemSettingService.get_faq_by_id(db, faq_id)
         
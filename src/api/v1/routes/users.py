@@ -3,17 +3,19 @@ Users API Routes
 Handles all user-related API endpoints
 """
 
+import logging
 from flask import Blueprint, request, jsonify
 from ..middleware.auth import token_required, admin_required
 from ..schemas import (
     UserResponseSchema,
-    UserListResponseSchema,
     UserCreateSchema,
     UserUpdateSchema,
     UserStatsSchema,
+    serialize_user_list_item,
     success_response,
     error_response,
     paginated_response,
+    cursor_paginated_response,
     created_response,
     updated_response,
     deleted_response,
@@ -21,15 +23,17 @@ from ..schemas import (
     validation_error_response
 )
 from ....services.user_service import UserService
-from ....database.connection import get_db_session
+from ....database.connection import get_db_session, get_read_session
+from ....utils.pagination import InvalidCursorError
 from marshmallow import ValidationError
 
+logger = logging.getLogger(__name__)
+
 # Create blueprint
 users_api_bp = Blueprint('users_api', __name__)
 
 # Initialize schemas
 user_response_schema = UserResponseSchema()
-user_list_schema = UserListResponseSchema(many=True)
 user_create_schema = UserCreateSchema()
 user_update_schema = UserUpdateSchema()
 user_stats_schema = UserStatsSchema()
@@ -39,15 +43,43 @@ user_stats_schema = UserStatsSchema()
 @token_required
 @admin_required
 def list_users(current_user):
-    """Get paginated list of users"""
+    """Get paginated list of users
+    
+    Query Parameters:
+        - page (int): Page number (default: 1)
+        - per_page (int): Items per page (default: 10)
+        - cursor (str): Keyset pagination cursor; pass empty for the first page
+        - include_total (bool): Include the (cached) total in cursor mode
+    """
     from contextlib import closing
     
-    with closing(get_db_session()) as db:
+    with closing(get_read_session()) as db:
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() in ['true', '1', 'yes']
+        
+        try:
+            result = UserService.get_all_users(
+                db=db,
+                page=page,
+                per_page=per_page,
+                cursor=cursor,
+                include_total=include_total
+            )
+        except InvalidCursorError as e:
+            return error_response(str(e), 400)
         
-        result = UserService.get_all_users(db=db, page=page, per_page=per_page)
-        users_data = user_list_schema.dump(result['users'])
+        users_data = [serialize_user_list_item(user) for user in result['users']]
+        
+        if cursor is not None:
+            return cursor_paginated_response(
+                data=users_data,
+                per_page=result['per_page'],
+                next_cursor=result['next_cursor'],
+                total=result['total'],
+                message=f"Retrieved {len(users_data)} users"
+            )
         
         return paginated_response(
             data=users_data,
@@ -167,7 +199,8 @@ def delete_user(current_user, user_id):
         
     except Exception as e:
         db.rollback()
-        return error_response(str(e), 500)
+        logger.exception("❌ Error deleting user %s: %s", user_id, e)
+        return error_response("Failed to delete user", status_code=500)
     finally:
         db.close()
 
@@ -177,7 +210,7 @@ def delete_user(current_user, user_id):
 @admin_required
 def get_user_stats(current_user):
     """Get user statistics"""
-    db = get_db_session()
+    db = get_read_session()
     try:
         stats = UserService.get_user_statistics(db)
         stats_data = user_stats_schema.dump(stats)
@@ -11,6 +11,7 @@ from .response_schema import (
     success_response,
     error_response,
     paginated_response,
+    cursor_paginated_response,
     validation_error_response,
     not_found_response,
     unauthorized_response,
@@ -46,6 +47,8 @@ from .chat_schema import (
     ChatSessionUpdateSchema,
     MessageCreateSchema,
     ChatAssignSchema,
+    ChatBulkSchema,
+    TranscriptExportQuerySchema,
     ChatStatsSchema
 )
 
@@ -60,6 +63,14 @@ from .system_setting_schema import (
     FAQUpdateSchema
 )
 
+from .serializers import (
+    serialize_user_list_item,
+    serialize_admin_list_item,
+    serialize_chat_session_list_item,
+    serialize_chat_session_detail,
+    serialize_chat_message
+)
+
 __all__ = [
     # Response schemas
     'BaseResponseSchema',
@@ -69,6 +80,7 @@ __all__ = [
     'success_response',
     'error_response',
     'paginated_response',
+    'cursor_paginated_response',
     'validation_error_response',
     'not_found_response',
     'unauthorized_response',
@@ -101,6 +113,8 @@ __all__ = [
     'ChatSessionUpdateSchema',
     'MessageCreateSchema',
     'ChatAssignSchema',
+    'ChatBulkSchema',
+    'TranscriptExportQuerySchema',
     'ChatStatsSchema',
     
     # System settings schemas
@@ -112,4 +126,11 @@ __all__ = [
     'FAQListResponseSchema',
     'FAQCreateSchema',
     'FAQUpdateSchema',
+    
+    # Fast output serializers
+    'serialize_user_list_item',
+    'serialize_admin_list_item',
+    'serialize_chat_session_list_item',
+    'serialize_chat_session_detail',
+    'serialize_chat_message',
 ]
\ No newline at end of file
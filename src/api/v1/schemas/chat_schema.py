@@ -3,8 +3,8 @@ Chat Data Schemas
 Handles serialization and validation for Chat resources
 """
 
-from marshmallow import Schema, fields, validate, validates, ValidationError
-from datetime import datetime
+from marshmallow import Schema, fields, validate, validates, ValidationError, pre_load
+from datetime import datetime, timedelta
 
 
 class ChatMessageResponseSchema(Schema):
@@ -121,6 +121,73 @@ class ChatAssignSchema(Schema):
     )
 
 
+class ChatBulkFilterSchema(Schema):
+    """Which open sessions a bulk operation touches"""
+    
+    session_ids = fields.List(
+        fields.Integer(validate=validate.Range(min=1)),
+        validate=validate.Length(min=1, max=1000)
+    )
+    status = fields.String(
+        validate=validate.OneOf(['waiting', 'active'])
+    )
+    admin_id = fields.String(
+        validate=validate.Length(min=1, max=36)
+    )
+    unassigned = fields.Boolean()
+    user_id = fields.String(
+        validate=validate.Length(min=1, max=36)
+    )
+    started_before = fields.DateTime()
+
+
+class ChatBulkSchema(Schema):
+    """Validate bulk close/assign/reassign request"""
+    
+    filter = fields.Nested(ChatBulkFilterSchema, required=True)
+    admin_id = fields.String(  # target admin (assign/reassign)
+        validate=validate.Length(min=1, max=36)
+    )
+    
+    @validates('filter')
+    def validate_filter_not_empty(self, value):
+        """A bulk operation must never default to every open session"""
+        if not any(v not in (None, False, []) for v in value.values()):
+            raise ValidationError('At least one filter is required')
+
+
+class TranscriptExportQuerySchema(Schema):
+    """Validate transcript export query parameters"""
+    
+    format = fields.String(
+        load_default='ndjson',
+        validate=validate.OneOf(['ndjson', 'csv'])
+    )
+    date_from = fields.DateTime()
+    date_to = fields.DateTime()
+    status = fields.String(
+        validate=validate.OneOf(['waiting', 'active', 'closed'])
+    )
+    admin_id = fields.String(
+        validate=validate.Length(min=1, max=36)
+    )
+    user_id = fields.String(
+        validate=validate.Length(min=1, max=36)
+    )
+    
+    @pre_load
+    def expand_dates(self, data, **kwargs):
+        """Accept bare dates (YYYY-MM-DD); a bare date_to includes that whole day"""
+        data = dict(data)
+        for key, days in (('date_from', 0), ('date_to', 1)):
+            try:
+                day = datetime.strptime(data.get(key) or '', '%Y-%m-%d')
+            except ValueError:
+                continue  # full datetimes (or garbage) are left to the field
+            data[key] = (day + timedelta(days=days)).isoformat()
+        return data
+
+
 class ChatStatsSchema(Schema):
     """Chat statistics response"""
     
@@ -129,5 +196,9 @@ class ChatStatsSchema(Schema):
     waiting_sessions = fields.Integer()
     closed_sessions = fields.Integer()
     total_messages = fields.Integer()
-    average_response_time = fields.Float()
-    average_session_duration = fields.Float()
\ No newline at end of file
+    average_response_time = fields.Float(allow_none=True)
+    average_session_duration = fields.Float()
+    response_time_p50 = fields.Float(allow_none=True)
+    response_time_p90 = fields.Float(allow_none=True)
+    response_time_p99 = fields.Float(allow_none=True)
+    session_duration_p90 = fields.Float(allow_none=True)
\ No newline at end of file
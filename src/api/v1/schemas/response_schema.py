@@ -4,6 +4,7 @@ Provides consistent response format across all API endpoints
 """
 
 from typing import Any, Dict, List, Optional
+from flask import request, has_request_context
 from marshmallow import Schema, fields, post_dump
 
 
@@ -52,6 +53,24 @@ class BaseResponseSchema(Schema):
         return {key: value for key, value in data.items() if value is not None}
 
 
+def requested_fields() -> Optional[frozenset]:
+    """Sparse fieldset from the ?fields=a,b,c query parameter, or None for all fields"""
+    if not has_request_context():
+        return None
+    value = request.args.get('fields', '')
+    names = frozenset(name.strip() for name in value.split(',') if name.strip())
+    return names or None
+
+
+def select_fields(data: Any, names: frozenset) -> Any:
+    """Keep only the named top-level keys of a dict, or of every dict in a list"""
+    if isinstance(data, list):
+        return [select_fields(item, names) for item in data]
+    if isinstance(data, dict):
+        return {key: value for key, value in data.items() if key in names}
+    return data
+
+
 class ResponseBuilder:
     """
     Helper class to build standardized API responses
@@ -76,6 +95,11 @@ class ResponseBuilder:
         Returns:
             Tuple of (response_dict, status_code)
         """
+        # ?fields= sparse fieldset applies to every successful payload
+        names = requested_fields()
+        if names is not None:
+            data = select_fields(data, names)
+        
         response = {
             'success': True,
             'message': message,
@@ -160,6 +184,45 @@ class ResponseBuilder:
             status_code=status_code
         )
     
+    @staticmethod
+    def cursor_paginated_success(
+        data: List,
+        per_page: int,
+        next_cursor: Optional[str],
+        total: Optional[int] = None,
+        message: str = "Request successful",
+        status_code: int = 200
+    ) -> tuple:
+        """
+        Build a cursor (keyset) paginated success response
+        
+        Args:
+            data: List of items for current page
+            per_page: Items per page
+            next_cursor: Cursor for the next page (None on the last page)
+            total: Total number of items, if it was requested
+            message: Success message
+            status_code: HTTP status code
+            
+        Returns:
+            Tuple of (response_dict, status_code)
+        """
+        pagination = {
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'has_next': next_cursor is not None
+        }
+        
+        if total is not None:
+            pagination['total'] = total
+        
+        return ResponseBuilder.success(
+            data=data,
+            message=message,
+            pagination=pagination,
+            status_code=status_code
+        )
+    
     @staticmethod
     def validation_error(
         errors: List[Dict],
@@ -380,6 +443,11 @@ def paginated_response(*args, **kwargs):
     return ResponseBuilder.paginated_success(*args, **kwargs)
 
 
+def cursor_paginated_response(*args, **kwargs):
+    """Shorthand for ResponseBuilder.cursor_paginated_success()"""
+    return ResponseBuilder.cursor_paginated_success(*args, **kwargs)
+
+
 def validation_error_response(*args, **kwargs):
     """Shorthand for ResponseBuilder.validation_error()"""
     return ResponseBuilder.validation_error(*args, **kwargs)
@@ -0,0 +1,106 @@
+"""
+Fast Output Serializers
+Plain row -> dict mappers for the hot list/detail endpoints. Output matches
+the corresponding marshmallow response schemas field for field, without
+marshmallow's per-field dispatch; schemas remain for input validation
+"""
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _str(value):
+    return str(value) if value is not None else None
+
+
+def _status(value):
+    return value.value if hasattr(value, 'value') else value
+
+
+def serialize_user_list_item(user) -> dict:
+    """Same fields as UserListResponseSchema"""
+    return {
+        'id': _str(user.id),
+        'telegram_id': user.telegram_id,
+        'username': user.username,
+        'full_name': user.full_name,
+        'is_premium': user.is_premium,
+        'registration_date': _iso(user.registration_date),
+        'last_activity': _iso(user.last_activity)
+    }
+
+
+def serialize_admin_list_item(admin) -> dict:
+    """Same fields as AdminListResponseSchema"""
+    return {
+        'id': _str(admin.id),
+        'telegram_id': _str(admin.telegram_id),
+        'telegram_username': admin.telegram_username,
+        'full_name': admin.full_name,
+        'role': _str(admin.role),
+        'is_active': admin.is_active,
+        'is_available': admin.is_available,
+        'last_login': _iso(admin.last_login)
+    }
+
+
+def serialize_chat_session_list_item(session, summary: dict) -> dict:
+    """Chat list row with the message summary from ChatService.get_message_summaries"""
+    return {
+        'id': session.id,
+        'user_id': session.user_id,
+        'admin_id': session.admin_id,
+        'status': _status(session.status),
+        'start_time': _iso(session.start_time),
+        'end_time': _iso(session.end_time),
+        'message_count': summary.get('message_count', 0),
+        'last_message': summary.get('last_message'),
+        'last_message_time': _iso(summary.get('last_message_time')),
+        'user_name': session.user.full_name if session.user else None,
+        'admin_name': session.admin.full_name if session.admin else None
+    }
+
+
+def serialize_chat_session_detail(session, messages) -> dict:
+    """Session with its participants and messages"""
+    user = session.user
+    admin = session.admin
+    return {
+        'id': session.id,
+        'user_id': session.user_id,
+        'admin_id': session.admin_id,
+        'status': _status(session.status),
+        'start_time': _iso(session.start_time),
+        'end_time': _iso(session.end_time),
+        'user': {
+            'id': user.id,
+            'full_name': user.full_name,
+            'telegram_id': user.telegram_id
+        } if user else None,
+        'admin': {
+            'id': admin.id,
+            'full_name': admin.full_name,
+            'telegram_id': admin.telegram_id
+        } if admin else None,
+        'messages': [{
+            'id': msg.id,
+            'message': msg.message,
+            'is_from_admin': msg.is_from_admin,
+            'timestamp': _iso(msg.timestamp)
+        } for msg in messages]
+    }
+
+
+def serialize_chat_message(msg, session_id: int) -> dict:
+    """Message row as returned by the session messages endpoint"""
+    return {
+        'id': msg.id,
+        'session_id': session_id,
+        'user_id': msg.user_id,
+        'admin_id': msg.admin_id,
+        'admin_name': msg.admin.full_name if msg.admin else None,
+        'message': msg.message,
+        'timestamp': _iso(msg.timestamp),
+        'is_from_admin': msg.is_from_admin
+    }
@@ -0,0 +1,8 @@
+"""
+API WSGI Entry Point
+Production servers import the app from here: gunicorn src.api.wsgi:app
+"""
+
+from .app import create_app
+
+app = create_app()
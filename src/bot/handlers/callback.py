@@ -4,6 +4,9 @@ from ...database.connection import SessionLocal
 from ...database.models import ChatSession, Admin, AdminRole, SessionStatus
 from ...services import UserService
 from ...utils.bot_api_client import bot_api_client
+import logging
+
+logger = logging.getLogger(__name__)
 
 user_service = UserService()
 
@@ -24,7 +27,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 file = await context.bot.get_file(photo.file_id)
                 photo_url = file.file_path
         except Exception as e:
-            print(f"Error fetching user photo: {e}")
+            logger.warning("Error fetching user photo: %s", e)
         
         # Use UserService method to check if user or admin
         result = user_service.get_user_or_admin_by_telegram_id(db, str(telegram_user.id))
@@ -84,7 +87,8 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             
         elif query.data == "faq":
             # ✅ FAQ accessible to both users and admins
-            response = bot_api_client.get('/bot/faq/categories')
+            response = bot_api_client.get('/bot/faq/categories', {'fields': 'id,name,icon,faq_count'},
+                                          client_id=telegram_user.id)
             
             if not response.get('success'):
                 await query.edit_message_text(
@@ -132,7 +136,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             # ✅ Show FAQs for selected category - accessible to both users and admins
             category_id = int(query.data.replace("faq_cat_", ""))
             
-            response = bot_api_client.get(f'/bot/faq/category/{category_id}')
+            response = bot_api_client.get(f'/bot/faq/category/{category_id}', client_id=telegram_user.id)
             
             if not response.get('success'):
                 await query.edit_message_text(
@@ -188,7 +192,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             # ✅ Show specific FAQ answer - accessible to both users and admins
             faq_id = int(query.data.replace("faq_view_", ""))
             
-            response = bot_api_client.get(f'/bot/faq/{faq_id}')
+            response = bot_api_client.get(f'/bot/faq/{faq_id}', client_id=telegram_user.id)
             
             if not response.get('success'):
                 await query.edit_message_text(
@@ -260,9 +264,7 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text("Unknown action.")
             
     except Exception as e:
-        print(f"Error in callback handler: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in callback handler: %s", e)
         await query.edit_message_text("❌ Sorry, there was an error processing your request.")
     finally:
         db.close()
\ No newline at end of file
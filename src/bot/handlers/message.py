@@ -7,9 +7,15 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from ...database.connection import SessionLocal
 from ...database.models import ChatMessage, SessionStatus, ChatSession
-from ...services import UserService
+from ...services import UserService, activity_tracker
 from ...utils.bot_api_client import bot_api_client
+from ...utils.logging_config import get_sampled_logger
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+# Per-message progress lines are sampled; warnings and errors always pass
+message_log = get_sampled_logger(__name__ + '.messages')
 user_service = UserService()
 
 async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -28,7 +34,7 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 file = await context.bot.get_file(photo.file_id)
                 photo_url = file.file_path
         except Exception as e:
-            print(f"Error fetching user photo: {e}")
+            logger.warning("Error fetching user photo: %s", e)
         
         # Check if user is admin
         result = user_service.get_user_or_admin_by_telegram_id(db, str(telegram_user.id))
@@ -39,7 +45,8 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             context.user_data['searching_faq'] = False
             
             # Call API for FAQ search
-            response = bot_api_client.get('/bot/faq/search', {'q': message_text})
+            response = bot_api_client.get('/bot/faq/search', {'q': message_text, 'fields': 'id,question'},
+                                          client_id=telegram_user.id)
             
             if not response.get('success'):
                 await update.message.reply_text(
@@ -124,7 +131,8 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if context.user_data.get('searching_faq'):
             context.user_data['searching_faq'] = False
         
-            response = bot_api_client.get('/bot/faq/search', {'q': message_text})
+            response = bot_api_client.get('/bot/faq/search', {'q': message_text, 'fields': 'id,question'},
+                                          client_id=telegram_user.id)
             
             if not response.get('success'):
                 await update.message.reply_text(
@@ -169,8 +177,7 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     reply_markup=InlineKeyboardMarkup(keyboard)
                 )
             
-            user.last_activity = datetime.now()
-            db.commit()
+            activity_tracker.touch(user.id)
             return
         
         # 🆕 AUTO-CREATE SESSION: Check for active session or create new one
@@ -181,7 +188,6 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         # 🔧 FIX: Create session if it doesn't exist
         if not active_session:
-            print(f"📝 Creating new session for user {user.full_name}")
             active_session = ChatSession(
                 user_id=user.id,
                 status=SessionStatus.waiting
@@ -189,17 +195,17 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             db.add(active_session)
             db.flush()  # 🔧 FIX: Use flush() to get the ID without committing
             
-            print(f"✅ Auto-created session #{active_session.id} for user {user.full_name}")
+            message_log.info("✅ Auto-created session #%s for user %s", active_session.id, user.id)
             
             # 🆕 Broadcast new session to all admins
             broadcast_session_response = bot_api_client.post('/bot/chat/broadcast-new-session', {
                 'session_id': active_session.id,
                 'user_id': str(user.id),
                 'user_name': user.full_name
-            })
+            }, client_id=telegram_user.id)
             
             if broadcast_session_response.get('success'):
-                print(f"✅ New session broadcasted to all admins")
+                message_log.debug("✅ New session broadcasted to all admins")
             
             await update.message.reply_text(
                 "✅ Your chat session has been started!\n"
@@ -210,8 +216,6 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not active_session.id:
             db.flush()  # Force flush to get the ID
         
-        print(f"💬 Saving message to session #{active_session.id} from user {user.full_name}")
-        
         # 🆕 Save message WITH session_id
         chat_message = ChatMessage(
             session_id=active_session.id,
@@ -223,13 +227,13 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         db.add(chat_message)
         
-        # Update last activity
-        user.last_activity = datetime.now()
+        # Update last activity (written behind in batches)
+        activity_tracker.touch(user.id)
         
         # 🔧 FIX: Commit everything together
         db.commit()
         
-        print(f"✅ Message saved successfully to session #{active_session.id}")
+        message_log.debug("💬 Message saved to session #%s", active_session.id)
         
         # 🆕 Notify admin via API (which will broadcast via WebSocket)
         if active_session.admin_id:
@@ -240,10 +244,10 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 'user_name': user.full_name,
                 'message': message_text,
                 'admin_id': str(active_session.admin_id)
-            })
+            }, client_id=telegram_user.id)
             
             if broadcast_response.get('success'):
-                print(f"✅ Message broadcasted to admin {active_session.admin_id}")
+                message_log.debug("✅ Message broadcasted to admin %s", active_session.admin_id)
             
             await update.message.reply_text(
                 "✅ Your message has been sent to our support agent."
@@ -255,19 +259,17 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 'user_id': str(user.id),
                 'user_name': user.full_name,
                 'message': message_text
-            })
+            }, client_id=telegram_user.id)
             
             if broadcast_response.get('success'):
-                print(f"✅ New waiting session broadcasted to all admins")
+                message_log.debug("✅ New waiting session broadcasted to all admins")
             
             await update.message.reply_text(
                 "📝 Message received! An agent will be with you soon."
             )
             
     except Exception as e:
-        print(f"❌ Error handling message: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error handling message: %s", e)
         
         # 🔧 FIX: Better error message with details
         error_message = f"Sorry, there was an error processing your message.\n\nError: {str(e)}"
@@ -2,6 +2,9 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from ..keyboards.inline import main_keyboard, admin_keyboard
 from ...utils.bot_api_client import bot_api_client
+import logging
+
+logger = logging.getLogger(__name__)
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
@@ -16,7 +19,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 file = await context.bot.get_file(photo.file_id)
                 photo_url = file.file_path
         except Exception as e:
-            print(f"Error fetching user photo: {e}")
+            logger.warning("Error fetching user photo: %s", e)
         
         # Call API to create or get user
         response = bot_api_client.post('/bot/user/create-or-get', {
@@ -26,7 +29,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
             'last_name': user.last_name,
             'full_name': user.full_name,
             'photo_url': photo_url
-        })
+        }, client_id=user.id)
         
         if not response.get('success'):
             await update.message.reply_text("⚠️ Service unavailable. Please try again later.")
@@ -55,7 +58,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             
     except Exception as e:
-        print(f"Error in start handler: {e}")
+        logger.exception("Error in start handler: %s", e)
         await update.message.reply_text(
             f"👋 Hello {user.first_name}! Welcome to our Telegram bot.\n"
             "Use the buttons below to navigate.",
@@ -2,6 +2,7 @@ from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, CallbackQueryHandler
 import os
 from dotenv import load_dotenv
+from ..utils.logging_config import configure_logging
 from .handlers.start import start
 from .handlers.message import message_handler
 from .handlers.callback import button_handler
@@ -11,13 +12,14 @@ load_dotenv()
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 
 def main():
+    logger = configure_logging('bot')
     application = Application.builder().token(BOT_TOKEN).build()
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, message_handler))
     application.add_handler(CallbackQueryHandler(button_handler))
 
-    print("Bot is starting...")
+    logger.info("Bot is starting...")
     application.run_polling()
 
 if __name__ == "__main__":
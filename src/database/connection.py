@@ -1,6 +1,12 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import StaticPool
 import os
+import time
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,22 +16,136 @@ DB_PASS = os.getenv("DB_PASS")
 DB_HOST = os.getenv("DB_HOST")
 DB_NAME = os.getenv("DB_NAME")
 
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}"
+# DATABASE_URL overrides the DB_* variables, e.g. sqlite:///local.db or sqlite:// (in-memory)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}"
+
+# Optional read replicas (comma-separated SQLAlchemy URLs)
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+
+# Seconds after a write during which reads stay on the primary (read-your-writes)
+REPLICA_LAG_TOLERANCE = float(os.getenv("REPLICA_LAG_TOLERANCE", 2))
 
 # Only echo SQL in development
 DEBUG = os.getenv('API_DEBUG', 'False').lower() == 'true'
 
-engine = create_engine(
-    DATABASE_URL, 
-    echo=DEBUG,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600    # Recycle connections after 1 hour
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def is_sqlite_url(url: str) -> bool:
+    """True if the URL points at a SQLite database"""
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def build_engine(url: str):
+    """Create an engine with settings suited to the database backend"""
+    if not is_sqlite_url(url):
+        return create_engine(
+            url,
+            echo=DEBUG,
+            pool_pre_ping=True,  # Verify connections before using
+            pool_recycle=3600    # Recycle connections after 1 hour
+        )
+
+    options = {
+        'echo': DEBUG,
+        # Flask threads and the activity flusher share connections
+        'connect_args': {'check_same_thread': False}
+    }
+    if make_url(url).database in (None, '', ':memory:'):
+        # In-memory database only exists on a single connection
+        options['poolclass'] = StaticPool
+
+    sqlite_engine = create_engine(url, **options)
+
+    @event.listens_for(sqlite_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return sqlite_engine
+
+
+engine = build_engine(DATABASE_URL)
+
+replica_engines = [build_engine(url) for url in DATABASE_REPLICA_URLS]
+
+# Monotonic time of the last INSERT/UPDATE/DELETE issued on the primary
+_last_write_at = 0.0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _track_primary_writes(conn, cursor, statement, parameters, context, executemany):
+    """Remember when this process last wrote to the primary"""
+    global _last_write_at
+    if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        _last_write_at = time.monotonic()
+
+
+# Session handed out to every caller in a shared_session() block (None otherwise)
+_shared_session = ContextVar('shared_db_session', default=None)
+
+
+def replica_is_fresh_enough() -> bool:
+    """True if no write happened on the primary within the lag tolerance window"""
+    return time.monotonic() - _last_write_at > REPLICA_LAG_TOLERANCE
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica when opened as read-only
+    Writes, flushes and reads shortly after a write always use the primary
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not self.info.get('read_only') or not replica_engines or self._flushing:
+            return engine
+
+        if clause is not None and getattr(clause, 'is_dml', False):
+            return engine
+
+        if not replica_is_fresh_enough():
+            return engine
+
+        # Stick to one replica for the lifetime of the session
+        replica = self.info.get('replica')
+        if replica is None:
+            replica = random.choice(replica_engines)
+            self.info['replica'] = replica
+        return replica
+
+    def close(self):
+        # A shared session outlives the routes that "close" it; shared_session() closes it
+        if self.info.get('shared') and _shared_session.get() is self:
+            return
+        super().close()
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
+def dispose_engines():
+    """
+    Forget pooled connections inherited from a parent process
+    Call in each worker after fork (gunicorn preload_app) so workers never
+    share a database socket; the parent's connections are left open for it
+    """
+    for bound in [engine, *replica_engines]:
+        bound.dispose(close=False)
+
+
+def database_is_ready() -> bool:
+    """True if the primary database answers a trivial query"""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -38,4 +158,32 @@ def get_db_session():
     Get database session for API routes
     Returns: Session object that must be manually closed
     """
-    return SessionLocal()
\ No newline at end of file
+    shared = _shared_session.get()
+    return shared if shared is not None else SessionLocal()
+
+def get_read_session():
+    """
+    Get read-only database session (stats, lists, FAQ reads)
+    Routed to a replica when DATABASE_REPLICA_URLS is set, otherwise the primary
+    Returns: Session object that must be manually closed
+    """
+    shared = _shared_session.get()
+    return shared if shared is not None else SessionLocal(info={'read_only': True})
+
+
+@contextmanager
+def shared_session(read_only: bool = False):
+    """
+    Hand one session to every get_db_session()/get_read_session() call made
+    in this block (the sub-requests of one /batch call), closing it at the end
+
+    Args:
+        read_only: route it like get_read_session() (only reads inside)
+    """
+    db = SessionLocal(info={'read_only': read_only, 'shared': True})
+    token = _shared_session.set(db)
+    try:
+        yield db
+    finally:
+        _shared_session.reset(token)
+        db.close()
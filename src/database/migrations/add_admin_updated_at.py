@@ -0,0 +1,29 @@
+# src/database/migrations/add_admin_updated_at.py
+from sqlalchemy import text
+from ..connection import engine
+
+def run_migration():
+    """Add updated_at column to admins table (used for admin list ETags)"""
+    with engine.connect() as conn:
+        try:
+            if engine.dialect.name == 'sqlite':
+                # SQLite can't add a column with a non-constant default
+                conn.execute(text("ALTER TABLE admins ADD COLUMN updated_at DATETIME NULL"))
+                conn.execute(text("UPDATE admins SET updated_at = CURRENT_TIMESTAMP"))
+            else:
+                conn.execute(text("""
+                    ALTER TABLE admins
+                    ADD COLUMN updated_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                    AFTER created_at
+                """))
+            conn.commit()
+            print("✅ Successfully added updated_at column to admins table")
+        except Exception as e:
+            if "Duplicate column name" in str(e) or "duplicate column" in str(e):
+                print("ℹ️  Column updated_at already exists")
+            else:
+                print(f"❌ Error: {e}")
+                raise
+
+if __name__ == '__main__':
+    run_migration()
@@ -0,0 +1,60 @@
+# src/database/migrations/add_cascade_deletes.py
+"""
+Recreate chat foreign keys with ON DELETE rules (MySQL)
+sessions/chat_messages -> users and chat_messages -> sessions cascade,
+references to admins are set to NULL
+"""
+
+from sqlalchemy import text
+from ..connection import engine
+from ..models import ChatSession, ChatMessage
+
+TABLES = (ChatSession.__table__, ChatMessage.__table__)
+
+
+def _existing_foreign_keys(conn, table: str) -> dict:
+    """{column: (constraint name, delete rule)}"""
+    rows = conn.execute(text(
+        "SELECT k.COLUMN_NAME, k.CONSTRAINT_NAME, r.DELETE_RULE "
+        "FROM information_schema.KEY_COLUMN_USAGE k "
+        "JOIN information_schema.REFERENTIAL_CONSTRAINTS r "
+        "  ON r.CONSTRAINT_SCHEMA = k.TABLE_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME "
+        "WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = :t AND k.REFERENCED_TABLE_NAME IS NOT NULL"
+    ), {'t': table}).all()
+    return {column: (name, rule) for column, name, rule in rows}
+
+
+def run_migration():
+    """Replace foreign keys whose ON DELETE rule differs from the models"""
+    if engine.dialect.name != 'mysql':
+        print("ℹ️ SQLite can't alter foreign keys; recreate the database (seed_benchmark --reset) to pick up the rules")
+        return
+
+    try:
+        with engine.begin() as conn:
+            for table in TABLES:
+                existing = _existing_foreign_keys(conn, table.name)
+                for fk in table.foreign_keys:
+                    column = fk.parent.name
+                    wanted = fk.ondelete.upper()
+                    name, rule = existing.get(column, (None, None))
+                    if rule == wanted:
+                        print(f"✅ {table.name}.{column} already ON DELETE {wanted}")
+                        continue
+
+                    if name:
+                        conn.execute(text(f"ALTER TABLE `{table.name}` DROP FOREIGN KEY `{name}`"))
+                    name = name or f"fk_{table.name}_{column}"
+                    target = fk.column
+                    conn.execute(text(
+                        f"ALTER TABLE `{table.name}` ADD CONSTRAINT `{name}` FOREIGN KEY (`{column}`) "
+                        f"REFERENCES `{target.table.name}` (`{target.name}`) ON DELETE {wanted}"
+                    ))
+                    print(f"✅ {table.name}.{column} -> {target.table.name}.{target.name} ON DELETE {wanted}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    run_migration()
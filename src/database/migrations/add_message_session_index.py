@@ -0,0 +1,17 @@
+# src/database/migrations/add_message_session_index.py
+from ..connection import engine
+from ..models import ChatMessage
+
+def run_migration():
+    """Add index on chat_messages.session_id (used by the chat list message summaries)"""
+    try:
+        for index in ChatMessage.__table__.indexes:
+            if index.name == 'ix_chat_messages_session_id':
+                index.create(bind=engine, checkfirst=True)
+        print("✅ Index ix_chat_messages_session_id is in place")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == '__main__':
+    run_migration()
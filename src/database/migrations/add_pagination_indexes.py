@@ -0,0 +1,24 @@
+# src/database/migrations/add_pagination_indexes.py
+from ..connection import engine
+from ..models import User, Admin, ChatSession
+
+INDEXES = {
+    User.__table__: 'ix_users_registration_date_id',
+    Admin.__table__: 'ix_admins_created_at_id',
+    ChatSession.__table__: 'ix_sessions_start_time_id',
+}
+
+def run_migration():
+    """Add composite (sort column, id) indexes used by cursor pagination"""
+    try:
+        for table, name in INDEXES.items():
+            for index in table.indexes:
+                if index.name == name:
+                    index.create(bind=engine, checkfirst=True)
+                    print(f"✅ Index {name} is in place")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == '__main__':
+    run_migration()
@@ -0,0 +1,69 @@
+"""
+Archive Closed Chat Sessions
+Moves closed sessions (and their messages) older than a configurable age
+from `sessions` / `chat_messages` into `sessions_archive` / `chat_messages_archive`
+
+Usage:
+    python -m src.database.migrations.archive_closed_sessions
+    python -m src.database.migrations.archive_closed_sessions --days 30 --batch-size 1000 --no-compress
+"""
+
+import argparse
+from ..connection import SessionLocal, engine
+from ..models import ArchivedChatSession, ArchivedChatMessage
+from ...services.archive_service import ArchiveService
+
+
+def create_archive_tables():
+    """Create archive tables if they don't exist yet"""
+    ArchivedChatSession.__table__.create(bind=engine, checkfirst=True)
+    ArchivedChatMessage.__table__.create(bind=engine, checkfirst=True)
+
+
+def main():
+    settings = ArchiveService.get_archive_settings()
+
+    parser = argparse.ArgumentParser(description="Archive closed chat sessions")
+    parser.add_argument('--days', type=int, default=settings['older_than_days'],
+                        help="Archive sessions closed more than this many days ago")
+    parser.add_argument('--batch-size', type=int, default=settings['batch_size'],
+                        help="Sessions moved per transaction")
+    parser.add_argument('--max-batches', type=int, default=None,
+                        help="Stop after this many batches (default: until done)")
+    parser.add_argument('--no-compress', action='store_true',
+                        help="Store message bodies uncompressed")
+    args = parser.parse_args()
+
+    compress = settings['compress'] and not args.no_compress
+
+    print(f"\n{'='*60}")
+    print(f"📦 Archiving closed chat sessions")
+    print(f"{'='*60}")
+    print(f"   Older than: {args.days} days")
+    print(f"   Batch size: {args.batch_size}")
+    print(f"   Compress:   {'Yes' if compress else 'No'}")
+    print(f"{'='*60}\n")
+
+    create_archive_tables()
+
+    db = SessionLocal()
+    try:
+        result = ArchiveService.archive_closed_sessions(
+            db,
+            older_than_days=args.days,
+            batch_size=args.batch_size,
+            compress=compress,
+            max_batches=args.max_batches
+        )
+        print(f"✅ Archived {result['archived_sessions']} sessions in {result['batches']} batch(es)")
+        print(f"   Cutoff: {result['cutoff'].strftime('%Y-%m-%d %H:%M:%S')}\n")
+    except Exception as e:
+        print(f"\n❌ Error archiving sessions: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Backfill Daily Rollups
+Creates daily_stats / daily_admin_stats if needed and rebuilds them from
+users, sessions and chat_messages. New activity keeps them current afterwards.
+
+Usage:
+    python -m src.database.migrations.backfill_daily_stats
+    python -m src.database.migrations.backfill_daily_stats --from 2025-01-01 --to 2025-01-31
+"""
+
+import argparse
+from datetime import datetime
+from ..connection import SessionLocal, engine
+from ..models import DailyStats, DailyAdminStats
+from ...services.rollup_service import RollupService
+
+
+def create_rollup_tables():
+    """Create rollup tables if they don't exist yet"""
+    DailyStats.__table__.create(bind=engine, checkfirst=True)
+    DailyAdminStats.__table__.create(bind=engine, checkfirst=True)
+
+
+def parse_day(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily rollup tables from raw data")
+    parser.add_argument('--from', dest='first_day', default=None, help="First day to rebuild (YYYY-MM-DD, reporting timezone)")
+    parser.add_argument('--to', dest='last_day', default=None, help="Last day to rebuild (YYYY-MM-DD, reporting timezone)")
+    args = parser.parse_args()
+
+    print(f"\n{'='*60}")
+    print(f"📊 Backfilling daily rollups")
+    print(f"{'='*60}")
+    print(f"   From: {args.first_day or 'beginning'}")
+    print(f"   To:   {args.last_day or 'today'}")
+    print(f"{'='*60}\n")
+
+    create_rollup_tables()
+
+    db = SessionLocal()
+    try:
+        result = RollupService.backfill(db, parse_day(args.first_day), parse_day(args.last_day))
+        print(f"✅ Wrote {result['daily_stats']} daily_stats and {result['daily_admin_stats']} daily_admin_stats rows\n")
+    except Exception as e:
+        db.rollback()
+        print(f"\n❌ Error backfilling rollups: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# src/database/migrations/convert_uuid_to_binary.py
+"""
+Convert CHAR(36) UUID keys to BINARY(16) (MySQL)
+SQLite databases are rebuilt by the seeder instead
+"""
+
+import argparse
+from sqlalchemy import text
+from ..connection import engine
+from ..models import Base
+
+# (table, column) pairs holding UUIDs; parents first
+COLUMNS = [
+    ('users', 'id'),
+    ('admins', 'id'),
+    ('sessions', 'user_id'),
+    ('sessions', 'admin_id'),
+    ('chat_messages', 'user_id'),
+    ('chat_messages', 'admin_id'),
+    ('sessions_archive', 'user_id'),
+    ('sessions_archive', 'admin_id'),
+    ('chat_messages_archive', 'user_id'),
+    ('chat_messages_archive', 'admin_id'),
+    ('daily_admin_stats', 'admin_id'),
+]
+
+
+def _column_info(conn, table, column):
+    return conn.execute(text(
+        "SELECT DATA_TYPE, IS_NULLABLE FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t AND COLUMN_NAME = :c"
+    ), {'t': table, 'c': column}).first()
+
+
+def _primary_key(conn, table):
+    rows = conn.execute(text(
+        "SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t AND CONSTRAINT_NAME = 'PRIMARY' "
+        "ORDER BY ORDINAL_POSITION"
+    ), {'t': table}).all()
+    return [row[0] for row in rows]
+
+
+def _foreign_keys(conn):
+    """FKs pointing at users.id / admins.id"""
+    return conn.execute(text(
+        "SELECT k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, "
+        "k.REFERENCED_COLUMN_NAME, r.DELETE_RULE, r.UPDATE_RULE "
+        "FROM information_schema.KEY_COLUMN_USAGE k "
+        "JOIN information_schema.REFERENTIAL_CONSTRAINTS r "
+        "  ON r.CONSTRAINT_SCHEMA = k.TABLE_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME "
+        "WHERE k.TABLE_SCHEMA = DATABASE() AND k.REFERENCED_TABLE_NAME IN ('users', 'admins') "
+        "AND k.REFERENCED_COLUMN_NAME = 'id'"
+    )).all()
+
+
+def _secondary_indexes(conn):
+    """Non-primary indexes covering any converted column"""
+    rows = conn.execute(text(
+        "SELECT DISTINCT TABLE_NAME, INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_NAME <> 'PRIMARY'"
+    )).all()
+    targets = set(COLUMNS)
+    return sorted({(table, index) for table, index, column in rows if (table, column) in targets})
+
+
+def run_migration(dry_run: bool = False):
+    """Rewrite every UUID column as BINARY(16), keeping keys, FKs and indexes"""
+    if engine.dialect.name != 'mysql':
+        print("ℹ️ Only MySQL databases need converting; recreate SQLite databases with seed_benchmark")
+        return
+
+    statements = []
+    with engine.connect() as conn:
+        pending = []
+        for table, column in COLUMNS:
+            info = _column_info(conn, table, column)
+            if info is None:
+                print(f"⚠️ {table}.{column} not found, skipping")
+            elif info[0].lower() == 'binary':
+                print(f"✅ {table}.{column} already BINARY(16)")
+            else:
+                pending.append((table, column, info[1] == 'YES'))
+
+        if not pending:
+            print("✅ Nothing to convert")
+            return
+
+        foreign_keys = _foreign_keys(conn)
+        indexes = _secondary_indexes(conn)
+
+        # Constraints and indexes have to go before their columns can change
+        for table, name, *_ in foreign_keys:
+            statements.append(f"ALTER TABLE `{table}` DROP FOREIGN KEY `{name}`")
+        for table, name in indexes:
+            statements.append(f"ALTER TABLE `{table}` DROP INDEX `{name}`")
+
+        for table, column, nullable in pending:
+            primary_key = _primary_key(conn, table)
+            null = "NULL" if nullable else "NOT NULL"
+            statements.append(f"ALTER TABLE `{table}` ADD COLUMN `{column}_bin` BINARY(16) NULL")
+            statements.append(f"UPDATE `{table}` SET `{column}_bin` = UNHEX(REPLACE(`{column}`, '-', ''))")
+            if column in primary_key:
+                statements.append(f"ALTER TABLE `{table}` DROP PRIMARY KEY")
+            statements.append(f"ALTER TABLE `{table}` DROP COLUMN `{column}`")
+            statements.append(f"ALTER TABLE `{table}` CHANGE `{column}_bin` `{column}` BINARY(16) {null}")
+            if column in primary_key:
+                keys = ", ".join(f"`{key}`" for key in primary_key)
+                statements.append(f"ALTER TABLE `{table}` ADD PRIMARY KEY ({keys})")
+
+        for table, name, column, ref_table, ref_column, on_delete, on_update in foreign_keys:
+            statements.append(
+                f"ALTER TABLE `{table}` ADD CONSTRAINT `{name}` FOREIGN KEY (`{column}`) "
+                f"REFERENCES `{ref_table}` (`{ref_column}`) ON DELETE {on_delete} ON UPDATE {on_update}"
+            )
+
+    if dry_run:
+        for statement in statements:
+            print(statement + ";")
+        return
+
+    try:
+        with engine.begin() as conn:
+            for statement in statements:
+                print(f"🔧 {statement}")
+                conn.execute(text(statement))
+
+        # Recreate the indexes dropped above from the model definitions
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        print(f"✅ Converted {len(pending)} UUID columns to BINARY(16)")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--dry-run', action='store_true', help='Print the ALTER statements without running them')
+    run_migration(parser.parse_args().dry_run)
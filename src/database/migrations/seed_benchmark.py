@@ -0,0 +1,329 @@
+"""
+Seed Benchmark Dataset
+Bulk-loads a deterministic, realistically skewed dataset of configurable
+size for local runs and load tests. Rows are generated as a stream and
+written in executemany batches, so millions of rows need little memory.
+Works on any backend, including SQLite:
+
+    DATABASE_URL=sqlite:///benchmark.db python -m src.database.migrations.seed_benchmark --users 5000
+    python -m src.database.migrations.seed_benchmark --users 1000000 --batch-size 10000 --reset
+
+The same --seed, --anchor and size options always produce the same rows.
+"""
+
+import argparse
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from ..connection import engine, Base, SessionLocal
+from ..models import User, Admin, AdminRole, ChatSession, ChatMessage, SessionStatus, FAQCategory, FAQ
+from ...services.rollup_service import RollupService
+from ...utils.timeseries import REPORT_TZ_OFFSET_HOURS
+
+FIRST_NAMES = [
+    "John", "Jane", "Michael", "Sarah", "David", "Emma", "James", "Olivia",
+    "Robert", "Sophia", "William", "Isabella", "Sokha", "Dara", "Vanna", "Sreymom"
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Chan", "Sok", "Kim", "Lim", "Heng", "Meas", "Pich", "Chea"
+]
+USER_MESSAGES = [
+    "Hello, I need some help", "How do I enroll?", "What are the tuition fees?",
+    "Is there a scholarship available?", "When does the semester start?",
+    "Can I change my class schedule?", "Thank you!", "I forgot my student ID"
+]
+ADMIN_MESSAGES = [
+    "Hi! How can I help you today?", "Let me check that for you.",
+    "You can find the details on our website.", "Is there anything else I can help with?",
+    "Please send us your student ID.", "You're welcome!"
+]
+
+# Relative traffic per local hour (busy office hours, quiet nights)
+HOURLY_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 8, 14, 18, 18, 15, 12, 15, 17, 16, 13, 10, 8, 7, 6, 4, 3, 2]
+
+# Tables in foreign-key order
+TABLE_ORDER = ['admins', 'users', 'sessions', 'chat_messages', 'faq_categories', 'faqs']
+
+
+def deterministic_uuid(rng: random.Random) -> str:
+    """UUID4-shaped id drawn from the seeded generator"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def skewed_count(rng: random.Random, mean: float, skew: float, cap: int) -> int:
+    """
+    Non-negative count with the given mean
+    skew > 1 is a Pareto shape (smaller = heavier tail); skew <= 1 gives a uniform spread
+    """
+    if mean <= 0:
+        return 0
+    if skew <= 1:
+        return rng.randint(0, int(mean * 2))
+    # E[paretovariate(a) - 1] = 1 / (a - 1)
+    value = (rng.paretovariate(skew) - 1) * (skew - 1) * mean
+    return min(cap, int(value + rng.random()))
+
+
+def random_timestamp(rng: random.Random, anchor: datetime, days: int) -> datetime:
+    """UTC timestamp within days before anchor, biased to recent days and office hours (local time)"""
+    age = 1 - math.sqrt(rng.random())
+    local_day = (anchor + timedelta(hours=REPORT_TZ_OFFSET_HOURS)).date() - timedelta(days=int(age * days))
+    hour = rng.choices(range(24), weights=HOURLY_WEIGHTS)[0]
+    local = datetime(local_day.year, local_day.month, local_day.day, hour, rng.randint(0, 59), rng.randint(0, 59))
+    return min(anchor, local - timedelta(hours=REPORT_TZ_OFFSET_HOURS))
+
+
+class BatchWriter:
+    """Buffers rows per table and writes them with executemany in FK order"""
+
+    def __init__(self, batch_size: int, progress_every: float = 2.0):
+        self.batch_size = batch_size
+        self.progress_every = progress_every
+        self.tables = {
+            'admins': Admin.__table__,
+            'users': User.__table__,
+            'sessions': ChatSession.__table__,
+            'chat_messages': ChatMessage.__table__,
+            'faq_categories': FAQCategory.__table__,
+            'faqs': FAQ.__table__,
+        }
+        self.buffers = {name: [] for name in TABLE_ORDER}
+        self.written = {name: 0 for name in TABLE_ORDER}
+        self.started = time.monotonic()
+        self.last_report = self.started
+
+    def add(self, name: str, row: dict):
+        """Queue a row; parents must be added before their children"""
+        buffer = self.buffers[name]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(name)
+
+    def flush(self, name: str = None):
+        """Write the named table's buffer (and its parent tables' first), or all buffers"""
+        names = TABLE_ORDER if name is None else TABLE_ORDER[:TABLE_ORDER.index(name) + 1]
+        with engine.begin() as conn:
+            for table_name in names:
+                rows = self.buffers[table_name]
+                if rows:
+                    conn.execute(self.tables[table_name].insert(), rows)
+                    self.written[table_name] += len(rows)
+                    self.buffers[table_name] = []
+        self.report()
+
+    def report(self, force: bool = False):
+        """Print progress at most every progress_every seconds"""
+        now = time.monotonic()
+        if not force and now - self.last_report < self.progress_every:
+            return
+        self.last_report = now
+        elapsed = max(now - self.started, 1e-6)
+        total = sum(self.written.values())
+        print(
+            f"   ⏳ {elapsed:7.1f}s  users={self.written['users']:,}  sessions={self.written['sessions']:,}  "
+            f"messages={self.written['chat_messages']:,}  ({total / elapsed:,.0f} rows/s)"
+        )
+
+
+def generate_user(rng: random.Random, i: int, anchor: datetime, days: int, admin_ids: list, admin_weights: list,
+                  sessions_per_user: float, messages_per_session: float, skew: float, ids: dict):
+    """One user with its sessions and messages: (user_row, session_rows, message_rows)"""
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    registration_date = random_timestamp(rng, anchor, days)
+    user_id = deterministic_uuid(rng)
+    last_activity = registration_date
+
+    sessions = []
+    messages = []
+    for _ in range(skewed_count(rng, sessions_per_user, skew, cap=int(sessions_per_user * 50) + 1)):
+        ids['session'] += 1
+        span = max(1, int((anchor - registration_date).total_seconds()))
+        start_time = registration_date + timedelta(seconds=int(span * rng.random() ** 0.5))
+
+        if anchor - start_time > timedelta(hours=2):
+            status = SessionStatus.closed
+        else:
+            status = rng.choice([SessionStatus.waiting, SessionStatus.active])
+        admin_id = None
+        if admin_ids and status != SessionStatus.waiting:
+            admin_id = rng.choices(admin_ids, weights=admin_weights)[0]
+
+        timestamp = start_time
+        message_count = 1 + skewed_count(rng, max(0.0, messages_per_session - 1), skew,
+                                         cap=int(messages_per_session * 20) + 1)
+        for n in range(message_count):
+            ids['message'] += 1
+            from_admin = admin_id is not None and n % 2 == 1
+            # Users type quickly; admin replies take longer
+            timestamp = timestamp + timedelta(seconds=int(rng.expovariate(1 / (180 if from_admin else 40))) + 5)
+            messages.append({
+                'id': ids['message'],
+                'session_id': ids['session'],
+                'user_id': user_id,
+                'admin_id': admin_id if from_admin else None,
+                'message': rng.choice(ADMIN_MESSAGES if from_admin else USER_MESSAGES),
+                'timestamp': timestamp,
+                'is_from_admin': from_admin
+            })
+
+        last_activity = max(last_activity, timestamp)
+        sessions.append({
+            'id': ids['session'],
+            'user_id': user_id,
+            'admin_id': admin_id,
+            'start_time': start_time,
+            'end_time': timestamp + timedelta(minutes=1) if status == SessionStatus.closed else None,
+            'status': status
+        })
+
+    user = {
+        'id': user_id,
+        'telegram_id': 2000000000 + i,
+        'username': f"{first_name.lower()}{last_name.lower()}{i}",
+        'first_name': first_name,
+        'last_name': last_name,
+        'language_code': rng.choices(['en', 'km'], weights=[3, 7])[0],
+        'is_bot': False,
+        'is_premium': rng.random() < 0.1,
+        'registration_date': registration_date,
+        'last_activity': last_activity
+    }
+    return user, sessions, messages
+
+
+def generate(writer: BatchWriter, rng: random.Random, anchor: datetime, users: int, admins: int,
+             sessions_per_user: float, messages_per_session: float, days: int, skew: float):
+    """Stream all rows into the writer"""
+    admin_ids = []
+    for i in range(admins):
+        admin_id = deterministic_uuid(rng)
+        admin_ids.append(admin_id)
+        writer.add('admins', {
+            'id': admin_id,
+            'telegram_id': str(1000000000 + i),
+            'telegram_username': f"admin{i}",
+            'full_name': f"Admin {i}",
+            'role': AdminRole.super_admin if i == 0 else AdminRole.admin,
+            'is_active': True,
+            'is_available': True,
+            'division': 'Support',
+            'created_at': anchor - timedelta(days=days)
+        })
+
+    # A few admins handle most chats
+    admin_weights = [1 / (rank + 1) for rank in range(len(admin_ids))]
+
+    ids = {'session': 0, 'message': 0}
+    for i in range(users):
+        user, sessions, messages = generate_user(
+            rng, i, anchor, days, admin_ids, admin_weights, sessions_per_user, messages_per_session, skew, ids
+        )
+        writer.add('users', user)
+        for row in sessions:
+            writer.add('sessions', row)
+        for row in messages:
+            writer.add('chat_messages', row)
+
+    for c in range(5):
+        writer.add('faq_categories', {
+            'id': c + 1,
+            'name': f"Category {c + 1}",
+            'slug': f"category-{c + 1}",
+            'description': f"Benchmark category {c + 1}",
+            'is_active': True,
+            'order_index': c
+        })
+        for f in range(10):
+            writer.add('faqs', {
+                'id': c * 10 + f + 1,
+                'question': f"Question {f + 1} about category {c + 1}?",
+                'answer': f"Answer {f + 1} for category {c + 1}.",
+                'category_id': c + 1,
+                'is_active': True,
+                'order_index': f
+            })
+
+    writer.flush()
+
+
+def seed_benchmark(users=1000, admins=5, sessions_per_user=2, messages_per_session=6, days=180,
+                   seed=42, anchor=None, batch_size=5000, skew=1.8, reset=False, rollup=True):
+    """Create tables and stream the deterministic dataset into them"""
+    anchor = anchor or datetime(2025, 1, 1)
+    rng = random.Random(seed)
+
+    if reset:
+        print("🗑️  Dropping all tables...")
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        existing = conn.execute(User.__table__.select().limit(1)).first()
+    if existing:
+        print("⚠️  Database already has users. Use --reset to rebuild the benchmark dataset.")
+        return None
+
+    print(f"🔄 Generating dataset (seed={seed}, anchor={anchor:%Y-%m-%d}, skew={skew})...")
+    writer = BatchWriter(batch_size)
+    generate(writer, rng, anchor, users, admins, sessions_per_user, messages_per_session, days, skew)
+    writer.report(force=True)
+
+    if rollup:
+        # Core inserts skip the ORM rollup events
+        db = SessionLocal()
+        try:
+            RollupService.backfill(db)
+            print("   📊 daily rollups rebuilt")
+        finally:
+            db.close()
+
+    return dict(writer.written)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a deterministic benchmark dataset")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--admins', type=int, default=5)
+    parser.add_argument('--sessions-per-user', type=float, default=2, help="Average sessions per user")
+    parser.add_argument('--messages-per-session', type=float, default=6, help="Average messages per session")
+    parser.add_argument('--days', type=int, default=180, help="History length before the anchor date")
+    parser.add_argument('--skew', type=float, default=1.8,
+                        help="Pareto shape for sessions per user and messages per session (<=1: uniform)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--anchor', default='2025-01-01', help="End of the generated history (YYYY-MM-DD)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per executemany batch")
+    parser.add_argument('--reset', action='store_true', help="Drop and recreate all tables first")
+    parser.add_argument('--skip-rollup', action='store_true', help="Don't rebuild daily rollups afterwards")
+    args = parser.parse_args()
+
+    print(f"\n{'='*60}")
+    print(f"🌱 IBS Info Chatbot - Benchmark Dataset")
+    print(f"{'='*60}")
+    print(f"📍 Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"{'='*60}\n")
+
+    started = time.monotonic()
+    counts = seed_benchmark(
+        users=args.users,
+        admins=args.admins,
+        sessions_per_user=args.sessions_per_user,
+        messages_per_session=args.messages_per_session,
+        days=args.days,
+        seed=args.seed,
+        anchor=datetime.strptime(args.anchor, '%Y-%m-%d'),
+        batch_size=args.batch_size,
+        skew=args.skew,
+        reset=args.reset,
+        rollup=not args.skip_rollup
+    )
+
+    if counts:
+        print(f"\n✅ Benchmark dataset ready in {time.monotonic() - started:.1f}s: {counts}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum, func, Text, event, text, BigInteger
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum, func, Text, event, text, BigInteger, LargeBinary, Index, Date, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.dialects.mysql import CHAR
 from .connection import Base
+from .types import UUIDBinary
 import enum
 import uuid
+import zlib
 from datetime import datetime
 
 class SessionStatus(enum.Enum):
@@ -18,9 +19,11 @@ class AdminRole(enum.Enum):
 
 class User(Base):
     __tablename__ = 'users'
+    # Keyset pagination order
+    __table_args__ = (Index('ix_users_registration_date_id', 'registration_date', 'id'),)
     
-    #  FIX: Change from Integer to CHAR(36) for UUID
-    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    #  UUID, stored as BINARY(16)
+    id = Column(UUIDBinary, primary_key=True, default=lambda: str(uuid.uuid4()))
     telegram_id = Column(BigInteger, unique=True, nullable=False)
     username = Column(String(100))
     first_name = Column(String(100))
@@ -41,15 +44,18 @@ class User(Base):
             return f"{self.first_name} {self.last_name}"
         return self.first_name or self.last_name or self.username or f"User {self.telegram_id}"
 
-    # Relationships with cascade delete
-    sessions = relationship("ChatSession", back_populates="user", cascade="all, delete-orphan")
-    messages = relationship("ChatMessage", back_populates="user", cascade="all, delete-orphan")
+    # Relationships with cascade delete; the database removes the rows (ON DELETE CASCADE)
+    # so deleting a user doesn't load its history first
+    sessions = relationship("ChatSession", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    messages = relationship("ChatMessage", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Admin(Base):
     __tablename__ = "admins"
+    # Keyset pagination order
+    __table_args__ = (Index('ix_admins_created_at_id', 'created_at', 'id'),)
 
-    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDBinary, primary_key=True, default=lambda: str(uuid.uuid4()))
     telegram_id = Column(String(50), unique=True, nullable=False, index=True)
     telegram_username = Column(String(255), nullable=True)
     telegram_first_name = Column(String(255), nullable=True)
@@ -59,22 +65,25 @@ class Admin(Base):
     role = Column(Enum(AdminRole), default=AdminRole.admin)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
     
     # Agent-related fields (for admin role)
     division = Column(String(100), nullable=True)
     is_available = Column(Boolean, default=True)
     
-    # Relationships
-    sessions = relationship("ChatSession", back_populates="admin")
+    # Relationships (admin_id is cleared by the database, ON DELETE SET NULL)
+    sessions = relationship("ChatSession", back_populates="admin", passive_deletes=True)
 
 
 class ChatSession(Base):
     __tablename__ = "sessions"
+    # Keyset pagination order
+    __table_args__ = (Index('ix_sessions_start_time_id', 'start_time', 'id'),)
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(CHAR(36), ForeignKey("users.id"))  #  UUID
-    admin_id = Column(CHAR(36), ForeignKey("admins.id"), nullable=True)  #  UUID
+    user_id = Column(UUIDBinary, ForeignKey("users.id", ondelete="CASCADE"))  #  UUID
+    admin_id = Column(UUIDBinary, ForeignKey("admins.id", ondelete="SET NULL"), nullable=True)  #  UUID
     start_time = Column(DateTime(timezone=True), server_default=func.now())
     end_time = Column(DateTime(timezone=True), nullable=True)
     status = Column(Enum(SessionStatus), default=SessionStatus.active)
@@ -87,9 +96,9 @@ class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("sessions.id"), nullable=False)  #  ADD THIS
-    user_id = Column(CHAR(36), ForeignKey("users.id"))  #  UUID
-    admin_id = Column(CHAR(36), ForeignKey("admins.id"), nullable=True)  #  UUID
+    session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUIDBinary, ForeignKey("users.id", ondelete="CASCADE"))  #  UUID
+    admin_id = Column(UUIDBinary, ForeignKey("admins.id", ondelete="SET NULL"), nullable=True)  #  UUID
     message = Column(Text, nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     is_from_admin = Column(Boolean, default=False)
@@ -99,6 +108,92 @@ class ChatMessage(Base):
     session = relationship("ChatSession")  #  ADD THIS
 
 
+class ArchivedChatSession(Base):
+    """Closed session moved out of the live `sessions` table"""
+    __tablename__ = "sessions_archive"
+
+    # Same id as the original live session
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(UUIDBinary, index=True)  #  UUID, no FK so archived rows don't pin users
+    admin_id = Column(UUIDBinary, nullable=True, index=True)  #  UUID
+    start_time = Column(DateTime(timezone=True))
+    end_time = Column(DateTime(timezone=True), nullable=True, index=True)
+    status = Column(Enum(SessionStatus), default=SessionStatus.closed)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship(
+        "User",
+        primaryjoin="foreign(ArchivedChatSession.user_id) == User.id",
+        viewonly=True
+    )
+    admin = relationship(
+        "Admin",
+        primaryjoin="foreign(ArchivedChatSession.admin_id) == Admin.id",
+        viewonly=True
+    )
+
+
+class ArchivedChatMessage(Base):
+    """Message of an archived session, body optionally zlib-compressed"""
+    __tablename__ = "chat_messages_archive"
+
+    # Same id as the original live message
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    session_id = Column(Integer, ForeignKey("sessions_archive.id"), nullable=False, index=True)
+    user_id = Column(UUIDBinary)  #  UUID
+    admin_id = Column(UUIDBinary, nullable=True)  #  UUID
+    body = Column(LargeBinary, nullable=False)
+    is_compressed = Column(Boolean, default=False)
+    timestamp = Column(DateTime(timezone=True))
+    is_from_admin = Column(Boolean, default=False)
+
+    admin = relationship(
+        "Admin",
+        primaryjoin="foreign(ArchivedChatMessage.admin_id) == Admin.id",
+        viewonly=True
+    )
+    session = relationship("ArchivedChatSession")
+
+    @staticmethod
+    def encode_body(message: str, compress: bool = True) -> bytes:
+        """Encode a message text for storage"""
+        data = (message or "").encode("utf-8")
+        return zlib.compress(data) if compress else data
+
+    @property
+    def message(self):
+        """Decoded message text, same attribute name as ChatMessage"""
+        data = zlib.decompress(self.body) if self.is_compressed else self.body
+        return data.decode("utf-8")
+
+
+class DailyStats(Base):
+    """Per-day counters (reporting timezone), maintained incrementally"""
+    __tablename__ = "daily_stats"
+
+    day = Column(Date, primary_key=True)
+    new_users = Column(Integer, nullable=False, default=0)
+    sessions_opened = Column(Integer, nullable=False, default=0)
+    sessions_closed = Column(Integer, nullable=False, default=0)
+    messages_in = Column(Integer, nullable=False, default=0)   # from users
+    messages_out = Column(Integer, nullable=False, default=0)  # from admins
+    # Seconds from the first unanswered user message to the admin reply
+    response_time_sum = Column(Float, nullable=False, default=0)
+    response_count = Column(Integer, nullable=False, default=0)
+
+
+class DailyAdminStats(Base):
+    """Per-day, per-admin counters (reporting timezone)"""
+    __tablename__ = "daily_admin_stats"
+
+    day = Column(Date, primary_key=True)
+    admin_id = Column(UUIDBinary, primary_key=True)  #  UUID, no FK so rollups survive admin deletion
+    sessions_handled = Column(Integer, nullable=False, default=0)  # closed while assigned
+    messages_out = Column(Integer, nullable=False, default=0)
+    response_time_sum = Column(Float, nullable=False, default=0)
+    response_count = Column(Integer, nullable=False, default=0)
+
+
 class SystemSettings(Base):
     __tablename__ = "system_settings"
 
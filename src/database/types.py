@@ -0,0 +1,35 @@
+"""
+Custom column types
+"""
+
+import uuid
+from sqlalchemy.types import TypeDecorator, BINARY
+
+
+class UUIDBinary(TypeDecorator):
+    """
+    UUID stored as BINARY(16), exposed to Python as the usual 36-char string
+    16 bytes instead of 36 per key in every primary key, foreign key and index
+    """
+
+    impl = BINARY(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        if isinstance(value, (bytes, bytearray)) and len(value) == 16:
+            return bytes(value)
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            # Not a UUID: bind something that can never equal a stored key
+            # (lookups find nothing, inserts are rejected as too long)
+            return str(value).encode('utf-8')
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=bytes(value)))
@@ -7,5 +7,12 @@ from .dashboard_service import DashboardService
 from .faq_service import FAQService
 from .system_setting_service import SystemSettingService
 from .auth_service import AuthService
+from .activity_tracker import ActivityTracker, activity_tracker
+from .archive_service import ArchiveService
+from .stats_service import StatsService
+from .rollup_service import RollupService
+from .analytics_service import AnalyticsService
+from .principal_service import PrincipalService
+from .export_service import ExportService
 
-__all__ = ['UserService', 'ChatService', 'AdminService', 'DashboardService', 'FAQService', 'SystemSettingService', 'AuthService']
\ No newline at end of file
+__all__ = ['UserService', 'ChatService', 'AdminService', 'DashboardService', 'FAQService', 'SystemSettingService', 'AuthService', 'ActivityTracker', 'activity_tracker', 'ArchiveService', 'StatsService', 'RollupService', 'AnalyticsService', 'PrincipalService', 'ExportService']
\ No newline at end of file
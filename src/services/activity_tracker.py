@@ -0,0 +1,132 @@
+"""
+Write-behind tracker for users.last_activity
+Coalesces activity timestamps in memory and flushes them in batched UPDATEs
+"""
+
+import os
+import atexit
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import bindparam
+from ..database.connection import engine
+from ..database.models import User
+
+logger = logging.getLogger(__name__)
+
+class ActivityTracker:
+    """Buffer last-activity timestamps and write them at most once per interval"""
+
+    def __init__(self, flush_interval: float = None, max_pending: int = None):
+        # Staleness window: a touched user is written within this many seconds
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv('ACTIVITY_FLUSH_INTERVAL', 30)
+        )
+        # Flush early (in the background) if this many distinct users are waiting
+        self.max_pending = max_pending if max_pending is not None else int(
+            os.getenv('ACTIVITY_MAX_PENDING', 1000)
+        )
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        # Wakes the flusher before its interval is up
+        self._flush_requested = threading.Event()
+        self._thread = None
+
+    def touch(self, user_id: str, timestamp: datetime = None):
+        """Record activity for a user; only the latest timestamp is kept"""
+        if not user_id:
+            return
+
+        timestamp = timestamp or datetime.now()
+        with self._lock:
+            current = self._pending.get(str(user_id))
+            if current is None or timestamp > current:
+                self._pending[str(user_id)] = timestamp
+            pending_count = len(self._pending)
+
+        self._ensure_started()
+
+        # Never write inline: callers include the bot's event loop
+        if pending_count >= self.max_pending:
+            self._flush_requested.set()
+
+    def flush(self) -> int:
+        """Write all buffered timestamps in one executemany UPDATE"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+
+            users = User.__table__
+            statement = users.update().where(
+                users.c.id == bindparam('b_user_id')
+            ).values(last_activity=bindparam('b_last_activity'))
+
+            params = [
+                {'b_user_id': user_id, 'b_last_activity': timestamp}
+                for user_id, timestamp in batch.items()
+            ]
+
+            try:
+                # Core UPDATE: no identity map, no ORM before_update listeners
+                with engine.begin() as conn:
+                    conn.execute(statement, params)
+            except Exception as e:
+                logger.error("❌ Error flushing last_activity batch of %d users: %s", len(params), e)
+                # Put the batch back without overwriting newer timestamps
+                with self._lock:
+                    for user_id, timestamp in batch.items():
+                        current = self._pending.get(user_id)
+                        if current is None or timestamp > current:
+                            self._pending[user_id] = timestamp
+                return 0
+
+            return len(params)
+
+    def pending_count(self) -> int:
+        """Number of users waiting to be flushed"""
+        with self._lock:
+            return len(self._pending)
+
+    def _ensure_started(self):
+        """Start the background flusher on first use"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="ActivityTrackerFlusher",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        """Background loop flushing every flush_interval seconds, or sooner when requested"""
+        while not self._stop_event.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            if self._stop_event.is_set():
+                break
+            self.flush()
+
+    def stop(self):
+        """Stop the background flusher and write anything still buffered"""
+        self._stop_event.set()
+        self._flush_requested.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+# Global instance
+activity_tracker = ActivityTracker()
+
+# Don't lose buffered timestamps on clean shutdown
+atexit.register(activity_tracker.stop)
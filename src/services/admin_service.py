@@ -1,14 +1,22 @@
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
 from ..database.models import Admin, AdminRole
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from ..utils.pagination import keyset_paginate, cached_count
+from .stats_service import StatsService
+from .principal_service import PrincipalService
 
 class AdminService:
     """Service for admin-related business logic"""
     
     @staticmethod
-    def get_all_admins(db: Session, page: int = 1, per_page: int = 10, search: str = None, role: str = None, is_active: bool = None, is_available: bool = None):
-        """Get paginated admins with filters"""
+    def get_all_admins(db: Session, page: int = 1, per_page: int = 10, search: str = None, role: str = None, is_active: bool = None, is_available: bool = None,
+                       cursor: str = None, include_total: bool = False):
+        """
+        Get paginated admins with filters
+        Passing cursor ("" for the first page) switches to keyset pagination on (created_at, id)
+        """
         query = db.query(Admin)
         
         # Apply filters
@@ -28,6 +36,16 @@ class AdminService:
         if is_available is not None:
             query = query.filter(Admin.is_available == is_available)
         
+        if cursor is not None:
+            result = keyset_paginate(query, Admin.created_at, Admin.id, cursor, per_page)
+            return {
+                'admins': result['items'],
+                'total': cached_count(query, ('admins', search, role, is_active, is_available)) if include_total else None,
+                'per_page': per_page,
+                'next_cursor': result['next_cursor'],
+                'has_next': result['has_next']
+            }
+        
         # Get total count
         total = query.count()
         
@@ -98,6 +116,7 @@ class AdminService:
             
             db.commit()
             db.refresh(admin)
+            PrincipalService.invalidate(admin_id)
         return admin
     
     @staticmethod
@@ -107,6 +126,7 @@ class AdminService:
         if admin:
             db.delete(admin)
             db.commit()
+            PrincipalService.invalidate(admin_id)
         return True
     
     @staticmethod
@@ -139,6 +159,7 @@ class AdminService:
         admin.is_active = not admin.is_active
         db.commit()
         db.refresh(admin)
+        PrincipalService.invalidate(admin_id)
         
         status = "activated" if admin.is_active else "deactivated"
         
@@ -148,21 +169,28 @@ class AdminService:
             'is_active': admin.is_active
         }
     
+    @staticmethod
+    def get_admins_version(db: Session) -> tuple:
+        """Cheap version of the admins table for ETags (status flags are summed to catch same-second toggles)"""
+        return db.query(
+            func.count(Admin.id),
+            func.max(Admin.updated_at),
+            func.max(Admin.last_login),
+            func.sum(case((Admin.is_active == True, 1), else_=0)),
+            func.sum(case((Admin.is_available == True, 1), else_=0))
+        ).one().tuple()
+    
     @staticmethod
     def get_admin_statistics(db: Session):
-        """Get admin statistics"""
-        total_admins = db.query(Admin).count()
-        active_admins = db.query(Admin).filter(Admin.is_active == True).count()
-        available_admins = db.query(Admin).filter(Admin.is_available == True).count()
-        super_admins = db.query(Admin).filter(Admin.role == AdminRole.super_admin).count()
-        regular_admins = db.query(Admin).filter(Admin.role == AdminRole.admin).count()  # ✅ Added
+        """Get admin statistics (one aggregate query, briefly cached)"""
+        counts = StatsService.get_admin_counts(db)
         
         return {
-            'total_admins': total_admins,
-            'active_admins': active_admins,
-            'available_admins': available_admins,
-            'super_admins': super_admins,
-            'regular_admins': regular_admins,  # ✅ Added
+            'total_admins': counts['total'],
+            'active_admins': counts['active'],
+            'available_admins': counts['available'],
+            'super_admins': counts['super_admins'],
+            'regular_admins': counts['regular_admins'],  # ✅ Added
             'online_now': 0  # TODO: Implement real-time tracking
         }
     
@@ -226,5 +254,6 @@ class AdminService:
         db.add(user)
         db.commit()
         db.refresh(user)
+        PrincipalService.invalidate(admin_id)
         
         return user
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Response-time and session-duration analytics
+Computed from chat_messages ordering and session start/end times over a
+recent window, then cached so dashboards can show them on every load
+"""
+
+import os
+import math
+from datetime import datetime, timedelta
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+from ..database.models import Admin, ChatSession, ChatMessage, SessionStatus
+from ..utils.cache import TTLCache
+from ..utils import timeseries
+from .rollup_service import RollupService, iter_response_times, rollups_active
+
+ANALYTICS_WINDOW_DAYS = int(os.getenv('ANALYTICS_WINDOW_DAYS', 30))
+ANALYTICS_CACHE_TTL = float(os.getenv('ANALYTICS_CACHE_TTL', 300))
+
+analytics_cache = TTLCache(ttl=ANALYTICS_CACHE_TTL, maxsize=16)
+
+
+def percentile(sorted_values: list, pct: float):
+    """Nearest-rank percentile of an ascending list (None if empty)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(seconds: list) -> dict:
+    """count / average / p50 / p90 / p99 in minutes"""
+    values = sorted(seconds)
+
+    def minutes(value):
+        return round(value / 60, 2) if value is not None else None
+
+    return {
+        'count': len(values),
+        'average': minutes(sum(values) / len(values)) if values else None,
+        'p50': minutes(percentile(values, 50)),
+        'p90': minutes(percentile(values, 90)),
+        'p99': minutes(percentile(values, 99))
+    }
+
+
+def duration_seconds_expr(start, end, dialect_name: str):
+    """SQL expression for end - start in seconds"""
+    if dialect_name == 'sqlite':
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.timestampdiff(literal_column('SECOND'), start, end)
+
+
+class AnalyticsService:
+    """Response-time and session-duration metrics (minutes)"""
+
+    @staticmethod
+    def get_average_response_time(db: Session, days: int = None):
+        """Average response time from the daily_stats sums (no message scan); None without rollups"""
+        if not rollups_active(db.connection()):
+            return None
+        days = days or ANALYTICS_WINDOW_DAYS
+        today = timeseries.local_today()
+        total, count = RollupService.get_response_time_totals(db, today - timedelta(days=days - 1), today)
+        return round(total / count / 60, 2) if count else None
+
+    @staticmethod
+    def get_average_session_duration(db: Session, days: int = None):
+        """Average duration of sessions closed within the window: one AVG aggregate, cached"""
+        days = days or ANALYTICS_WINDOW_DAYS
+
+        def compute():
+            since = datetime.utcnow() - timedelta(days=days)
+            duration = duration_seconds_expr(ChatSession.start_time, ChatSession.end_time, db.get_bind().dialect.name)
+            seconds = db.query(func.avg(duration)).filter(
+                ChatSession.status == SessionStatus.closed,
+                ChatSession.start_time.isnot(None),
+                ChatSession.end_time >= since
+            ).scalar()
+            return round(max(0.0, float(seconds)) / 60, 2) if seconds is not None else None
+
+        return analytics_cache.get_or_set(('average_session_duration', days), compute)
+
+    @staticmethod
+    def get_response_time_stats(db: Session, days: int = None) -> dict:
+        """Overall and per-admin response times: first admin reply after each unanswered user message"""
+        days = days or ANALYTICS_WINDOW_DAYS
+        return analytics_cache.get_or_set(
+            ('response_time', days), lambda: AnalyticsService._compute_response_times(db, days)
+        )
+
+    @staticmethod
+    def get_session_duration_stats(db: Session, days: int = None) -> dict:
+        """Durations of sessions closed within the window"""
+        days = days or ANALYTICS_WINDOW_DAYS
+        return analytics_cache.get_or_set(
+            ('session_duration', days), lambda: AnalyticsService._compute_session_durations(db, days)
+        )
+
+    @staticmethod
+    def _compute_response_times(db: Session, days: int) -> dict:
+        since = datetime.utcnow() - timedelta(days=days)
+
+        # Compact rows streamed in session order; no ORM objects
+        rows = db.query(
+            ChatMessage.session_id, ChatMessage.admin_id, ChatMessage.is_from_admin, ChatMessage.timestamp
+        ).filter(
+            ChatMessage.timestamp >= since
+        ).order_by(ChatMessage.session_id, ChatMessage.timestamp, ChatMessage.id).yield_per(5000)
+
+        overall = []
+        per_admin = {}
+        for admin_id, replied_at, seconds in iter_response_times(rows):
+            overall.append(seconds)
+            if admin_id:
+                per_admin.setdefault(admin_id, []).append(seconds)
+
+        return {
+            'window_days': days,
+            'overall': summarize(overall),
+            'per_admin': {admin_id: summarize(values) for admin_id, values in per_admin.items()}
+        }
+
+    @staticmethod
+    def _compute_session_durations(db: Session, days: int) -> dict:
+        since = datetime.utcnow() - timedelta(days=days)
+        duration = duration_seconds_expr(ChatSession.start_time, ChatSession.end_time, db.get_bind().dialect.name)
+
+        rows = db.query(ChatSession.admin_id, duration).filter(
+            ChatSession.status == SessionStatus.closed,
+            ChatSession.start_time.isnot(None),
+            ChatSession.end_time >= since
+        ).yield_per(5000)
+
+        overall = []
+        per_admin = {}
+        for admin_id, seconds in rows:
+            if seconds is None:
+                continue
+            seconds = max(0.0, float(seconds))
+            overall.append(seconds)
+            if admin_id:
+                per_admin.setdefault(admin_id, []).append(seconds)
+
+        return {
+            'window_days': days,
+            'overall': summarize(overall),
+            'per_admin': {admin_id: summarize(values) for admin_id, values in per_admin.items()}
+        }
+
+    @staticmethod
+    def get_admin_performance(db: Session, days: int = None) -> dict:
+        """Per-admin handled sessions, response and duration percentiles"""
+        responses = AnalyticsService.get_response_time_stats(db, days)
+        durations = AnalyticsService.get_session_duration_stats(db, days)
+
+        admin_ids = set(responses['per_admin']) | set(durations['per_admin'])
+        names = dict(db.query(Admin.id, Admin.full_name).filter(Admin.id.in_(admin_ids)).all()) if admin_ids else {}
+
+        admins = []
+        for admin_id in admin_ids:
+            response = responses['per_admin'].get(admin_id, summarize([]))
+            duration = durations['per_admin'].get(admin_id, summarize([]))
+            admins.append({
+                'admin_id': admin_id,
+                'full_name': names.get(admin_id),
+                'sessions_handled': duration['count'],
+                'total_responses': response['count'],
+                'average_response_time': response['average'],
+                'response_time_p90': response['p90'],
+                'average_session_duration': duration['average']
+            })
+        admins.sort(key=lambda item: item['sessions_handled'], reverse=True)
+
+        return {
+            'window_days': responses['window_days'],
+            'total_responses': responses['overall']['count'],
+            'average_response_time': responses['overall']['average'],
+            'response_time_p50': responses['overall']['p50'],
+            'response_time_p90': responses['overall']['p90'],
+            'response_time_p99': responses['overall']['p99'],
+            'average_session_duration': durations['overall']['average'],
+            'session_duration_p90': durations['overall']['p90'],
+            'admins': admins
+        }
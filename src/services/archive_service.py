@@ -0,0 +1,139 @@
+from sqlalchemy.orm import Session
+from ..database.models import ChatSession, ChatMessage, ArchivedChatSession, ArchivedChatMessage, SessionStatus
+from ..utils.table_check import TableCheck
+from datetime import datetime, timedelta
+import os
+
+# The archive tables come from a separate migration; without them reads skip the archive
+_archive_tables = TableCheck(ArchivedChatSession.__tablename__, ArchivedChatMessage.__tablename__)
+
+
+def archive_available(db: Session) -> bool:
+    """True once the archive tables exist (cached, so live lookups don't pay for it)"""
+    return _archive_tables(db.connection())
+
+
+class ArchiveService:
+    """Service for moving closed chat sessions into the archive tables"""
+
+    @staticmethod
+    def get_archive_settings():
+        """Archive settings from environment"""
+        return {
+            'older_than_days': int(os.getenv('ARCHIVE_AFTER_DAYS', 90)),
+            'batch_size': int(os.getenv('ARCHIVE_BATCH_SIZE', 500)),
+            'compress': os.getenv('ARCHIVE_COMPRESS', 'True').lower() == 'true'
+        }
+
+    @staticmethod
+    def archive_batch(db: Session, cutoff: datetime, batch_size: int = 500, compress: bool = True) -> int:
+        """
+        Move one batch of closed sessions ended before cutoff into the archive
+        Returns: number of sessions archived (0 when nothing is left)
+        """
+        sessions = db.query(ChatSession).filter(
+            ChatSession.status == SessionStatus.closed,
+            ChatSession.end_time.isnot(None),
+            ChatSession.end_time < cutoff
+        ).order_by(ChatSession.id).limit(batch_size).all()
+
+        if not sessions:
+            return 0
+
+        session_ids = [s.id for s in sessions]
+
+        messages = db.query(ChatMessage).filter(
+            ChatMessage.session_id.in_(session_ids)
+        ).all()
+
+        db.bulk_insert_mappings(ArchivedChatSession, [{
+            'id': s.id,
+            'user_id': s.user_id,
+            'admin_id': s.admin_id,
+            'start_time': s.start_time,
+            'end_time': s.end_time,
+            'status': s.status
+        } for s in sessions])
+
+        if messages:
+            db.bulk_insert_mappings(ArchivedChatMessage, [{
+                'id': m.id,
+                'session_id': m.session_id,
+                'user_id': m.user_id,
+                'admin_id': m.admin_id,
+                'body': ArchivedChatMessage.encode_body(m.message, compress),
+                'is_compressed': compress,
+                'timestamp': m.timestamp,
+                'is_from_admin': m.is_from_admin
+            } for m in messages])
+
+        # Remove from the live tables, children first
+        db.query(ChatMessage).filter(
+            ChatMessage.session_id.in_(session_ids)
+        ).delete(synchronize_session=False)
+        db.query(ChatSession).filter(
+            ChatSession.id.in_(session_ids)
+        ).delete(synchronize_session=False)
+
+        db.commit()
+
+        # Drop the moved rows from the identity map
+        for obj in sessions + messages:
+            db.expunge(obj)
+
+        return len(session_ids)
+
+    @staticmethod
+    def archive_closed_sessions(db: Session, older_than_days: int = None, batch_size: int = None,
+                                compress: bool = None, max_batches: int = None) -> dict:
+        """Archive closed sessions older than the configured age, one batch per transaction"""
+        settings = ArchiveService.get_archive_settings()
+        older_than_days = older_than_days if older_than_days is not None else settings['older_than_days']
+        batch_size = batch_size or settings['batch_size']
+        compress = compress if compress is not None else settings['compress']
+
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+
+        total_sessions = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            try:
+                archived = ArchiveService.archive_batch(db, cutoff, batch_size, compress)
+            except Exception:
+                db.rollback()
+                raise
+
+            if not archived:
+                break
+
+            total_sessions += archived
+            batches += 1
+
+        return {
+            'archived_sessions': total_sessions,
+            'batches': batches,
+            'cutoff': cutoff
+        }
+
+    @staticmethod
+    def get_archived_session(db: Session, session_id: int):
+        """Get archived session by ID"""
+        return db.query(ArchivedChatSession).filter(ArchivedChatSession.id == session_id).first()
+
+    @staticmethod
+    def get_archived_messages(db: Session, session_id: int):
+        """Get all messages of an archived session"""
+        return db.query(ArchivedChatMessage).filter(
+            ArchivedChatMessage.session_id == session_id
+        ).order_by(ArchivedChatMessage.timestamp).all()
+
+    @staticmethod
+    def delete_user_archive(db: Session, user_id: str):
+        """Delete archived sessions and messages of a user (no commit)"""
+        archived_ids = db.query(ArchivedChatSession.id).filter(ArchivedChatSession.user_id == user_id)
+        db.query(ArchivedChatMessage).filter(
+            ArchivedChatMessage.session_id.in_(archived_ids.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.query(ArchivedChatSession).filter(
+            ArchivedChatSession.user_id == user_id
+        ).delete(synchronize_session=False)
@@ -6,7 +6,11 @@ import jwt
 import os
 import hashlib
 import hmac
+import logging
 from ..utils.jwt_helper import jwt_helper  # Add this import
+from .principal_service import PrincipalService
+
+logger = logging.getLogger(__name__)
 
 class AuthService:
     def __init__(self):
@@ -32,8 +36,7 @@ class AuthService:
         
         data_check_string = '\n'.join(data_check_arr)
         
-        print(f"Data check string: {data_check_string}")  # Debug
-        print(f"Received hash: {check_hash}")  # Debug
+        logger.debug("Telegram data check string: %r, received hash: %s", data_check_string, check_hash)
         
         # Create secret key from bot token
         secret_key = hashlib.sha256(self.bot_token.encode()).digest()
@@ -41,7 +44,7 @@ class AuthService:
         # Calculate hash
         calculated_hash = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
         
-        print(f"Calculated hash: {calculated_hash}")  # Debug
+        logger.debug("Telegram calculated hash: %s", calculated_hash)
         
         if calculated_hash != check_hash:
             return {"success": False, "message": "Data verification failed"}
@@ -165,6 +168,7 @@ class AuthService:
         
         admin.is_active = False
         db.commit()
+        PrincipalService.invalidate(admin_id)
         
         return {"success": True, "message": "Admin account deactivated"}
     
@@ -186,6 +190,7 @@ class AuthService:
         
         db.commit()
         db.refresh(admin)
+        PrincipalService.invalidate(admin_id)
         
         return {
             "success": True,
@@ -1,14 +1,33 @@
-from sqlalchemy.orm import Session
+import os
+from collections import Counter
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session, joinedload
 from ..database.models import ChatSession, User, ChatMessage, Admin, SessionStatus
 from datetime import datetime
 from ..utils import Helpers
+from ..utils.pagination import keyset_paginate, cached_count
+from .archive_service import ArchiveService, archive_available
+from .stats_service import StatsService
+from .analytics_service import AnalyticsService
+from .rollup_service import RollupService, rollups_active
+
+# Most sessions one bulk close/assign touches (call again for the rest)
+BULK_SESSION_LIMIT = int(os.getenv('CHAT_BULK_LIMIT', 500))
+
+OPEN_STATUSES = (SessionStatus.waiting, SessionStatus.active)
+
 
 class ChatService:
     """Service for chat-related business logic"""
     
     @staticmethod
-    def get_all_sessions(db: Session, page: int = 1, per_page: int = 10, status: str = None, admin_id: str = None, user_id: str = None):
-        """Get paginated chat sessions"""
+    def get_all_sessions(db: Session, page: int = 1, per_page: int = 10, status: str = None, admin_id: str = None, user_id: str = None,
+                         cursor: str = None, include_total: bool = False):
+        """
+        Get paginated chat sessions
+        Passing cursor ("" for the first page) switches to keyset pagination on (start_time, id);
+        the total is then only counted when include_total is set, and cached briefly
+        """
         query = db.query(ChatSession)
         
         # Apply filters
@@ -29,23 +48,98 @@ class ChatService:
         if user_id:
             query = query.filter(ChatSession.user_id == user_id)
         
+        # User and admin come in the same query as the page
+        page_query = query.options(
+            joinedload(ChatSession.user),
+            joinedload(ChatSession.admin)
+        )
+        
+        if cursor is not None:
+            result = keyset_paginate(page_query, ChatSession.start_time, ChatSession.id, cursor, per_page)
+            sessions = result['items']
+            return {
+                'sessions': sessions,
+                'summaries': ChatService.get_message_summaries(db, [s.id for s in sessions]),
+                'total': cached_count(query, ('sessions', status, admin_id, user_id)) if include_total else None,
+                'per_page': per_page,
+                'next_cursor': result['next_cursor'],
+                'has_next': result['has_next']
+            }
+        
         # Get total count
         total = query.count()
         
         # Apply pagination
-        sessions = query.order_by(ChatSession.start_time.desc()).offset((page - 1) * per_page).limit(per_page).all()
+        sessions = page_query.order_by(ChatSession.start_time.desc()).offset((page - 1) * per_page).limit(per_page).all()
         
         return {
             'sessions': sessions,
+            'summaries': ChatService.get_message_summaries(db, [s.id for s in sessions]),
             'total': total,
             'page': page,
             'per_page': per_page
         }
     
     @staticmethod
-    def get_session_by_id(db: Session, session_id: int):
-        """Get chat session by ID (INTEGER, not UUID)"""
-        return db.query(ChatSession).filter(ChatSession.id == session_id).first()
+    def get_message_summaries(db: Session, session_ids: list) -> dict:
+        """
+        Message count and last message for each session, in one grouped query
+        Returns: {session_id: {'message_count', 'last_message', 'last_message_time'}}
+        """
+        if not session_ids:
+            return {}
+        
+        grouped = db.query(
+            ChatMessage.session_id.label('session_id'),
+            func.count(ChatMessage.id).label('message_count'),
+            func.max(ChatMessage.id).label('last_message_id')
+        ).filter(
+            ChatMessage.session_id.in_(session_ids)
+        ).group_by(ChatMessage.session_id).subquery()
+        
+        rows = db.query(
+            grouped.c.session_id,
+            grouped.c.message_count,
+            ChatMessage.message,
+            ChatMessage.timestamp
+        ).join(
+            ChatMessage, ChatMessage.id == grouped.c.last_message_id
+        ).all()
+        
+        return {
+            row.session_id: {
+                'message_count': row.message_count,
+                'last_message': row.message,
+                'last_message_time': row.timestamp
+            }
+            for row in rows
+        }
+    
+    @staticmethod
+    def get_session_version(db: Session, session_id: int):
+        """
+        Cheap version of a session and its messages for ETags
+        (status, assignee, end time, last message id, message count); None if unknown
+        """
+        row = db.query(
+            ChatSession.status, ChatSession.admin_id, ChatSession.end_time,
+            db.query(func.max(ChatMessage.id)).filter(ChatMessage.session_id == session_id).scalar_subquery(),
+            db.query(func.count(ChatMessage.id)).filter(ChatMessage.session_id == session_id).scalar_subquery()
+        ).filter(ChatSession.id == session_id).first()
+        if row is not None:
+            return tuple(row)
+        # Archived sessions never change
+        if archive_available(db) and ArchiveService.get_archived_session(db, session_id) is not None:
+            return ('archived',)
+        return None
+    
+    @staticmethod
+    def get_session_by_id(db: Session, session_id: int, include_archived: bool = True):
+        """Get chat session by ID (INTEGER, not UUID), falling back to the archive"""
+        session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+        if session is None and include_archived and archive_available(db):
+            session = ArchiveService.get_archived_session(db, session_id)
+        return session
     
     @staticmethod
     def create_session(db: Session, session_data: dict):
@@ -71,6 +165,7 @@ class ChatService:
         db.add(session)
         db.commit()
         db.refresh(session)
+        StatsService.invalidate('sessions')
         return session
     
     @staticmethod
@@ -82,6 +177,7 @@ class ChatService:
             session.status = SessionStatus.active
             db.commit()
             db.refresh(session)
+            StatsService.invalidate('sessions')
         return session
     
     @staticmethod
@@ -93,11 +189,101 @@ class ChatService:
             session.end_time = datetime.utcnow()
             db.commit()
             db.refresh(session)
+            StatsService.invalidate('sessions')
         return session
     
     @staticmethod
-    def get_session_messages(db: Session, session_id: int):
-        """Get all messages from a session"""
+    def _select_open_sessions(db: Session, filters: dict, limit: int) -> list:
+        """
+        (id, admin_id) of open sessions matching filters, locked for the update that follows
+
+        filters: session_ids, status ('waiting'/'active'), admin_id, unassigned (bool),
+                 user_id, started_before (datetime)
+        """
+        query = db.query(ChatSession.id, ChatSession.admin_id).filter(
+            ChatSession.status.in_(OPEN_STATUSES)
+        )
+        if filters.get('session_ids'):
+            query = query.filter(ChatSession.id.in_(filters['session_ids']))
+        if filters.get('status'):
+            query = query.filter(ChatSession.status == SessionStatus[filters['status']])
+        if filters.get('admin_id'):
+            query = query.filter(ChatSession.admin_id == filters['admin_id'])
+        if filters.get('unassigned'):
+            query = query.filter(ChatSession.admin_id.is_(None))
+        if filters.get('user_id'):
+            query = query.filter(ChatSession.user_id == filters['user_id'])
+        if filters.get('started_before'):
+            query = query.filter(ChatSession.start_time < filters['started_before'])
+        
+        return query.order_by(ChatSession.id).limit(limit).with_for_update().all()
+    
+    @staticmethod
+    def bulk_close_sessions(db: Session, filters: dict, limit: int = None) -> dict:
+        """
+        Close every open session matching filters with one UPDATE
+        
+        Returns:
+            dict: session_ids closed, count, end_time
+        """
+        rows = ChatService._select_open_sessions(db, filters, limit or BULK_SESSION_LIMIT)
+        session_ids = [row.id for row in rows]
+        end_time = datetime.utcnow()
+        
+        if session_ids:
+            db.execute(
+                update(ChatSession)
+                .where(ChatSession.id.in_(session_ids), ChatSession.status.in_(OPEN_STATUSES))
+                .values(status=SessionStatus.closed, end_time=end_time)
+                .execution_options(synchronize_session=False)
+            )
+            # Set-based UPDATE skips the ORM events that maintain the daily rollups
+            if rollups_active(db.connection()):
+                RollupService.record_sessions_closed(
+                    db.connection(), end_time, Counter(row.admin_id for row in rows)
+                )
+            db.commit()
+            StatsService.invalidate('sessions')
+        
+        return {'session_ids': session_ids, 'count': len(session_ids), 'end_time': end_time}
+    
+    @staticmethod
+    def bulk_assign_sessions(db: Session, filters: dict, admin_id: str, limit: int = None) -> dict:
+        """
+        Assign (or reassign) every open session matching filters to admin_id with one UPDATE;
+        the sessions become active
+        
+        Returns:
+            dict: session_ids assigned, count, previous {admin_id: count}
+        """
+        rows = ChatService._select_open_sessions(db, filters, limit or BULK_SESSION_LIMIT)
+        session_ids = [row.id for row in rows]
+        
+        if session_ids:
+            db.execute(
+                update(ChatSession)
+                .where(ChatSession.id.in_(session_ids), ChatSession.status.in_(OPEN_STATUSES))
+                .values(admin_id=admin_id, status=SessionStatus.active)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            StatsService.invalidate('sessions')
+        
+        previous = Counter(str(row.admin_id) if row.admin_id else None for row in rows)
+        return {'session_ids': session_ids, 'count': len(session_ids), 'previous': dict(previous)}
+    
+    @staticmethod
+    def get_session_messages(db: Session, session_id: int, session=None):
+        """
+        Get all messages from a session; archived sessions read from the archive
+        (pass the session from get_session_by_id to skip looking it up again)
+        """
+        if session is None:
+            live = db.query(ChatSession.id).filter(ChatSession.id == session_id).first() is not None
+        else:
+            live = isinstance(session, ChatSession)
+        if not live and archive_available(db):
+            return ArchiveService.get_archived_messages(db, session_id)
         return db.query(ChatMessage).filter(
             ChatMessage.session_id == session_id
         ).order_by(ChatMessage.timestamp).all()
@@ -116,20 +302,39 @@ class ChatService:
         return message
     
     @staticmethod
-    def get_chat_statistics(db: Session):
-        """Get chat statistics"""
-        total_sessions = db.query(ChatSession).count()
-        active_sessions = db.query(ChatSession).filter(ChatSession.status == SessionStatus.active).count()
-        waiting_sessions = db.query(ChatSession).filter(ChatSession.status == SessionStatus.waiting).count()
-        closed_sessions = db.query(ChatSession).filter(ChatSession.status == SessionStatus.closed).count()
-        total_messages = db.query(ChatMessage).count()
+    def get_chat_statistics(db: Session, include_analytics: bool = False):
+        """
+        Get chat statistics (times in minutes)
         
-        return {
-            'total_sessions': total_sessions,
-            'active_sessions': active_sessions,
-            'waiting_sessions': waiting_sessions,
-            'closed_sessions': closed_sessions,
-            'total_messages': total_messages,
-            'average_response_time': 0.0,  # TODO: Calculate
-            'average_session_duration': 0.0  # TODO: Calculate
-        }
\ No newline at end of file
+        The counters and averages come from one aggregate query and the daily rollups,
+        cheap enough for the badge poll; include_analytics adds the percentiles, which
+        scan the whole analytics window of messages (cached for ANALYTICS_CACHE_TTL)
+        
+        average_response_time is None without the rollups unless include_analytics
+        already paid for the scan
+        """
+        counts = StatsService.get_session_counts(db)
+        
+        stats = {
+            'total_sessions': counts['total'],
+            'active_sessions': counts['active'],
+            'waiting_sessions': counts['waiting'],
+            'closed_sessions': counts['closed'],
+            'total_messages': counts['messages'],
+            'average_response_time': AnalyticsService.get_average_response_time(db),
+            'average_session_duration': AnalyticsService.get_average_session_duration(db) or 0.0
+        }
+        
+        if include_analytics:
+            responses = AnalyticsService.get_response_time_stats(db)['overall']
+            durations = AnalyticsService.get_session_duration_stats(db)['overall']
+            if stats['average_response_time'] is None:
+                stats['average_response_time'] = responses['average']
+            stats.update({
+                'response_time_p50': responses['p50'],
+                'response_time_p90': responses['p90'],
+                'response_time_p99': responses['p99'],
+                'session_duration_p90': durations['p90']
+            })
+        
+        return stats
\ No newline at end of file
@@ -1,91 +1,47 @@
 from sqlalchemy.orm import Session
 from ..database.models import User, Admin, ChatSession
-from datetime import datetime, timedelta
-from sqlalchemy import func, cast, Date
+from sqlalchemy import func
+import os
+from .stats_service import StatsService
+from .rollup_service import RollupService, rollups_active
+from .analytics_service import AnalyticsService
+from ..utils import timeseries
+from ..utils.cache import TTLCache
+
+# Counts for closed days only change through deletes/backfills
+TIMESERIES_CACHE_TTL = float(os.getenv('TIMESERIES_CACHE_TTL', 3600))
+MAX_SERIES_POINTS = 366
+
+timeseries_cache = TTLCache(ttl=TIMESERIES_CACHE_TTL, maxsize=256)
+
+# daily_stats column backing each series
+ROLLUP_FIELDS = {
+    'users': 'new_users',
+    'sessions': 'sessions_opened'
+}
 
 class DashboardService:
     @staticmethod
     def get_overview_stats(db: Session):
-        """Get overall dashboard statistics"""
+        """Get overall dashboard statistics (shares the cached stats counters)"""
         try:
-            # User stats
-            total_users = db.query(User).count()
-            today = datetime.utcnow().date()
-            
-            # Try different possible field names for user creation date
-            new_users_today = 0
-            try:
-                # Try created_at first
-                new_users_today = db.query(User).filter(
-                    func.date(User.created_at) == today
-                ).count()
-            except AttributeError:
-                try:
-                    # Try registration_date
-                    new_users_today = db.query(User).filter(
-                        func.date(User.registration_date) == today
-                    ).count()
-                except AttributeError:
-                    # If no date field exists, set to 0
-                    new_users_today = 0
-            
-            # Chat stats
-            total_chats = 0
-            active_chats = 0
-            waiting_chats = 0
-            
-            try:
-                total_chats = db.query(ChatSession).count()
-                
-                # Check if status field exists
-                try:
-                    active_chats = db.query(ChatSession).filter(ChatSession.status == 'active').count()
-                    waiting_chats = db.query(ChatSession).filter(ChatSession.status == 'waiting').count()
-                except AttributeError:
-                    # If status field doesn't exist, try other common field names
-                    try:
-                        active_chats = db.query(ChatSession).filter(ChatSession.session_status == 'active').count()
-                        waiting_chats = db.query(ChatSession).filter(ChatSession.session_status == 'waiting').count()
-                    except AttributeError:
-                        active_chats = 0
-                        waiting_chats = 0
-                        
-            except Exception as e:
-                print(f"Error querying chat sessions: {e}")
-                total_chats = 0
-            
-            # Admin stats
-            total_admins = 0
-            available_admins = 0
-            
-            try:
-                total_admins = db.query(Admin).count()
-                
-                # Check if is_available field exists
-                try:
-                    available_admins = db.query(Admin).filter(Admin.is_available == True).count()
-                except AttributeError:
-                    # If is_available doesn't exist, assume all are available
-                    available_admins = total_admins
-                    
-            except Exception as e:
-                print(f"Error querying admins: {e}")
-                total_admins = 1  # At least show 1 admin (current user)
-                available_admins = 1
+            users = StatsService.get_user_counts(db)
+            chats = StatsService.get_session_counts(db)
+            admins = StatsService.get_admin_counts(db)
             
             return {
                 'users': {
-                    'total': total_users,
-                    'new_today': new_users_today
+                    'total': users['total'],
+                    'new_today': users['today']
                 },
                 'chats': {
-                    'total': total_chats,
-                    'active': active_chats,
-                    'waiting': waiting_chats
+                    'total': chats['total'],
+                    'active': chats['active'],
+                    'waiting': chats['waiting']
                 },
                 'admins': {
-                    'total': total_admins,
-                    'available': available_admins
+                    'total': admins['total'],
+                    'available': admins['available']
                 }
             }
             
@@ -109,42 +65,56 @@ class DashboardService:
             }
     
     @staticmethod
-    def get_user_growth_data(db: Session, period: str, limit: int):
-        """Get user growth data"""
-        # Return sample data for now
-        from datetime import datetime, timedelta
+    def _daily_counts(db: Session, column, metric: str, first_day, today) -> dict:
+        """
+        Rows per reporting-timezone day from first_day to today
+        Closed days are grouped in SQL once and cached; only today is counted on every call
+        """
+        if rollups_active(db.connection()):
+            # Rollup rows are maintained incrementally: one small indexed read
+            return RollupService.get_daily_counts(db, ROLLUP_FIELDS[metric], first_day, today)
         
-        data = []
-        for i in range(limit):
-            date = datetime.now() - timedelta(days=i)
-            data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'count': max(0, 10 - i + (i % 3))  # Sample data
-            })
+        today_start = timeseries.local_day_start_utc(today)
         
-        return list(reversed(data))
+        def closed_days():
+            day = timeseries.local_day_expr(column, db.get_bind().dialect.name)
+            rows = db.query(day, func.count()).filter(
+                column >= timeseries.local_day_start_utc(first_day),
+                column < today_start
+            ).group_by(day).all()
+            return {timeseries.to_date(value): count for value, count in rows if value is not None}
+        
+        counts = dict(timeseries_cache.get_or_set((metric, first_day, today), closed_days))
+        counts[today] = db.query(func.count()).filter(column >= today_start).scalar() or 0
+        return counts
     
     @staticmethod
-    def get_chat_trends(db: Session, period: str, limit: int):
-        """Get chat trends"""
-        # Return sample data for now
-        from datetime import datetime, timedelta
-        
-        data = []
-        for i in range(limit):
-            date = datetime.now() - timedelta(days=i)
-            data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'chats': max(0, 5 - i + (i % 2))  # Sample data
-            })
+    def _series(db: Session, column, metric: str, period: str, limit: int) -> list:
+        """[(bucket_start, count)] for the last limit day/week/month buckets, gap-filled"""
+        period = period if period in timeseries.PERIODS else 'day'
+        limit = max(1, min(limit, MAX_SERIES_POINTS))
         
-        return list(reversed(data))
+        today = timeseries.local_today()
+        starts = timeseries.bucket_starts(period, limit, today)
+        counts = DashboardService._daily_counts(db, column, metric, starts[0], today)
+        return timeseries.rollup(counts, period, starts)
+    
+    @staticmethod
+    def get_user_growth_data(db: Session, period: str, limit: int):
+        """New users per day/week/month (UTC+7 buckets)"""
+        series = DashboardService._series(db, User.registration_date, 'users', period, limit)
+        return [{'date': start.isoformat(), 'count': count} for start, count in series]
+    
+    @staticmethod
+    def get_chat_trends(db: Session, period: str, limit: int):
+        """Chat sessions started per day/week/month (UTC+7 buckets)"""
+        series = DashboardService._series(db, ChatSession.start_time, 'sessions', period, limit)
+        return [{'date': start.isoformat(), 'chats': count} for start, count in series]
     
     @staticmethod
     def get_admin_performance(db: Session):
-        """Get admin performance metrics"""
-        return {
-            'total_responses': 0,
-            'average_response_time': 0,
-            'customer_satisfaction': 95
-        }
\ No newline at end of file
+        """Get admin performance metrics (response times and durations in minutes)"""
+        performance = AnalyticsService.get_admin_performance(db)
+        # No rating source yet
+        performance['customer_satisfaction'] = None
+        return performance
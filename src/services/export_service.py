@@ -0,0 +1,212 @@
+"""
+Transcript export
+Streams chat sessions with their messages as NDJSON or CSV from ordered
+queries (archive, then live tables) read through a server-side cursor, so
+memory stays flat however many messages are exported
+"""
+
+import os
+import io
+import csv
+import json
+import zlib
+from itertools import chain
+from datetime import datetime
+from sqlalchemy import false
+from sqlalchemy.orm import Session
+from ..database.models import (
+    ChatSession, ChatMessage, ArchivedChatSession, ArchivedChatMessage, User, Admin, SessionStatus
+)
+from .archive_service import archive_available
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_YIELD_PER = int(os.getenv('EXPORT_YIELD_PER', 1000))
+# Bytes buffered before a chunk is handed to the WSGI server
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 64 * 1024))
+
+CSV_COLUMNS = [
+    'session_id', 'session_status', 'session_start', 'session_end',
+    'user_id', 'user_name', 'username', 'admin_id', 'admin_name',
+    'message_id', 'timestamp', 'is_from_admin', 'message_admin_id', 'message'
+]
+
+# Spreadsheets evaluate cells starting with these as formulas
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _message_text(row):
+    """Archived bodies are stored as (optionally zlib-compressed) bytes"""
+    if row.is_compressed:
+        return zlib.decompress(row.message).decode('utf-8')
+    if isinstance(row.message, bytes):
+        return row.message.decode('utf-8')
+    return row.message
+
+
+def _csv_cell(value):
+    """Quote text a spreadsheet would run as a formula"""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _user_name(row):
+    return ' '.join(part for part in (row.first_name, row.last_name) if part) or None
+
+
+def _session_record(row) -> dict:
+    return {
+        'type': 'session',
+        'id': row.session_id,
+        'status': row.status.value if row.status else None,
+        'start_time': _iso(row.start_time),
+        'end_time': _iso(row.end_time),
+        'user_id': row.user_id,
+        'user_name': _user_name(row),
+        'username': row.username,
+        'admin_id': row.admin_id,
+        'admin_name': row.admin_name
+    }
+
+
+def _message_record(row) -> dict:
+    return {
+        'type': 'message',
+        'id': row.message_id,
+        'session_id': row.session_id,
+        'timestamp': _iso(row.timestamp),
+        'is_from_admin': bool(row.is_from_admin),
+        'admin_id': row.message_admin_id,
+        'message': _message_text(row)
+    }
+
+
+class ExportService:
+    """Service for streaming chat transcripts"""
+
+    @staticmethod
+    def _transcript_query(db: Session, session_model, message_model, message_text, is_compressed,
+                          date_from, date_to, admin_id, status, user_id):
+        """Session/message rows of one pair of tables (live or archive) with the filters applied"""
+        query = db.query(
+            session_model.id.label('session_id'),
+            session_model.status,
+            session_model.start_time,
+            session_model.end_time,
+            session_model.user_id,
+            User.first_name,
+            User.last_name,
+            User.username,
+            session_model.admin_id,
+            Admin.full_name.label('admin_name'),
+            message_model.id.label('message_id'),
+            message_model.timestamp,
+            message_model.is_from_admin,
+            message_model.admin_id.label('message_admin_id'),
+            message_text.label('message'),
+            is_compressed.label('is_compressed')
+        ).outerjoin(
+            User, User.id == session_model.user_id
+        ).outerjoin(
+            Admin, Admin.id == session_model.admin_id
+        ).outerjoin(
+            message_model, message_model.session_id == session_model.id
+        )
+
+        if date_from:
+            query = query.filter(session_model.start_time >= date_from)
+        if date_to:
+            query = query.filter(session_model.start_time < date_to)
+        if admin_id:
+            query = query.filter(session_model.admin_id == admin_id)
+        if status:
+            query = query.filter(session_model.status == SessionStatus[status])
+        if user_id:
+            query = query.filter(session_model.user_id == user_id)
+
+        # yield_per streams from a server-side cursor instead of buffering the result
+        return query.order_by(
+            session_model.id, message_model.timestamp, message_model.id
+        ).yield_per(EXPORT_YIELD_PER)
+
+    @staticmethod
+    def transcript_rows(db: Session, date_from: datetime = None, date_to: datetime = None,
+                        admin_id: str = None, status: str = None, user_id: str = None):
+        """
+        One row per message (sessions without messages appear once with empty message
+        columns), archived sessions first, each ordered by session then time and
+        streamed EXPORT_YIELD_PER at a time
+
+        Args:
+            date_from / date_to: session start_time range (date_to exclusive)
+            admin_id: sessions assigned to this admin
+            status: 'waiting', 'active' or 'closed'
+            user_id: sessions of this user
+        """
+        filters = dict(date_from=date_from, date_to=date_to, admin_id=admin_id, status=status, user_id=user_id)
+        live = ExportService._transcript_query(
+            db, ChatSession, ChatMessage, ChatMessage.message, false(), **filters
+        )
+        # Archived sessions are all closed
+        if status not in (None, 'closed') or not archive_available(db):
+            return live
+        archived = ExportService._transcript_query(
+            db, ArchivedChatSession, ArchivedChatMessage, ArchivedChatMessage.body,
+            ArchivedChatMessage.is_compressed, **filters
+        )
+        return chain(archived, live)
+
+    @staticmethod
+    def iter_ndjson(rows):
+        """
+        A {"type": "session"} line when a session starts, then a {"type": "message"}
+        line per message; yields ~EXPORT_CHUNK_SIZE text chunks
+        """
+        buffer = []
+        size = 0
+        current = None
+        for row in rows:
+            if row.session_id != current:
+                current = row.session_id
+                line = json.dumps(_session_record(row), ensure_ascii=False) + '\n'
+                buffer.append(line)
+                size += len(line)
+            if row.message_id is not None:
+                line = json.dumps(_message_record(row), ensure_ascii=False) + '\n'
+                buffer.append(line)
+                size += len(line)
+            if size >= EXPORT_CHUNK_SIZE:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield ''.join(buffer)
+
+    @staticmethod
+    def iter_csv(rows):
+        """
+        Header, then one row per message with its session's columns; yields text chunks
+        Text that would start a spreadsheet formula is prefixed with a quote
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        for row in rows:
+            session = _session_record(row)
+            writer.writerow([_csv_cell(value) for value in (
+                session['id'], session['status'], session['start_time'], session['end_time'],
+                session['user_id'], session['user_name'], session['username'],
+                session['admin_id'], session['admin_name'],
+                row.message_id, _iso(row.timestamp),
+                '' if row.message_id is None else bool(row.is_from_admin),
+                row.message_admin_id, _message_text(row)
+            )])
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
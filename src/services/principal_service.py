@@ -0,0 +1,51 @@
+"""
+Authenticated-principal cache
+token_required only needs a few admin fields; they are cached per admin_id
+for a short time so most authenticated requests skip the database.
+Admin writes invalidate the entry in this process, the TTL bounds staleness
+in other workers
+"""
+
+import os
+from collections import namedtuple
+from sqlalchemy.orm import Session
+from ..database.models import Admin
+from ..utils.cache import TTLCache
+
+PRINCIPAL_CACHE_TTL = float(os.getenv('PRINCIPAL_CACHE_TTL', 30))
+
+principal_cache = TTLCache(ttl=PRINCIPAL_CACHE_TTL, maxsize=1024)
+
+# Fields the auth decorators and routes read from current_user
+Principal = namedtuple('Principal', ['id', 'role', 'is_active', 'full_name'])
+
+
+class PrincipalService:
+    """Cached lookup of active admins by id"""
+
+    @staticmethod
+    def get_cached(admin_id: str):
+        """Cached principal, or None on a miss"""
+        return principal_cache.get(str(admin_id))
+
+    @staticmethod
+    def load(db: Session, admin_id: str):
+        """Active admin's principal from the database (cached); None if missing or inactive"""
+        row = db.query(Admin.id, Admin.role, Admin.is_active, Admin.full_name).filter(
+            Admin.id == admin_id,
+            Admin.is_active == True
+        ).first()
+        if row is None:
+            return None
+
+        principal = Principal(*row)
+        principal_cache.set(str(admin_id), principal)
+        return principal
+
+    @staticmethod
+    def invalidate(admin_id: str = None):
+        """Drop one admin's cached principal, or all of them"""
+        if admin_id:
+            principal_cache.invalidate(str(admin_id))
+        else:
+            principal_cache.clear()
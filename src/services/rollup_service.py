@@ -0,0 +1,314 @@
+"""
+Daily rollup maintenance
+Keeps daily_stats / daily_admin_stats current from ORM insert/update events
+and rebuilds them from raw tables on demand (backfill)
+"""
+
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import event, inspect, select, func, delete, and_, true
+from sqlalchemy.orm import Session
+from ..database.models import (
+    User, ChatSession, ChatMessage, SessionStatus, DailyStats, DailyAdminStats
+)
+from ..utils import timeseries
+from ..utils.table_check import TableCheck
+
+# Off until backfill_daily_stats has created the tables; adds one upsert per insert
+# (and a response-time SELECT per admin reply) to the write path when on
+DAILY_ROLLUP_ENABLED = os.getenv('DAILY_ROLLUP_ENABLED', 'False').lower() == 'true'
+
+_COUNTERS = {
+    DailyStats.__table__: ('new_users', 'sessions_opened', 'sessions_closed', 'messages_in',
+                           'messages_out', 'response_time_sum', 'response_count'),
+    DailyAdminStats.__table__: ('sessions_handled', 'messages_out', 'response_time_sum', 'response_count'),
+}
+
+_rollup_tables = TableCheck(
+    *(table.name for table in _COUNTERS),
+    missing_warning="⚠️  DAILY_ROLLUP_ENABLED but daily_stats tables are missing - "
+                    "run python -m src.database.migrations.backfill_daily_stats"
+)
+
+
+def rollups_active(connection) -> bool:
+    """
+    DAILY_ROLLUP_ENABLED and the rollup tables exist
+
+    A missing migration must not break the writes the rollups piggyback on, so
+    without the tables rollups are skipped (warned once, looked for again every minute)
+    """
+    return DAILY_ROLLUP_ENABLED and _rollup_tables(connection)
+
+
+def _increment(connection, table, keys: dict, deltas: dict):
+    """Atomic upsert adding deltas to the row identified by keys"""
+    values = {column: 0 for column in _COUNTERS[table]}
+    values.update(keys)
+    values.update(deltas)
+
+    if connection.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        statement = insert(table).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + statement.excluded[column] for column in deltas}
+        )
+    else:
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table).values(**values)
+        statement = statement.on_duplicate_key_update(
+            **{column: table.c[column] + statement.inserted[column] for column in deltas}
+        )
+
+    connection.execute(statement)
+
+
+def _loaded(target, attribute: str):
+    """Attribute value if already loaded; server defaults are not fetched after INSERT"""
+    return target.__dict__.get(attribute)
+
+
+def iter_response_times(rows):
+    """
+    Pair each admin reply with the first user message it answers
+
+    Args:
+        rows: (session_id, admin_id, is_from_admin, timestamp) ordered by session, timestamp, id
+
+    Yields:
+        (admin_id, reply_timestamp, seconds)
+    """
+    current_session = None
+    waiting_since = None
+    for session_id, admin_id, is_from_admin, timestamp in rows:
+        if session_id != current_session:
+            current_session = session_id
+            waiting_since = None
+
+        if not is_from_admin:
+            if waiting_since is None:
+                waiting_since = timestamp
+        elif waiting_since is not None:
+            yield admin_id, timestamp, max(0.0, (timestamp - waiting_since).total_seconds())
+            waiting_since = None
+
+
+class RollupService:
+    """Incremental and backfilled daily statistics"""
+
+    @staticmethod
+    def record_new_user(connection, user: User):
+        day = timeseries.local_date(_loaded(user, 'registration_date') or datetime.utcnow())
+        _increment(connection, DailyStats.__table__, {'day': day}, {'new_users': 1})
+
+    @staticmethod
+    def record_session_opened(connection, session: ChatSession):
+        day = timeseries.local_date(_loaded(session, 'start_time') or datetime.utcnow())
+        _increment(connection, DailyStats.__table__, {'day': day}, {'sessions_opened': 1})
+
+    @staticmethod
+    def record_session_closed(connection, session: ChatSession):
+        day = timeseries.local_date(_loaded(session, 'end_time') or datetime.utcnow())
+        _increment(connection, DailyStats.__table__, {'day': day}, {'sessions_closed': 1})
+        if session.admin_id:
+            _increment(connection, DailyAdminStats.__table__,
+                       {'day': day, 'admin_id': session.admin_id}, {'sessions_handled': 1})
+
+    @staticmethod
+    def record_sessions_closed(connection, end_time: datetime, admin_counts: dict):
+        """Bulk close (no ORM events): admin_counts is {admin_id or None: sessions closed}"""
+        day = timeseries.local_date(end_time)
+        _increment(connection, DailyStats.__table__, {'day': day},
+                   {'sessions_closed': sum(admin_counts.values())})
+        for admin_id, count in admin_counts.items():
+            if admin_id:
+                _increment(connection, DailyAdminStats.__table__,
+                           {'day': day, 'admin_id': admin_id}, {'sessions_handled': count})
+
+    @staticmethod
+    def record_message(connection, message: ChatMessage):
+        messages = ChatMessage.__table__
+
+        if not message.is_from_admin:
+            day = timeseries.local_date(_loaded(message, 'timestamp') or datetime.utcnow())
+            _increment(connection, DailyStats.__table__, {'day': day}, {'messages_in': 1})
+            return
+
+        # First user message after the previous admin reply in this session
+        previous_reply = select(func.max(messages.c.id)).where(
+            messages.c.session_id == message.session_id,
+            messages.c.is_from_admin == True,
+            messages.c.id < message.id
+        ).scalar_subquery()
+        first_unanswered = select(func.min(messages.c.timestamp)).where(
+            messages.c.session_id == message.session_id,
+            messages.c.is_from_admin == False,
+            messages.c.id > func.coalesce(previous_reply, 0),
+            messages.c.id < message.id
+        ).scalar_subquery()
+        reply_time = select(messages.c.timestamp).where(messages.c.id == message.id).scalar_subquery()
+
+        row = connection.execute(select(first_unanswered, reply_time)).one()
+        waiting_since, replied_at = row[0], row[1] or datetime.utcnow()
+
+        deltas = {'messages_out': 1}
+        if waiting_since is not None:
+            deltas['response_time_sum'] = max(0.0, (replied_at - waiting_since).total_seconds())
+            deltas['response_count'] = 1
+
+        day = timeseries.local_date(replied_at)
+        _increment(connection, DailyStats.__table__, {'day': day}, deltas)
+        if message.admin_id:
+            _increment(connection, DailyAdminStats.__table__,
+                       {'day': day, 'admin_id': message.admin_id}, deltas)
+
+    @staticmethod
+    def get_daily_counts(db: Session, field: str, first_day, last_day) -> dict:
+        """{day: value} of one daily_stats column between two days (inclusive)"""
+        column = getattr(DailyStats, field)
+        rows = db.query(DailyStats.day, column).filter(
+            DailyStats.day >= first_day,
+            DailyStats.day <= last_day
+        ).all()
+        return {timeseries.to_date(day): value for day, value in rows}
+
+    @staticmethod
+    def get_response_time_totals(db: Session, first_day, last_day) -> tuple:
+        """(response_time_sum seconds, response_count) of daily_stats between two days (inclusive)"""
+        total, count = db.query(
+            func.sum(DailyStats.response_time_sum), func.sum(DailyStats.response_count)
+        ).filter(
+            DailyStats.day >= first_day,
+            DailyStats.day <= last_day
+        ).one()
+        return float(total or 0), int(count or 0)
+
+    @staticmethod
+    def backfill(db: Session, first_day=None, last_day=None) -> dict:
+        """
+        Rebuild rollup rows for a day range (default: all history) from raw tables
+        Returns: number of daily_stats and daily_admin_stats rows written
+        """
+        dialect = db.get_bind().dialect.name
+        start = timeseries.local_day_start_utc(first_day) if first_day else None
+        end = timeseries.local_day_start_utc(last_day) + timedelta(days=1) if last_day else None
+
+        def in_range(column):
+            conditions = []
+            if start is not None:
+                conditions.append(column >= start)
+            if end is not None:
+                conditions.append(column < end)
+            return and_(true(), *conditions)
+
+        daily = {}
+        per_admin = {}
+
+        def add(day, field, value):
+            row = daily.setdefault(timeseries.to_date(day), dict.fromkeys(_COUNTERS[DailyStats.__table__], 0))
+            row[field] += value
+
+        def add_admin(day, admin_id, field, value):
+            if not admin_id:
+                return
+            key = (timeseries.to_date(day), admin_id)
+            row = per_admin.setdefault(key, dict.fromkeys(_COUNTERS[DailyAdminStats.__table__], 0))
+            row[field] += value
+
+        # New users
+        day = timeseries.local_day_expr(User.registration_date, dialect)
+        for value, count in db.query(day, func.count()).filter(in_range(User.registration_date)).group_by(day):
+            if value is not None:
+                add(value, 'new_users', count)
+
+        # Sessions opened
+        day = timeseries.local_day_expr(ChatSession.start_time, dialect)
+        for value, count in db.query(day, func.count()).filter(in_range(ChatSession.start_time)).group_by(day):
+            if value is not None:
+                add(value, 'sessions_opened', count)
+
+        # Sessions closed (overall and per assigned admin)
+        day = timeseries.local_day_expr(ChatSession.end_time, dialect)
+        closed = db.query(day, ChatSession.admin_id, func.count()).filter(
+            ChatSession.status == SessionStatus.closed,
+            ChatSession.end_time.isnot(None),
+            in_range(ChatSession.end_time)
+        ).group_by(day, ChatSession.admin_id)
+        for value, admin_id, count in closed:
+            add(value, 'sessions_closed', count)
+            add_admin(value, admin_id, 'sessions_handled', count)
+
+        # Messages in/out
+        day = timeseries.local_day_expr(ChatMessage.timestamp, dialect)
+        grouped = db.query(day, ChatMessage.admin_id, ChatMessage.is_from_admin, func.count()).filter(
+            in_range(ChatMessage.timestamp)
+        ).group_by(day, ChatMessage.admin_id, ChatMessage.is_from_admin)
+        for value, admin_id, is_from_admin, count in grouped:
+            if is_from_admin:
+                add(value, 'messages_out', count)
+                add_admin(value, admin_id, 'messages_out', count)
+            else:
+                add(value, 'messages_in', count)
+
+        # Response times: one streaming pass over messages in session order
+        rows = db.query(
+            ChatMessage.session_id, ChatMessage.admin_id, ChatMessage.is_from_admin, ChatMessage.timestamp
+        ).filter(
+            in_range(ChatMessage.timestamp)
+        ).order_by(ChatMessage.session_id, ChatMessage.timestamp, ChatMessage.id).yield_per(5000)
+        for admin_id, replied_at, seconds in iter_response_times(rows):
+            local_day = timeseries.local_date(replied_at)
+            for field, value in (('response_time_sum', seconds), ('response_count', 1)):
+                add(local_day, field, value)
+                add_admin(local_day, admin_id, field, value)
+
+        # Replace the range
+        for model in (DailyStats, DailyAdminStats):
+            statement = delete(model)
+            if first_day:
+                statement = statement.where(model.day >= first_day)
+            if last_day:
+                statement = statement.where(model.day <= last_day)
+            db.execute(statement)
+
+        if daily:
+            db.bulk_insert_mappings(DailyStats, [{'day': d, **values} for d, values in daily.items()])
+        if per_admin:
+            db.bulk_insert_mappings(DailyAdminStats, [
+                {'day': d, 'admin_id': admin_id, **values} for (d, admin_id), values in per_admin.items()
+            ])
+        db.commit()
+
+        return {'daily_stats': len(daily), 'daily_admin_stats': len(per_admin)}
+
+
+# Incremental maintenance from ORM events (bulk/Core writes are covered by backfill)
+
+@event.listens_for(User, 'after_insert')
+def _rollup_user_insert(mapper, connection, target):
+    if rollups_active(connection):
+        RollupService.record_new_user(connection, target)
+
+
+@event.listens_for(ChatSession, 'after_insert')
+def _rollup_session_insert(mapper, connection, target):
+    if rollups_active(connection):
+        RollupService.record_session_opened(connection, target)
+        if target.status == SessionStatus.closed:
+            RollupService.record_session_closed(connection, target)
+
+
+@event.listens_for(ChatSession, 'after_update')
+def _rollup_session_update(mapper, connection, target):
+    if not rollups_active(connection):
+        return
+    history = inspect(target).attrs.status.history
+    if SessionStatus.closed in history.added and SessionStatus.closed not in history.deleted:
+        RollupService.record_session_closed(connection, target)
+
+
+@event.listens_for(ChatMessage, 'after_insert')
+def _rollup_message_insert(mapper, connection, target):
+    if rollups_active(connection):
+        RollupService.record_message(connection, target)
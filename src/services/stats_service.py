@@ -0,0 +1,93 @@
+"""
+Aggregated statistics engine
+Each family of counters (users, sessions, admins) is one conditional-aggregate
+query, cached for a few seconds so polling endpoints stay cheap
+"""
+
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import func, case, select
+from sqlalchemy.orm import Session
+from ..database.models import User, Admin, AdminRole, ChatSession, ChatMessage, SessionStatus
+from ..utils.cache import TTLCache
+
+STATS_CACHE_TTL = float(os.getenv('STATS_CACHE_TTL', 10))
+
+stats_cache = TTLCache(ttl=STATS_CACHE_TTL, maxsize=32)
+
+
+def _count_if(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END)"""
+    return func.sum(case((condition, 1), else_=0))
+
+
+class StatsService:
+    """Single-query counters shared by the stats and dashboard endpoints"""
+
+    @staticmethod
+    def get_user_counts(db: Session) -> dict:
+        """total / premium / bot users and registrations today, this week, this month"""
+        return stats_cache.get_or_set('users', lambda: StatsService._query_user_counts(db))
+
+    @staticmethod
+    def get_session_counts(db: Session) -> dict:
+        """Sessions by status and total messages"""
+        return stats_cache.get_or_set('sessions', lambda: StatsService._query_session_counts(db))
+
+    @staticmethod
+    def get_admin_counts(db: Session) -> dict:
+        """Admins by role, active and available"""
+        return stats_cache.get_or_set('admins', lambda: StatsService._query_admin_counts(db))
+
+    @staticmethod
+    def invalidate(family: str = None):
+        """Drop cached counters of one family ('users', 'sessions', 'admins') or all"""
+        if family:
+            stats_cache.invalidate(family)
+        else:
+            stats_cache.clear()
+
+    @staticmethod
+    def _query_user_counts(db: Session) -> dict:
+        now = datetime.utcnow()
+        today_start = datetime(now.year, now.month, now.day)
+        tomorrow_start = today_start + timedelta(days=1)
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+
+        row = db.execute(select(
+            func.count(User.id).label('total'),
+            _count_if(User.is_premium == True).label('premium'),
+            _count_if(User.is_bot == True).label('bots'),
+            _count_if((User.registration_date >= today_start) & (User.registration_date < tomorrow_start)).label('today'),
+            _count_if(User.registration_date >= week_ago).label('week'),
+            _count_if(User.registration_date >= month_ago).label('month')
+        )).one()
+
+        return {key: int(value or 0) for key, value in row._mapping.items()}
+
+    @staticmethod
+    def _query_session_counts(db: Session) -> dict:
+        total_messages = select(func.count(ChatMessage.id)).scalar_subquery()
+
+        row = db.execute(select(
+            func.count(ChatSession.id).label('total'),
+            _count_if(ChatSession.status == SessionStatus.active).label('active'),
+            _count_if(ChatSession.status == SessionStatus.waiting).label('waiting'),
+            _count_if(ChatSession.status == SessionStatus.closed).label('closed'),
+            total_messages.label('messages')
+        )).one()
+
+        return {key: int(value or 0) for key, value in row._mapping.items()}
+
+    @staticmethod
+    def _query_admin_counts(db: Session) -> dict:
+        row = db.execute(select(
+            func.count(Admin.id).label('total'),
+            _count_if(Admin.is_active == True).label('active'),
+            _count_if(Admin.is_available == True).label('available'),
+            _count_if(Admin.role == AdminRole.super_admin).label('super_admins'),
+            _count_if(Admin.role == AdminRole.admin).label('regular_admins')
+        )).one()
+
+        return {key: int(value or 0) for key, value in row._mapping.items()}
@@ -1,3 +1,4 @@
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session, joinedload
 from ..database.models import SystemSettings, FAQCategory, FAQ
 from ..utils import Helpers
@@ -97,6 +98,16 @@ class SystemSettingService:
     # FAQ Category Methods
     # ============================================
     
+    @staticmethod
+    def get_faq_content_version(db: Session) -> tuple:
+        """Cheap version of all categories and FAQs (row counts + latest updated_at), for ETags"""
+        return db.execute(select(
+            select(func.count(FAQCategory.id)).scalar_subquery(),
+            select(func.max(FAQCategory.updated_at)).scalar_subquery(),
+            select(func.count(FAQ.id)).scalar_subquery(),
+            select(func.max(FAQ.updated_at)).scalar_subquery()
+        )).one().tuple()
+    
     @staticmethod
     def get_all_categories(db: Session) -> List[FAQCategory]:
         """Get all FAQ categories ordered by order_index"""
@@ -1,14 +1,25 @@
+import os
 from sqlalchemy.orm import Session
-from ..database.models import User
-from datetime import datetime, timedelta
-from sqlalchemy import func, cast, Date
+from ..database.models import User, ChatSession, ChatMessage
+from datetime import datetime
+from ..utils.pagination import keyset_paginate, cached_count
+from .activity_tracker import activity_tracker
+from .archive_service import ArchiveService, archive_available
+from .stats_service import StatsService
+
+# Messages removed per statement when deleting a user's history
+DELETE_BATCH_SIZE = int(os.getenv('USER_DELETE_BATCH_SIZE', 5000))
 
 class UserService:
     """Service for user-related business logic"""
     
     @staticmethod
-    def get_all_users(db: Session, page: int = 1, per_page: int = 10, search: str = None, is_premium: bool = None):
-        """Get paginated users with optional filters"""
+    def get_all_users(db: Session, page: int = 1, per_page: int = 10, search: str = None, is_premium: bool = None,
+                      cursor: str = None, include_total: bool = False):
+        """
+        Get paginated users with optional filters
+        Passing cursor ("" for the first page) switches to keyset pagination on (registration_date, id)
+        """
         query = db.query(User)
         
         # Apply filters
@@ -23,11 +34,17 @@ class UserService:
         if is_premium is not None:
             query = query.filter(User.is_premium == is_premium)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        users = query.order_by(User.registration_date.desc()).offset((page - 1) * per_page).limit(per_page).all()
+        keyset = None
+        if cursor is not None:
+            keyset = keyset_paginate(query, User.registration_date, User.id, cursor, per_page)
+            total = cached_count(query, ('users', search, is_premium)) if include_total else None
+            users = keyset['items']
+        else:
+            # Get total count
+            total = query.count()
+            
+            # Apply pagination
+            users = query.order_by(User.registration_date.desc()).offset((page - 1) * per_page).limit(per_page).all()
         
         #  Ensure dates are datetime objects, not strings
         for user in users:
@@ -46,6 +63,15 @@ class UserService:
                 except:
                     user.last_activity = None
         
+        if keyset is not None:
+            return {
+                'users': users,
+                'total': total,
+                'per_page': per_page,
+                'next_cursor': keyset['next_cursor'],
+                'has_next': keyset['has_next']
+            }
+        
         return {
             'users': users,
             'total': total,
@@ -85,60 +111,57 @@ class UserService:
         return user
     
     @staticmethod
-    def delete_user(db: Session, user_id: str):  #  Changed to string
-        """Delete user"""
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            db.delete(user)
+    def delete_user(db: Session, user_id: str, batch_size: int = None):  #  Changed to string
+        """
+        Delete user and all of its chat history in one transaction
+        Messages of the user's sessions go in batches by id, the rest is a few
+        set-based DELETEs; no rows are loaded into the session
+        """
+        batch_size = batch_size or DELETE_BATCH_SIZE
+
+        try:
+            while True:
+                message_ids = [row[0] for row in db.query(ChatMessage.id).filter(
+                    ChatMessage.session_id.in_(
+                        db.query(ChatSession.id).filter(ChatSession.user_id == user_id).scalar_subquery()
+                    )
+                ).limit(batch_size)]
+                if not message_ids:
+                    break
+                db.query(ChatMessage).filter(ChatMessage.id.in_(message_ids)).delete(synchronize_session=False)
+
+            if archive_available(db):
+                ArchiveService.delete_user_archive(db, user_id)
+            # Explicit so databases without ON DELETE CASCADE foreign keys work too
+            db.query(ChatMessage).filter(ChatMessage.user_id == user_id).delete(synchronize_session=False)
+            db.query(ChatSession).filter(ChatSession.user_id == user_id).delete(synchronize_session=False)
+            db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
             db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        db.expire_all()
+
+        StatsService.invalidate('users')
+        StatsService.invalidate('sessions')
         return True
     
     @staticmethod
     def get_user_statistics(db: Session):
-        """Get user statistics"""
-        total_users = db.query(User).count()
-        premium_users = db.query(User).filter(User.is_premium == True).count()
-        bot_users = db.query(User).filter(User.is_bot == True).count()
-        
-        now = datetime.utcnow()
-        today_start = datetime(now.year, now.month, now.day)
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        
-        active_today = db.query(User).filter(
-            cast(User.registration_date, Date) == today_start.date()
-        ).count()
-        
-        active_week = db.query(User).filter(
-            User.registration_date >= week_ago
-        ).count()
-        
-        active_month = db.query(User).filter(
-            User.registration_date >= month_ago
-        ).count()
-        
-        new_today = db.query(User).filter(
-            cast(User.registration_date, Date) == today_start.date()
-        ).count()
-        
-        new_week = db.query(User).filter(
-            User.registration_date >= week_ago
-        ).count()
-        
-        new_month = db.query(User).filter(
-            User.registration_date >= month_ago
-        ).count()
+        """Get user statistics (one aggregate query, briefly cached)"""
+        counts = StatsService.get_user_counts(db)
         
+        # "Active" is measured by registration date, same as "new"
         return {
-            'total_users': total_users,
-            'active_today': active_today,
-            'active_this_week': active_week,
-            'active_this_month': active_month,
-            'premium_users': premium_users,
-            'bot_users': bot_users,
-            'new_users_today': new_today,
-            'new_users_this_week': new_week,
-            'new_users_this_month': new_month
+            'total_users': counts['total'],
+            'active_today': counts['today'],
+            'active_this_week': counts['week'],
+            'active_this_month': counts['month'],
+            'premium_users': counts['premium'],
+            'bot_users': counts['bots'],
+            'new_users_today': counts['today'],
+            'new_users_this_week': counts['week'],
+            'new_users_this_month': counts['month']
         }
     
     @staticmethod
@@ -183,12 +206,12 @@ class UserService:
         # Check if user already exists
         existing_user = db.query(User).filter(User.telegram_id == int(telegram_id)).first()
         if existing_user:
-            # Update last activity and photo if provided
-            existing_user.last_activity = datetime.now()
-            if photo_url:
+            # Last activity is written behind; only touch the row if the photo changed
+            activity_tracker.touch(existing_user.id)
+            if photo_url and existing_user.photo_url != photo_url:
                 existing_user.photo_url = photo_url
-            db.commit()
-            db.refresh(existing_user)
+                db.commit()
+                db.refresh(existing_user)
             return {
                 'success': True,
                 'message': 'User already exists',
@@ -239,6 +262,10 @@ class UserService:
         # Delete chat sessions associated with this user
         db.query(ChatSession).filter(ChatSession.user_id == user_id).delete(synchronize_session=False)
         
+        # Delete archived chat history as well
+        if archive_available(db):
+            ArchiveService.delete_user_archive(db, user_id)
+        
         # Create admin record
         # Map role string to enum (AdminRole has lowercase values: admin, super_admin)
         role_map = {
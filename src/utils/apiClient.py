@@ -5,9 +5,11 @@ Handles HTTP requests to our own API endpoints
 
 import requests
 import os
-from flask import session, current_app
+import json
+from flask import session, current_app, request
 from typing import Dict, Any, Optional
 import urllib3
+from .cache import TTLCache
 
 # ⚠️ Disable SSL warnings for development
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -20,6 +22,10 @@ class APIClient:
         self.timeout = 30
         #  Disable SSL verification for local development
         self.verify_ssl = os.getenv('API_SSL_VERIFY', 'false').lower() == 'true'
+        # (endpoint, params, token) -> (ETag, body) of GET responses, revalidated with If-None-Match
+        self._response_cache = TTLCache(ttl=600, maxsize=256)
+        # Shared with the API: lets it rate-limit per admin/browser instead of per portal process
+        self.internal_token = os.getenv('INTERNAL_API_TOKEN', '').strip()
     
     def _get_headers(self) -> Dict[str, str]:
         """Get headers with JWT token from session"""
@@ -32,12 +38,18 @@ class APIClient:
         if access_token:
             headers['Authorization'] = f'Bearer {access_token}'
         
+        if self.internal_token:
+            # Rate-limit bucket: the logged-in admin, else the browser's address (login)
+            admin_id = session.get('admin', {}).get('id')
+            headers['X-Internal-Token'] = self.internal_token
+            headers['X-Client-Id'] = f'admin:{admin_id}' if admin_id else f'ip:{request.remote_addr}'
+        
         return headers
     
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
-        """Handle API response and convert to dict"""
+    def _handle_response(self, response: requests.Response, content: bytes = None) -> Dict[str, Any]:
+        """Handle API response and convert to dict (content: cached body for a 304)"""
         try:
-            data = response.json()
+            data = json.loads(content) if content is not None else response.json()
             
             #  Convert ISO date strings to datetime objects if needed
             if data.get('success') and 'data' in data:
@@ -76,13 +88,26 @@ class APIClient:
         """Make GET request to API"""
         try:
             url = f"{self.base_url}{endpoint}"
+            headers = self._get_headers()
+            
+            # Conditional request from the local copy, if any
+            cache_key = (endpoint, tuple(sorted((params or {}).items())), headers.get('Authorization'))
+            cached = self._response_cache.get(cache_key)
+            if cached:
+                headers['If-None-Match'] = cached[0]
+            
             response = requests.get(
                 url, 
-                headers=self._get_headers(),
+                headers=headers,
                 params=params or {},
                 timeout=self.timeout,
                 verify=self.verify_ssl  #  Use SSL verification setting
             )
+            
+            if response.status_code == 304 and cached:
+                return self._handle_response(response, cached[1])
+            if response.status_code == 200 and response.headers.get('ETag'):
+                self._response_cache.set(cache_key, (response.headers['ETag'], response.content))
             return self._handle_response(response)
         except requests.RequestException as e:
             current_app.logger.error(f"API GET request failed: {e}")
@@ -134,6 +159,45 @@ class APIClient:
         except requests.RequestException as e:
             current_app.logger.error(f"API DELETE request failed: {e}")
             return {'success': False, 'message': f'Network error: {str(e)}'}
+    
+    def batch(self, calls: list, parallel: bool = True) -> Dict[Any, Dict[str, Any]]:
+        """
+        Make several API calls in one round-trip (/api/v1/batch)
+        
+        Args:
+            calls: [{'id', 'path', 'params'?, 'method'? (GET), 'body'?}]
+            parallel: let the API run them concurrently (honoured for GET-only batches)
+        
+        Returns:
+            dict: id -> response dict, as get()/post()/put()/delete() return it
+        """
+        response = self.post('/api/v1/batch', {'requests': calls, 'parallel': parallel})
+        
+        if not response.get('success'):
+            if response.get('redirect_to_login'):
+                return {call['id']: response for call in calls}
+            # API without /batch (or batch rejected): one request per call
+            return {call['id']: self._single_call(call) for call in calls}
+        
+        results = {}
+        for item in response['data']['responses']:
+            body = item['body'] if isinstance(item['body'], dict) else {'success': False, 'message': str(item['body'])}
+            if item['status'] == 401:
+                session.clear()
+                body['redirect_to_login'] = True
+            results[item['id']] = body
+        return results
+    
+    def _single_call(self, call: Dict) -> Dict[str, Any]:
+        """One batch entry as a regular request"""
+        method = call.get('method', 'GET').upper()
+        if method == 'GET':
+            return self.get(call['path'], call.get('params'))
+        if method == 'POST':
+            return self.post(call['path'], call.get('body'))
+        if method == 'PUT':
+            return self.put(call['path'], call.get('body'))
+        return self.delete(call['path'])
 
 # Global instance
 api_client = APIClient()
\ No newline at end of file
@@ -4,99 +4,122 @@ Handles HTTP requests to API endpoints from the bot
 """
 import requests
 import os
+import json
+import logging
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 import urllib3
+from .cache import TTLCache
+from .logging_config import get_sampled_logger
 
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+# Per-request lines (DEBUG/INFO) are sampled; errors always pass
+request_log = get_sampled_logger(__name__ + '.requests')
+
 class BotAPIClient:
     """Client for making requests to API from bot"""
     
     def __init__(self):
         self.base_url = os.getenv('API_BASE_URL', 'http://localhost:5001')
         self.api_prefix = '/api/v1'
-        print(f"🔗 Bot API Client initialized")
-        print(f"📍 Base URL: {self.base_url}")
+        # Shared with the API: lets it rate-limit per Telegram user instead of per bot process
+        self.internal_token = os.getenv('INTERNAL_API_TOKEN', '').strip()
+        # (endpoint, params) -> (ETag, body) of GET responses, revalidated with If-None-Match
+        self._response_cache = TTLCache(ttl=3600, maxsize=512)
+        logger.info("🔗 Bot API Client initialized - Base URL: %s", self.base_url)
     
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests"""
-        return {
+    def _get_headers(self, client_id=None) -> Dict[str, str]:
+        """Get headers for API requests (client_id: Telegram user the call is made for)"""
+        headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         }
+        if self.internal_token:
+            headers['X-Internal-Token'] = self.internal_token
+            if client_id is not None:
+                headers['X-Client-Id'] = f'tg:{client_id}'
+        return headers
     
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
-        """Handle API response"""
+    def _handle_response(self, response: requests.Response, content: bytes = None) -> Dict[str, Any]:
+        """Handle API response (content: cached body for a 304)"""
         try:
+            if content is not None:
+                request_log.debug("✅ API Not Modified, using cached copy")
+                return json.loads(content)
             data = response.json()
             if response.status_code >= 400:
-                print(f"❌ API Error {response.status_code}: {data.get('message', 'Unknown error')}")
+                logger.warning("❌ API Error %s: %s", response.status_code, data.get('message', 'Unknown error'))
             else:
-                print(f"✅ API Success {response.status_code}")
+                request_log.debug("✅ API Success %s", response.status_code)
             return data
         except Exception as e:
-            print(f"❌ Failed to parse response: {str(e)}")
-            print(f"📄 Raw response: {response.text[:200]}")
+            logger.error("❌ Failed to parse response: %s - raw response: %s", e, response.text[:200])
             return {
                 'success': False,
                 'message': f'Failed to parse response: {str(e)}',
                 'data': None
             }
     
-    def get(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
+    def get(self, endpoint: str, params: Dict = None, client_id=None) -> Dict[str, Any]:
         """Make GET request"""
         try:
             url = f"{self.base_url}{self.api_prefix}{endpoint}"
-            print(f"📡 GET {url}")
+            request_log.debug("📡 GET %s", url)
             
             # For HTTPS with self-signed cert, disable SSL verification
             verify_ssl = False if self.base_url.startswith('https://') else True
             
+            # Conditional request from the local copy, if any
+            headers = self._get_headers(client_id)
+            cache_key = (endpoint, tuple(sorted((params or {}).items())))
+            cached = self._response_cache.get(cache_key)
+            if cached:
+                headers['If-None-Match'] = cached[0]
+            
             response = requests.get(
                 url, 
                 params=params, 
-                headers=self._get_headers(), 
+                headers=headers, 
                 timeout=10,
                 verify=verify_ssl
             )
+            
+            if response.status_code == 304 and cached:
+                return self._handle_response(response, cached[1])
+            if response.status_code == 200 and response.headers.get('ETag'):
+                self._response_cache.set(cache_key, (response.headers['ETag'], response.content))
             return self._handle_response(response)
             
         except requests.exceptions.ConnectionError as e:
-            error_msg = f"❌ Connection failed to {self.base_url}"
-            print(error_msg)
-            print(f"   Error details: {str(e)}")
-            print(f"   💡 Troubleshooting:")
-            print(f"      - Check if API is running: curl -k {self.base_url}/health")
-            print(f"      - Check if Apache is running: sudo systemctl status apache2")
-            print(f"      - Check hosts file: cat /etc/hosts | grep chatbot.ibs.local")
+            logger.error(
+                "❌ Connection failed to %s: %s (💡 check the API: curl -k %s/health, "
+                "Apache: sudo systemctl status apache2, hosts: grep chatbot.ibs.local /etc/hosts)",
+                self.base_url, e, self.base_url
+            )
             return {'success': False, 'message': 'API connection failed', 'data': None}
             
         except requests.exceptions.Timeout as e:
-            error_msg = f"❌ Request timeout to {self.base_url}"
-            print(error_msg)
+            logger.error("❌ Request timeout to %s", self.base_url)
             return {'success': False, 'message': 'API request timeout', 'data': None}
             
         except requests.exceptions.SSLError as e:
-            error_msg = f"❌ SSL/Certificate error for {self.base_url}"
-            print(error_msg)
-            print(f"   Error details: {str(e)}")
-            print(f"   💡 Try: curl -k {self.base_url}/health")
+            logger.error("❌ SSL/Certificate error for %s: %s (💡 try: curl -k %s/health)", self.base_url, e, self.base_url)
             return {'success': False, 'message': 'SSL certificate error', 'data': None}
             
         except Exception as e:
-            error_msg = f"❌ Unexpected error: {str(e)}"
-            print(error_msg)
+            logger.exception("❌ Unexpected error: %s", e)
             return {'success': False, 'message': str(e), 'data': None}
     
-    def post(self, endpoint: str, data: Dict = None) -> Dict[str, Any]:
+    def post(self, endpoint: str, data: Dict = None, client_id=None) -> Dict[str, Any]:
         """Make POST request"""
         try:
             url = f"{self.base_url}{self.api_prefix}{endpoint}"
-            print(f"📡 POST {url}")
+            request_log.debug("📡 POST %s", url)
             
             # For HTTPS with self-signed cert, disable SSL verification
             verify_ssl = False if self.base_url.startswith('https://') else True
@@ -104,44 +127,37 @@ class BotAPIClient:
             response = requests.post(
                 url, 
                 json=data, 
-                headers=self._get_headers(), 
+                headers=self._get_headers(client_id), 
                 timeout=10,
                 verify=verify_ssl
             )
             return self._handle_response(response)
             
         except requests.exceptions.ConnectionError as e:
-            error_msg = f"❌ Connection failed to {self.base_url}"
-            print(error_msg)
-            print(f"   Error details: {str(e)}")
-            print(f"   💡 Troubleshooting:")
-            print(f"      - Check if API is running: curl -k {self.base_url}/health")
-            print(f"      - Check if Apache is running: sudo systemctl status apache2")
-            print(f"      - Check hosts file: cat /etc/hosts | grep chatbot.ibs.local")
+            logger.error(
+                "❌ Connection failed to %s: %s (💡 check the API: curl -k %s/health, "
+                "Apache: sudo systemctl status apache2, hosts: grep chatbot.ibs.local /etc/hosts)",
+                self.base_url, e, self.base_url
+            )
             return {'success': False, 'message': 'API connection failed', 'data': None}
             
         except requests.exceptions.Timeout as e:
-            error_msg = f"❌ Request timeout to {self.base_url}"
-            print(error_msg)
+            logger.error("❌ Request timeout to %s", self.base_url)
             return {'success': False, 'message': 'API request timeout', 'data': None}
             
         except requests.exceptions.SSLError as e:
-            error_msg = f"❌ SSL/Certificate error for {self.base_url}"
-            print(error_msg)
-            print(f"   Error details: {str(e)}")
-            print(f"   💡 Try: curl -k {self.base_url}/health")
+            logger.error("❌ SSL/Certificate error for %s: %s (💡 try: curl -k %s/health)", self.base_url, e, self.base_url)
             return {'success': False, 'message': 'SSL certificate error', 'data': None}
             
         except Exception as e:
-            error_msg = f"❌ Unexpected error: {str(e)}"
-            print(error_msg)
+            logger.exception("❌ Unexpected error: %s", e)
             return {'success': False, 'message': str(e), 'data': None}
     
-    def put(self, endpoint: str, data: Dict = None) -> Dict[str, Any]:
+    def put(self, endpoint: str, data: Dict = None, client_id=None) -> Dict[str, Any]:
         """Make PUT request"""
         try:
             url = f"{self.base_url}{self.api_prefix}{endpoint}"
-            print(f"📡 PUT {url}")
+            request_log.debug("📡 PUT %s", url)
             
             # For HTTPS with self-signed cert, disable SSL verification
             verify_ssl = False if self.base_url.startswith('https://') else True
@@ -149,37 +165,30 @@ class BotAPIClient:
             response = requests.put(
                 url, 
                 json=data, 
-                headers=self._get_headers(), 
+                headers=self._get_headers(client_id), 
                 timeout=10,
                 verify=verify_ssl
             )
             return self._handle_response(response)
             
         except requests.exceptions.ConnectionError as e:
-            error_msg = f"❌ Connection failed to {self.base_url}"
-            print(error_msg)
-            print(f"   Error details: {str(e)}")
-            print(f"   💡 Troubleshooting:")
-            print(f"      - Check if API is running: curl -k {self.base_url}/health")
-            print(f"      - Check if Apache is running: sudo systemctl status apache2")
-            print(f"      - Check hosts file: cat /etc/hosts | grep chatbot.ibs.local")
+            logger.error(
+                "❌ Connection failed to %s: %s (💡 check the API: curl -k %s/health, "
+                "Apache: sudo systemctl status apache2, hosts: grep chatbot.ibs.local /etc/hosts)",
+                self.base_url, e, self.base_url
+            )
             return {'success': False, 'message': 'API connection failed', 'data': None}
             
         except requests.exceptions.Timeout as e:
-            error_msg = f"❌ Request timeout to {self.base_url}"
-            print(error_msg)
+            logger.error("❌ Request timeout to %s", self.base_url)
             return {'success': False, 'message': 'API request timeout', 'data': None}
             
         except requests.exceptions.SSLError as e:
-            error_msg = f"❌ SSL/Certificate error for {self.base_url}"
-            print(error_msg)
-            print(f"   Error details: {str(e)}")
-            print(f"   💡 Try: curl -k {self.base_url}/health")
+            logger.error("❌ SSL/Certificate error for %s: %s (💡 try: curl -k %s/health)", self.base_url, e, self.base_url)
             return {'success': False, 'message': 'SSL certificate error', 'data': None}
             
         except Exception as e:
-            error_msg = f"❌ Unexpected error: {str(e)}"
-            print(error_msg)
+            logger.exception("❌ Unexpected error: %s", e)
             return {'success': False, 'message': str(e), 'data': None}
 
 # Global instance
@@ -0,0 +1,145 @@
+"""
+Logging Setup
+One root configuration for the API, bot and web processes: records go
+through a queue to a background thread that formats and writes them, so
+logging never blocks a request or the bot's event loop on stdout
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class LoggingConfig:
+    """Logging settings (environment driven)"""
+
+    LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    # 'text' for terminals, 'json' for log collectors
+    FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+    # Keep 1 in N records below WARNING from sampled (high-frequency) loggers
+    SAMPLE_EVERY = max(1, int(os.getenv('LOG_SAMPLE_EVERY', 1)))
+    QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, service, message and extras"""
+
+    RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record) -> str:
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'service': self.service,
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in self.RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Passes every WARNING+ record and 1 in `every` of the rest"""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = every
+        self._count = 0
+
+    def filter(self, record) -> bool:
+        if record.levelno >= logging.WARNING or self.every <= 1:
+            return True
+        # Racy increment is fine: sampling only needs to be approximate
+        self._count += 1
+        return self._count % self.every == 0
+
+
+class _DropWhenFullQueueHandler(QueueHandler):
+    """Never blocks the caller: records are dropped if the writer falls behind"""
+
+    def prepare(self, record):
+        # Same-process queue: leave formatting to the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+_listener = None
+_lock = threading.Lock()
+
+
+def _restart_after_fork():
+    """Forked workers (gunicorn preload_app) don't inherit the writer thread"""
+    if _listener is None:
+        return
+    log_queue = queue.Queue(LoggingConfig.QUEUE_SIZE)
+    _listener.queue = log_queue
+    _listener._thread = None
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, QueueHandler):
+            handler.queue = log_queue
+    _listener.start()
+
+
+def configure_logging(service: str) -> logging.Logger:
+    """
+    Install the queue-backed root handler once per process
+
+    Args:
+        service: 'api', 'bot' or 'web' (tagged on every JSON record)
+
+    Returns:
+        logging.Logger: the service's logger
+    """
+    global _listener
+    with _lock:
+        if _listener is None:
+            stream = logging.StreamHandler(sys.stdout)
+            if LoggingConfig.FORMAT == 'json':
+                stream.setFormatter(JSONFormatter(service))
+            else:
+                stream.setFormatter(logging.Formatter(
+                    '%(asctime)s %(levelname)-7s [%(name)s] %(message)s', '%H:%M:%S'
+                ))
+
+            log_queue = queue.Queue(LoggingConfig.QUEUE_SIZE)
+            _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop)
+            os.register_at_fork(after_in_child=_restart_after_fork)
+
+            root = logging.getLogger()
+            root.handlers[:] = [_DropWhenFullQueueHandler(log_queue)]
+            root.setLevel(LoggingConfig.LEVEL)
+
+            # Library chatter stays at WARNING unless we are debugging
+            if root.level > logging.DEBUG:
+                for name in ('urllib3', 'httpx', 'telegram', 'apscheduler'):
+                    logging.getLogger(name).setLevel(logging.WARNING)
+
+    return logging.getLogger(service)
+
+
+def get_sampled_logger(name: str) -> logging.Logger:
+    """Logger for high-frequency events (per request/message), sampled by LOG_SAMPLE_EVERY"""
+    logger = logging.getLogger(name)
+    if not any(isinstance(f, SamplingFilter) for f in logger.filters):
+        logger.addFilter(SamplingFilter(LoggingConfig.SAMPLE_EVERY))
+    return logger
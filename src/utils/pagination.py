@@ -0,0 +1,90 @@
+"""
+Keyset (Cursor) Pagination
+Pages through a query ordered by (sort_column DESC, id DESC) using the last
+row of the previous page instead of OFFSET, so every page costs the same
+"""
+
+import base64
+import json
+import os
+from datetime import datetime
+from sqlalchemy import and_, or_
+from .cache import TTLCache
+
+# Totals are optional in cursor mode and cached briefly when requested
+COUNT_CACHE_TTL = float(os.getenv('PAGINATION_COUNT_TTL', 30))
+count_cache = TTLCache(ttl=COUNT_CACHE_TTL, maxsize=512)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor can't be decoded"""
+
+
+def encode_cursor(sort_value, row_id) -> str:
+    """Opaque cursor for the row (sort_value, row_id)"""
+    if isinstance(sort_value, datetime):
+        value = {'t': 'dt', 'v': sort_value.isoformat()}
+    else:
+        value = {'t': 'raw', 'v': sort_value}
+    payload = json.dumps({'s': value, 'id': row_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(sort_value, row_id) from a cursor made by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        value = payload['s']
+        sort_value = datetime.fromisoformat(value['v']) if value['t'] == 'dt' and value['v'] else value['v']
+        return sort_value, payload['id']
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_paginate(query, sort_column, id_column, cursor: str = None, per_page: int = 10) -> dict:
+    """
+    Fetch one page of query ordered by sort_column DESC, id_column DESC
+
+    Args:
+        query: Filtered SQLAlchemy query (no ORDER BY / OFFSET / LIMIT)
+        sort_column: Column to order by (e.g. ChatSession.start_time)
+        id_column: Unique tie-breaker column (primary key)
+        cursor: Cursor from a previous page, or None for the first page
+        per_page: Items per page
+
+    Returns:
+        Dict with 'items', 'next_cursor' (None on the last page) and 'has_next'
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_value is None:
+            # NULLs sort last in DESC order on MySQL and SQLite
+            query = query.filter(and_(sort_column.is_(None), id_column < row_id))
+        else:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id),
+                sort_column.is_(None)
+            ))
+
+    # One extra row tells us whether another page exists
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+
+    next_cursor = None
+    if has_next and items:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'has_next': has_next
+    }
+
+
+def cached_count(query, cache_key) -> int:
+    """query.count(), reused for COUNT_CACHE_TTL seconds per cache_key"""
+    return count_cache.get_or_set(cache_key, query.count)
@@ -0,0 +1,37 @@
+"""
+Optional Table Check
+Cached "do these tables exist" for features whose tables are created by a
+separate migration (archive, daily rollups), so code paths that touch them
+can skip the feature instead of failing while the migration hasn't run
+"""
+
+import time
+import logging
+from sqlalchemy import inspect
+
+logger = logging.getLogger(__name__)
+
+
+class TableCheck:
+    """Remembers a positive answer for good; a missing table is looked for again after recheck_seconds"""
+
+    def __init__(self, *table_names: str, recheck_seconds: float = 60, missing_warning: str = None):
+        self.table_names = table_names
+        self.recheck_seconds = recheck_seconds
+        # Logged once when the tables are first found missing (None: expected to be optional)
+        self.missing_warning = missing_warning
+        self._ready = None
+        self._checked_at = 0.0
+
+    def __call__(self, connection) -> bool:
+        """True if every table exists (connection: a Connection or Session bind)"""
+        if self._ready or (self._ready is not None
+                           and time.monotonic() - self._checked_at < self.recheck_seconds):
+            return bool(self._ready)
+
+        schema = inspect(connection)
+        ready = all(schema.has_table(name) for name in self.table_names)
+        if not ready and self._ready is None and self.missing_warning:
+            logger.warning(self.missing_warning)
+        self._ready, self._checked_at = ready, time.monotonic()
+        return ready
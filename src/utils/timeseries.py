@@ -0,0 +1,82 @@
+"""
+Time-Series Bucketing Helpers
+Day/week/month buckets in the reporting timezone (UTC+7 by default)
+with gap-filling; the database only groups by local calendar day
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, text
+
+# Timestamps are stored in UTC; reports use this fixed offset
+REPORT_TZ_OFFSET_HOURS = int(os.getenv('REPORT_TZ_OFFSET_HOURS', 7))
+
+PERIODS = ('day', 'week', 'month')
+
+
+def local_day_expr(column, dialect_name: str):
+    """SQL expression for the reporting-timezone calendar day of a UTC timestamp column"""
+    if dialect_name == 'sqlite':
+        return func.date(column, f"{REPORT_TZ_OFFSET_HOURS:+d} hours")
+    # MySQL / MariaDB
+    return func.date(func.timestampadd(text('HOUR'), REPORT_TZ_OFFSET_HOURS, column))
+
+
+def local_today(now: datetime = None) -> date:
+    """Current calendar day in the reporting timezone"""
+    return local_date(now or datetime.utcnow())
+
+
+def local_date(timestamp: datetime) -> date:
+    """Reporting-timezone calendar day of a UTC timestamp"""
+    return (timestamp + timedelta(hours=REPORT_TZ_OFFSET_HOURS)).date()
+
+
+def local_day_start_utc(day: date) -> datetime:
+    """UTC instant at which a reporting-timezone day starts"""
+    return datetime(day.year, day.month, day.day) - timedelta(hours=REPORT_TZ_OFFSET_HOURS)
+
+
+def to_date(value) -> date:
+    """Normalize DATE results (date, datetime or 'YYYY-MM-DD' string) to date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def bucket_start(day: date, period: str) -> date:
+    """First day of the bucket containing day (weeks start on Monday)"""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def previous_bucket(start: date, period: str) -> date:
+    """Start of the bucket before the one starting at start"""
+    if period == 'week':
+        return start - timedelta(days=7)
+    if period == 'month':
+        return (start - timedelta(days=1)).replace(day=1)
+    return start - timedelta(days=1)
+
+
+def bucket_starts(period: str, limit: int, today: date) -> list:
+    """Start dates of the last limit buckets, oldest first, ending with the current bucket"""
+    starts = [bucket_start(today, period)]
+    while len(starts) < limit:
+        starts.append(previous_bucket(starts[-1], period))
+    return list(reversed(starts))
+
+
+def rollup(day_counts: dict, period: str, starts: list) -> list:
+    """Sum daily counts into buckets; buckets without data get 0"""
+    totals = {start: 0 for start in starts}
+    for day, count in day_counts.items():
+        start = bucket_start(day, period)
+        if start in totals:
+            totals[start] += count
+    return [(start, totals[start]) for start in starts]
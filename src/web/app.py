@@ -1,6 +1,7 @@
 import os
-from flask import Flask, redirect, url_for, session
+from flask import Flask, redirect, url_for, session, jsonify
 from ..utils import Config
+from ..utils.logging_config import configure_logging
 from .websocket_manager import socketio
 from datetime import datetime
 import pytz  # ✅ Add this import
@@ -18,6 +19,8 @@ from .routes import (
 )
 
 def create_app():
+    # Queue-backed root logging before Flask creates app.logger
+    configure_logging('web')
     app = Flask(__name__)
     # Load configuration
     app.config.from_object(Config)
@@ -113,6 +116,23 @@ def create_app():
             # User is not logged in, redirect to login
             return redirect(url_for('auth.login'))
 
+    @app.route('/health')
+    def health_check():
+        """Web app liveness endpoint"""
+        return jsonify({'success': True, 'message': 'Web app is running'}), 200
+
+    @app.route('/ready')
+    def readiness_check():
+        """Readiness for load balancers: Socket.IO server up and database reachable"""
+        from ..database.connection import database_is_ready
+        if socketio.server is None or not database_is_ready():
+            return jsonify({'success': False, 'message': 'Web app not ready'}), 503
+        return jsonify({
+            'success': True,
+            'message': 'Web app is ready',
+            'async_mode': socketio.async_mode
+        }), 200
+
     @app.after_request
     def add_security_headers(response):
         """Add security headers - CSP temporarily disabled for testing"""
@@ -126,10 +146,9 @@ def create_app():
 
     return app
 
-# Create app instance for imports
-app = create_app()
-
 if __name__ == "__main__":
+    app = create_app()
+    
     # Get configuration from environment
     host = os.getenv('WEB_HOST', '0.0.0.0')
     port = int(os.getenv('WEB_PORT', 5000))
@@ -2,6 +2,9 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from ...utils.apiClient import api_client
 from ...utils.config import Config
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -26,9 +29,7 @@ def telegram_auth():
                 telegram_data[key] = value
     
     # Debug logging
-    print(f"Telegram auth data received: {telegram_data}")
-    print(f"Request method: {request.method}")
-    print(f"Request args: {dict(request.args)}")
+    logger.debug("Telegram auth data received via %s: %s", request.method, telegram_data)
     
     if not telegram_data.get('id'):
         flash('Invalid authentication data received', 'error')
@@ -6,6 +6,9 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from ..auth_decorators import any_admin_required, super_admin_required
 from ...utils.apiClient import api_client
+import logging
+
+logger = logging.getLogger(__name__)
 
 chats_bp = Blueprint('chats', __name__)
 
@@ -91,7 +94,7 @@ def broadcast_message_endpoint():
             user_name=data.get('user_name')
         )
         
-        print(f"✅ Socket.IO broadcast triggered for session {data['session_id']}")
+        logger.debug("✅ Socket.IO broadcast triggered for session %s", data['session_id'])
         
         return jsonify({
             'success': True,
@@ -99,9 +102,7 @@ def broadcast_message_endpoint():
         })
                 
     except Exception as e:
-        print(f"❌ Error broadcasting message: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error broadcasting message: %s", e)
         return jsonify({
             'success': False,
             'message': str(e)
@@ -129,7 +130,7 @@ def broadcast_new_session_endpoint():
             user_name=data.get('user_name')
         )
         
-        print(f"✅ Socket.IO new session broadcast triggered for session {data['session_id']}")
+        logger.debug("✅ Socket.IO new session broadcast triggered for session %s", data['session_id'])
         
         return jsonify({
             'success': True,
@@ -137,9 +138,7 @@ def broadcast_new_session_endpoint():
         })
                 
     except Exception as e:
-        print(f"❌ Error broadcasting new session: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error broadcasting new session: %s", e)
         return jsonify({
             'success': False,
             'message': str(e)
@@ -194,11 +193,13 @@ def chat_management():
     if status:
         params['status'] = status
     
-    # 🔄 Call API for chat sessions
-    response = api_client.get('/api/v1/chats', params)
-    
-    # 🔄 Call API for chat statistics
-    stats_response = api_client.get('/api/v1/chats/stats')
+    # 🔄 Chat sessions and chat statistics in one round-trip
+    results = api_client.batch([
+        {'id': 'chats', 'path': '/api/v1/chats', 'params': params},
+        {'id': 'stats', 'path': '/api/v1/chats/stats'}
+    ])
+    response = results['chats']
+    stats_response = results['stats']
     
     # Handle chat sessions response
     if not response.get('success'):
@@ -250,7 +251,9 @@ def live_chat():
     
     # 🔄 UPDATED: Get both waiting AND active sessions
     response = api_client.get('/api/v1/chats', {
-        'per_page': 100  # Get more sessions for live chat
+        'per_page': 100,  # Get more sessions for live chat
+        # Only what the sidebar renders
+        'fields': 'id,user_id,admin_id,status,start_time,user_name,last_message,last_message_time'
     })
     
     if not response.get('success'):
@@ -353,17 +356,13 @@ def assign_session(session_id):
         if session_data and 'user' in session_data:
             user_name = session_data['user'].get('full_name')
         
-        print(f"🔔 Broadcasting session {session_id} assignment to admin {admin_id}, user: {user_name}")
         broadcast_session_assigned(
             session_id=session_id,
             admin_id=admin_id,
             user_name=user_name
         )
-        print(f"✅ Broadcast completed for session assignment")
     except Exception as e:
-        print(f"⚠️ Failed to broadcast session assignment: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("⚠️ Failed to broadcast session assignment: %s", e)
     
     return jsonify({'success': True, 'message': 'Session assigned successfully', 'data': response.get('data')})
 
@@ -386,7 +385,7 @@ def close_chat(session_id):
         from ..websocket_manager import broadcast_session_closed
         broadcast_session_closed(session_id)
     except Exception as e:
-        print(f"⚠️ Failed to broadcast session closed: {e}")
+        logger.warning("⚠️ Failed to broadcast session closed: %s", e)
     
     return jsonify({
         'success': True,
@@ -394,6 +393,40 @@ def close_chat(session_id):
     })
 
 
+@chats_bp.route('/chat/bulk/<any(close, assign, reassign):action>', methods=['POST'])
+@any_admin_required
+def bulk_update_sessions(action):
+    """Close/assign/reassign a filtered set of sessions via API, then broadcast once"""
+    data = request.get_json(silent=True) or {}
+    payload = {'filter': data.get('filter') or {}}
+    if action != 'close':
+        # Assign defaults to the current admin, like the single-session route
+        payload['admin_id'] = data.get('admin_id') or session.get('admin', {}).get('id')
+    
+    response = api_client.post(f'/api/v1/chats/bulk/{action}', payload)
+    
+    if not response.get('success'):
+        if response.get('redirect_to_login'):
+            return jsonify({'success': False, 'message': 'Session expired'}), 401
+        
+        return jsonify({
+            'success': False,
+            'message': response.get('message', f'Failed to {action} chat sessions'),
+            'errors': response.get('errors')
+        }), 400
+    
+    result = response.get('data', {})
+    
+    # One event for the whole set instead of one per session
+    try:
+        from ..websocket_manager import broadcast_sessions_bulk_updated
+        broadcast_sessions_bulk_updated(action, result.get('session_ids', []), result.get('admin_id'))
+    except Exception as e:
+        logger.warning("⚠️ Failed to broadcast bulk session update: %s", e)
+    
+    return jsonify({'success': True, 'message': response.get('message'), 'data': result})
+
+
 @chats_bp.route('/chat/stats')
 @any_admin_required
 def chat_stats():
@@ -477,9 +510,7 @@ def broadcast_message():
         })
         
     except Exception as e:
-        print(f"❌ Error in broadcast endpoint: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error in broadcast endpoint: %s", e)
         return jsonify({
             'success': False,
             'message': str(e)
@@ -505,14 +536,16 @@ def get_session_counts():
         if not is_super_admin and admin_id:
             params['admin_id'] = admin_id
         
-        # Get waiting sessions count
-        waiting_params = {**params, 'status': 'waiting', 'per_page': 1}
-        waiting_response = api_client.get('/api/v1/chats', waiting_params)
+        # Waiting and active session counts in one round-trip
+        results = api_client.batch([
+            {'id': 'waiting', 'path': '/api/v1/chats', 'params': {**params, 'status': 'waiting', 'per_page': 1}},
+            {'id': 'active', 'path': '/api/v1/chats', 'params': {**params, 'status': 'active', 'per_page': 1}}
+        ])
+        
+        waiting_response = results['waiting']
         waiting_count = waiting_response.get('data', {}).get('pagination', {}).get('total', 0) if waiting_response.get('success') else 0
         
-        # Get active sessions count
-        active_params = {**params, 'status': 'active', 'per_page': 1}
-        active_response = api_client.get('/api/v1/chats', active_params)
+        active_response = results['active']
         active_count = active_response.get('data', {}).get('pagination', {}).get('total', 0) if active_response.get('success') else 0
         
         return jsonify({
@@ -523,7 +556,7 @@ def get_session_counts():
         })
         
     except Exception as e:
-        print(f"❌ Error getting session counts: {e}")
+        logger.error("❌ Error getting session counts: %s", e)
         return jsonify({
             'success': False,
             'message': str(e)
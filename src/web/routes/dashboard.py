@@ -10,12 +10,16 @@ dashboard_bp = Blueprint('dashboard', __name__)
 def index():
     """Dashboard overview - now calls API"""
     
-    # 🔄 Call API for dashboard stats
-    stats_response = api_client.get('/api/v1/dashboard/stats')
-    trends_response = api_client.get('/api/v1/dashboard/chat-trends', {
-        'period': 'week',
-        'limit': 7
-    })
+    # 🔄 Call API for dashboard stats and trends (one round-trip)
+    results = api_client.batch([
+        {'id': 'stats', 'path': '/api/v1/dashboard/stats'},
+        {'id': 'trends', 'path': '/api/v1/dashboard/chat-trends', 'params': {
+            'period': 'week',
+            'limit': 7
+        }}
+    ])
+    stats_response = results['stats']
+    trends_response = results['trends']
     
     # Handle API responses
     if not stats_response.get('success') or not trends_response.get('success'):
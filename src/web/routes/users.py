@@ -22,10 +22,13 @@ def list_users():
         'sort': sort
     }
     
-    response = api_client.get('/api/v1/users', params)
-    
-    # 🔄 Call API for user statistics
-    stats_response = api_client.get('/api/v1/users/stats')
+    # 🔄 Users list and user statistics in one round-trip
+    results = api_client.batch([
+        {'id': 'users', 'path': '/api/v1/users', 'params': params},
+        {'id': 'stats', 'path': '/api/v1/users/stats'}
+    ])
+    response = results['users']
+    stats_response = results['stats']
     
     # Handle API responses
     if not response.get('success'):
@@ -5,12 +5,18 @@
 
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask import request, session
-import asyncio
-from telegram import Bot
 import os
+import logging
 from datetime import datetime
+from ..utils.logging_config import get_sampled_logger
 
-socketio = SocketIO(cors_allowed_origins="*")
+logger = logging.getLogger(__name__)
+# Per-event lines are sampled; warnings and errors always pass
+event_log = get_sampled_logger(__name__ + '.events')
+
+# SOCKETIO_ASYNC_MODE pins the server model (eventlet in production, see run_web.py);
+# unset lets Flask-SocketIO pick the best installed one
+socketio = SocketIO(cors_allowed_origins="*", async_mode=os.getenv('SOCKETIO_ASYNC_MODE') or None)
 
 # Store active connections: {admin_id: socket_id}
 active_connections = {}
@@ -24,7 +30,7 @@ def handle_connect():
         join_room(room)
         active_connections[admin_id] = request.sid
         emit('connected', {'message': 'Connected to chat server'})
-        print(f"✅ Admin {admin_id} connected - Socket ID: {request.sid}")
+        logger.info("✅ Admin %s connected - Socket ID: %s", admin_id, request.sid)
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -32,7 +38,7 @@ def handle_disconnect():
     admin_id = session.get('admin', {}).get('id')
     if admin_id and admin_id in active_connections:
         del active_connections[admin_id]
-        print(f"❌ Admin {admin_id} disconnected")
+        logger.info("❌ Admin %s disconnected", admin_id)
 
 @socketio.on('send_message')
 def handle_send_message(data):
@@ -73,7 +79,9 @@ def handle_send_message(data):
         db.add(new_message)
         db.commit()
         
-        # Send message via Telegram
+        # Send message via Telegram (python-telegram-bot is only loaded when an admin replies)
+        import asyncio
+        from telegram import Bot
         bot_token = os.getenv('BOT_TOKEN')
         bot = Bot(token=bot_token)
         
@@ -84,7 +92,7 @@ def handle_send_message(data):
                 parse_mode='Markdown'
             ))
         except Exception as e:
-            print(f"❌ Error sending Telegram message: {e}")
+            logger.error("❌ Error sending Telegram message: %s", e)
         
         # Broadcast to admin's room (confirmation)
         emit('message_sent', {
@@ -94,25 +102,23 @@ def handle_send_message(data):
             'is_from_admin': True
         }, room=f"admin_{admin_id}")
         
-        print(f"✅ Message sent from admin {admin_id} to user via Telegram")
+        event_log.info("✅ Message sent from admin %s to user via Telegram", admin_id)
         
         db.close()
         
     except Exception as e:
-        print(f"❌ Error sending message: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error sending message: %s", e)
         emit('error', {'message': str(e)})
 
 @socketio.on('error')
 def handle_error(error):
     """Handle WebSocket errors"""
-    print(f"WebSocket error: {error}")
+    logger.error("WebSocket error: %s", error)
 
 @socketio.on_error_default
 def default_error_handler(e):
     """Handle all other errors"""
-    print(f"WebSocket default error: {e}")
+    logger.error("WebSocket default error: %s", e)
 
 # ============================================================================
 # CRITICAL FIX: Broadcast functions for bot messages
@@ -125,11 +131,9 @@ def broadcast_new_message_internal(user_id, message_text, admin_id=None, session
     Do NOT call this from the API - use the /api/broadcast-message web endpoint instead
     """
     try:
-        print(f"📡 Broadcasting message to admin {admin_id} for session {session_id}")
-        
         # Check if socketio is properly initialized
         if not socketio.server:
-            print("⚠️ SocketIO not initialized - cannot broadcast")
+            logger.warning("⚠️ SocketIO not initialized - cannot broadcast")
             return
         
         # Broadcast new_message to ALL admins (includes toast notifications)
@@ -144,23 +148,19 @@ def broadcast_new_message_internal(user_id, message_text, admin_id=None, session
             'admin_id': admin_id  # Include admin_id for targeted notifications
         }, namespace='/')
         
-        print(f"✅ Message broadcasted to {'admin ' + str(admin_id) if admin_id else 'all admins'}")
+        event_log.debug("📡 Message for session %s broadcasted (admin %s)", session_id, admin_id or 'all')
             
     except Exception as e:
-        print(f"❌ Error broadcasting message: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error broadcasting message: %s", e)
 
 def broadcast_new_session(session_id, user_id, user_name=None):
     """
     Broadcast new chat session to all connected admins
     """
     try:
-        print(f"📡 Broadcasting new session {session_id}")
-        
         # Check if socketio is properly initialized
         if not socketio.server:
-            print("⚠️ SocketIO not initialized - cannot broadcast")
+            logger.warning("⚠️ SocketIO not initialized - cannot broadcast")
             return
         
         # Broadcast to all connected admins
@@ -171,12 +171,10 @@ def broadcast_new_session(session_id, user_id, user_name=None):
             'timestamp': datetime.now().isoformat()
         }, namespace='/')
         
-        print(f"✅ New session broadcasted to all admins")
+        event_log.debug("📡 New session %s broadcasted to all admins", session_id)
             
     except Exception as e:
-        print(f"❌ Error broadcasting new session: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error broadcasting new session: %s", e)
 
 def broadcast_session_assigned(session_id, admin_id, user_name=None):
     """
@@ -184,10 +182,8 @@ def broadcast_session_assigned(session_id, admin_id, user_name=None):
     This should decrease badge counts
     """
     try:
-        print(f"📡 Broadcasting session assignment: {session_id} to admin {admin_id}")
-        
         if not socketio.server:
-            print("⚠️ SocketIO not initialized - cannot broadcast")
+            logger.warning("⚠️ SocketIO not initialized - cannot broadcast")
             return
         
         # Broadcast to all connected admins
@@ -198,12 +194,10 @@ def broadcast_session_assigned(session_id, admin_id, user_name=None):
             'timestamp': datetime.now().isoformat()
         }, namespace='/')
         
-        print(f"✅ Session assignment broadcasted")
+        event_log.debug("📡 Session %s assignment to admin %s broadcasted", session_id, admin_id)
             
     except Exception as e:
-        print(f"❌ Error broadcasting session assignment: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error broadcasting session assignment: %s", e)
 
 def broadcast_session_closed(session_id):
     """
@@ -211,10 +205,8 @@ def broadcast_session_closed(session_id):
     This should decrease badge counts
     """
     try:
-        print(f"📡 Broadcasting session closed: {session_id}")
-        
         if not socketio.server:
-            print("⚠️ SocketIO not initialized - cannot broadcast")
+            logger.warning("⚠️ SocketIO not initialized - cannot broadcast")
             return
         
         # Broadcast to all connected admins
@@ -223,9 +215,33 @@ def broadcast_session_closed(session_id):
             'timestamp': datetime.now().isoformat()
         }, namespace='/')
         
-        print(f"✅ Session closed broadcasted")
+        event_log.debug("📡 Session %s closed broadcasted", session_id)
+            
+    except Exception as e:
+        logger.exception("❌ Error broadcasting session closed: %s", e)
+
+
+def broadcast_sessions_bulk_updated(action, session_ids, admin_id=None):
+    """
+    Broadcast one event for a bulk close/assign/reassign instead of one per session
+    Clients refresh badges once and update the listed sessions
+    """
+    try:
+        if not socketio.server:
+            logger.warning("⚠️ SocketIO not initialized - cannot broadcast")
+            return
+        if not session_ids:
+            return
+        
+        # Broadcast to all connected admins
+        socketio.emit('sessions_bulk_updated', {
+            'action': action,
+            'session_ids': session_ids,
+            'admin_id': admin_id,
+            'timestamp': datetime.now().isoformat()
+        }, namespace='/')
+        
+        event_log.debug("📡 Bulk %s of %d sessions broadcasted", action, len(session_ids))
             
     except Exception as e:
-        print(f"❌ Error broadcasting session closed: {e}")
-        import traceback
-        traceback.print_exc()
\ No newline at end of file
+        logger.exception("❌ Error broadcasting bulk session update: %s", e)